@@ -4,11 +4,13 @@
 조작법: A/D 또는 좌/우 방향키로 레인 이동, SPACE로 총알 발사, Q로 종료
 """
 
+import argparse
 import curses
 import random
+import statistics
 import time
-from dataclasses import dataclass
-from typing import List, Tuple
+import tracemalloc
+from typing import Dict, List
 
 # 게임 설정
 LANES = 5
@@ -25,15 +27,83 @@ ITEM_POWER = "P"      # 파워 업
 ITEM_RAPIDFIRE = "R"  # 연사력 업
 ITEM_SHIELD = "S"     # 실드
 ITEM_SCORE = "$"      # 보너스 점수
+ITEM_TYPES = (ITEM_POWER, ITEM_RAPIDFIRE, ITEM_SHIELD, ITEM_SCORE)
+
+# 파워 레벨별 발사 패턴 (플레이어 x 기준 오프셋, 발사 순서대로)
+SHOT_PATTERNS = {
+    1: (0,),                        # 단발
+    2: (-1, 1),                     # 2발 (좌우 약간 벌림)
+    3: (0, -2, 2),                  # 3발 (중앙 + 좌우)
+    4: (-2, -1, 0, 1, 2),           # 5발 (넓은 범위)
+    5: (-3, -2, -1, 0, 1, 2, 3),    # 7발 + 양옆 레인까지
+}
+
+# 게임판 배경 (테두리 + 레인 구분선) - 스프라이트를 지울 때 이 글자로 되돌림
+# 레인 간격: 9, 구분선은 각 레인 중간(약 4~5칸 뒤)
+_LANE_DIVIDERS = {5 + lane * 9 - 5 for lane in range(1, LANES)}
+_EDGE_ROW = "+" + "-" * (GAME_WIDTH - 2) + "+"
+_LANE_ROW = "".join("|" if x in (0, GAME_WIDTH - 1) else ":" if x in _LANE_DIVIDERS else " "
+                    for x in range(GAME_WIDTH))
+BACKGROUND = [_EDGE_ROW] + [_LANE_ROW] * (GAME_HEIGHT - 2) + [_EDGE_ROW]
+
+# 충돌 판정용: x 좌표 -> 그 x에서 ±2칸 안에 중심이 있는 레인 (없으면 -1)
+# 레인 중심은 9칸 간격이라 한 x에 걸리는 레인은 많아야 하나
+LANE_AT_X = [next((lane for lane in range(LANES) if abs(5 + lane * 9 - x) <= 2), -1)
+             for x in range(GAME_WIDTH)]
 
-@dataclass
 class GameObject:
-    """게임 오브젝트 기본 클래스"""
-    x: int
-    y: int
-    char: str
-    active: bool = True
-    owner: object = None  # 총알의 소유자 (적 또는 보스)
+    """게임 오브젝트 기본 클래스 (총알) - 풀에서 재사용하므로 reset으로 다시 채움"""
+    __slots__ = ('x', 'y', 'char', 'active', 'owner')
+
+    def __init__(self, x: int, y: int, char: str, active: bool = True, owner: object = None):
+        self.x = x
+        self.y = y
+        self.char = char
+        self.active = active
+        self.owner = owner  # 총알의 소유자 (적 또는 보스)
+
+    def reset(self, x: int, y: int, char: str, owner: object = None):
+        self.x = x
+        self.y = y
+        self.char = char
+        self.active = True
+        self.owner = owner
+
+
+class ObjectPool:
+    """비활성 오브젝트 보관함 - 새로 만들지 않고 돌려받은 것을 reset해서 다시 씀"""
+    __slots__ = ('factory', 'free', 'created')
+
+    def __init__(self, factory):
+        self.factory = factory  # 인자 없이 빈 오브젝트를 만드는 함수
+        self.free = []
+        self.created = 0
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+        else:
+            obj = self.factory()
+            self.created += 1
+        obj.reset(*args)
+        return obj
+
+    def release(self, obj):
+        self.free.append(obj)
+
+
+def compact(objects: list, pool: ObjectPool, retire=None):
+    """비활성 오브젝트를 풀로 돌려보내고 살아 있는 것만 앞으로 당김 (새 리스트 없이)"""
+    keep = 0
+    for obj in objects:
+        if obj.active:
+            objects[keep] = obj
+            keep += 1
+        else:
+            if retire is not None:
+                retire(obj)
+            pool.release(obj)
+    del objects[keep:]
 
 class Player:
     """플레이어 클래스"""
@@ -73,41 +143,19 @@ class Player:
         if self.shoot_cooldown > 0:
             self.shoot_cooldown -= 1
 
-    def shoot(self):
-        """총알 발사 - 파워 레벨에 따라 다양한 패턴"""
-        bullets = []
+    def shoot(self, fire):
+        """총알 발사 - 파워 레벨에 따라 다양한 패턴 (fire(x, y)로 한 발씩 쏨)"""
         x = self.get_x()
         y = self.y - 1
 
-        if self.power == 1:
-            # 레벨 1: 단발
-            bullets.append(GameObject(x, y, BULLET_CHAR))
-        elif self.power == 2:
-            # 레벨 2: 2발 (좌우 약간 벌림)
-            bullets.append(GameObject(x - 1, y, BULLET_CHAR))
-            bullets.append(GameObject(x + 1, y, BULLET_CHAR))
-        elif self.power == 3:
-            # 레벨 3: 3발 (중앙 + 좌우)
-            bullets.append(GameObject(x, y, BULLET_CHAR))
-            bullets.append(GameObject(x - 2, y, BULLET_CHAR))
-            bullets.append(GameObject(x + 2, y, BULLET_CHAR))
-        elif self.power == 4:
-            # 레벨 4: 5발 (넓은 범위)
-            for i in range(-2, 3):
-                bullets.append(GameObject(x + i, y, BULLET_CHAR))
-        else:  # power >= 5
-            # 레벨 5: 7발 + 양옆 레인까지
-            for i in range(-3, 4):
-                bullets.append(GameObject(x + i, y, BULLET_CHAR))
+        for offset in SHOT_PATTERNS[min(self.power, 5)]:
+            fire(x + offset, y)
+        if self.power >= 5:
             # 양옆 레인에도 발사
             if self.lane > 0:
-                left_x = 5 + (self.lane - 1) * 8
-                bullets.append(GameObject(left_x, y, BULLET_CHAR))
+                fire(5 + (self.lane - 1) * 8, y)
             if self.lane < LANES - 1:
-                right_x = 5 + (self.lane + 1) * 8
-                bullets.append(GameObject(right_x, y, BULLET_CHAR))
-
-        return bullets
+                fire(5 + (self.lane + 1) * 8, y)
 
     def power_up(self):
         """파워 업그레이드"""
@@ -132,12 +180,19 @@ class Player:
 
 class Enemy:
     """적 클래스"""
+    __slots__ = ('lane', 'y', 'health', 'active', 'shoot_cooldown', 'order', 'cell_next')
+
     def __init__(self, lane: int, y: int = 0):
+        self.reset(lane, y)
+
+    def reset(self, lane: int, y: int = 0):
         self.lane = lane
         self.y = y
         self.health = 1
         self.active = True
         self.shoot_cooldown = 0
+        self.order = 0          # 충돌 판정용: 적 목록에서의 순서
+        self.cell_next = None   # 충돌 판정용: 같은 (레인, y) 칸의 다음 적
 
     def get_x(self):
         return 5 + self.lane * 9
@@ -148,13 +203,12 @@ class Enemy:
         if self.y >= GAME_HEIGHT:
             self.active = False
 
-    def shoot(self):
-        """총알 발사"""
+    def shoot(self, fire):
+        """총알 발사 (fire(x, y, 적)로 쏨)"""
         if self.shoot_cooldown <= 0 and random.random() < 0.05:
             self.shoot_cooldown = 20
-            return GameObject(self.get_x(), self.y + 1, ENEMY_BULLET_CHAR, owner=self)
+            fire(self.get_x(), self.y + 1, self)
         self.shoot_cooldown -= 1
-        return None
 
 class Boss:
     """보스 클래스"""
@@ -180,29 +234,32 @@ class Boss:
             else:
                 self.move_direction *= -1
 
-    def shoot(self):
-        """여러 방향으로 총알 발사"""
-        bullets = []
+    def shoot(self, fire):
+        """여러 방향으로 총알 발사 (fire(x, y, 보스)로 한 발씩 쏨)"""
         if self.shoot_cooldown <= 0:
             self.shoot_cooldown = 15
             # 보스는 3발 발사
-            bullets.append(GameObject(self.get_x(), self.y + 1, ENEMY_BULLET_CHAR, owner=self))
+            fire(self.get_x(), self.y + 1, self)
             if self.lane > 0:
-                bullets.append(GameObject(5 + (self.lane - 1) * 9, self.y + 1, ENEMY_BULLET_CHAR, owner=self))
+                fire(5 + (self.lane - 1) * 9, self.y + 1, self)
             if self.lane < LANES - 1:
-                bullets.append(GameObject(5 + (self.lane + 1) * 9, self.y + 1, ENEMY_BULLET_CHAR, owner=self))
+                fire(5 + (self.lane + 1) * 9, self.y + 1, self)
         self.shoot_cooldown -= 1
-        return bullets
 
 class Item:
     """아이템 클래스"""
+    __slots__ = ('lane', 'y', 'active', 'item_type')
+
     def __init__(self, lane: int, y: int, item_type: str = None):
+        self.reset(lane, y, item_type)
+
+    def reset(self, lane: int, y: int, item_type: str = None):
         self.lane = lane
         self.y = y
         self.active = True
         # 아이템 타입을 랜덤으로 결정
         if item_type is None:
-            self.item_type = random.choice([ITEM_POWER, ITEM_RAPIDFIRE, ITEM_SHIELD, ITEM_SCORE])
+            self.item_type = random.choice(ITEM_TYPES)
         else:
             self.item_type = item_type
 
@@ -215,20 +272,30 @@ class Item:
             self.active = False
 
 class Game:
-    """게임 메인 클래스"""
-    def __init__(self, stdscr):
+    """게임 메인 클래스 (stdscr 없이 만들면 화면 없이 update만 돌릴 수 있음)"""
+    def __init__(self, stdscr=None):
         self.stdscr = stdscr
         self.player = Player()
         self.bullets: List[GameObject] = []
         self.enemy_bullets: List[GameObject] = []
+        self.owner_bullets: Dict[object, List[GameObject]] = {}  # 적/보스 -> 그가 쏜 총알
         self.enemies: List[Enemy] = []
         self.items: List[Item] = []
+        # 사라진 오브젝트는 풀에 돌려놓고 다시 씀 (프레임마다 새로 만들지 않음)
+        self.bullet_pool = ObjectPool(lambda: GameObject(0, 0, BULLET_CHAR, False))
+        self.enemy_pool = ObjectPool(lambda: Enemy(0))
+        self.item_pool = ObjectPool(lambda: Item(0, 0, ITEM_SCORE))
+        # 충돌 판정용 (레인, y) 칸 - 칸마다 첫 번째 적, 나머지는 enemy.cell_next로 이어짐
+        self.cell_heads: List[Enemy] = [None] * (LANES * GAME_HEIGHT)
         self.boss = None
         self.frame = 0
         self.stage = 1
         self.enemy_spawn_rate = 50
         self.last_boss_score = -100  # 마지막 보스 등장 점수 추적
 
+        if stdscr is None:
+            return
+
         # Curses 설정
         curses.curs_set(0)  # 커서 숨기기
         self.stdscr.nodelay(1)  # 논블로킹 입력
@@ -239,6 +306,15 @@ class Game:
         if self.max_y < GAME_HEIGHT + 2 or self.max_x < GAME_WIDTH + 30:
             raise Exception(f"터미널 크기가 너무 작습니다! 최소 {GAME_HEIGHT + 2}행 x {GAME_WIDTH + 30}열이 필요합니다.")
 
+        # 화면 레이어: 게임판(배경 + 스프라이트), 상태 정보, 아이템/조작 설명
+        # 게임판은 오른쪽 아래 모서리에 써도 스크롤되지 않게 한 칸 여유를 둠
+        self.field = curses.newwin(GAME_HEIGHT, GAME_WIDTH + 1, 0, 0)
+        self.hud = curses.newwin(len(self.hud_lines()), self.max_x - GAME_WIDTH - 2, 0, GAME_WIDTH + 2)
+        self.legend = curses.newwin(10, self.max_x - GAME_WIDTH - 2, 8, GAME_WIDTH + 2)
+        self.hud_text: List[str] = [None] * len(self.hud_lines())
+        self.sprite_cells: List[int] = []  # 지난 프레임에 스프라이트를 그린 칸 (y * GAME_WIDTH + x)
+        self.draw_static()
+
     def spawn_enemy(self):
         """적 생성 - 스테이지에 따라 난이도 증가"""
         # 스테이지별로 스폰 확률과 최대 적 수 증가
@@ -247,7 +323,7 @@ class Game:
 
         if random.random() < spawn_rate and len(self.enemies) < max_enemies:
             lane = random.randint(0, LANES - 1)
-            enemy = Enemy(lane)
+            enemy = self.enemy_pool.acquire(lane)
             # 스테이지가 높을수록 적 체력 증가
             if self.stage >= 3:
                 enemy.health = 1 + (self.stage - 2) // 2
@@ -265,7 +341,7 @@ class Game:
     def spawn_item(self, lane: int, y: int):
         """아이템 생성"""
         if random.random() < 0.3:
-            self.items.append(Item(lane, y))
+            self.items.append(self.item_pool.acquire(lane, y))
 
     def update(self):
         """게임 상태 업데이트"""
@@ -307,16 +383,13 @@ class Game:
                 shoot_chance = 0.05 + (self.stage - 1) * 0.01
                 if enemy.shoot_cooldown <= 0 and random.random() < shoot_chance:
                     enemy.shoot_cooldown = max(10, 20 - self.stage)
-                    enemy_bullet = GameObject(enemy.get_x(), enemy.y + 1, ENEMY_BULLET_CHAR, owner=enemy)
-                    self.enemy_bullets.append(enemy_bullet)
+                    self.fire_enemy_bullet(enemy.get_x(), enemy.y + 1, enemy)
                 enemy.shoot_cooldown -= 1
 
         # 보스 이동 및 발사
         if self.boss and self.boss.active:
             self.boss.move()
-            boss_bullets = self.boss.shoot()
-            if boss_bullets:
-                self.enemy_bullets.extend(boss_bullets)
+            self.boss.shoot(self.fire_enemy_bullet)
 
         # 아이템 이동
         for item in self.items:
@@ -326,24 +399,84 @@ class Game:
         # 충돌 감지
         self.check_collisions()
 
-        # 비활성 오브젝트 제거
-        self.bullets = [b for b in self.bullets if b.active]
-        self.enemy_bullets = [b for b in self.enemy_bullets if b.active]
-        self.enemies = [e for e in self.enemies if e.active]
-        self.items = [i for i in self.items if i.active]
+        # 비활성 오브젝트를 풀로 돌려보내기 (사라진 적은 총알 목록도 정리 - 총알은 계속 날아감)
+        compact(self.bullets, self.bullet_pool)
+        compact(self.enemy_bullets, self.bullet_pool, self.retire_enemy_bullet)
+        compact(self.enemies, self.enemy_pool, self.retire_owner)
+        compact(self.items, self.item_pool)
+
+    def fire_bullet(self, x: int, y: int):
+        """플레이어 총알 한 발 (풀에서 꺼냄)"""
+        self.bullets.append(self.bullet_pool.acquire(x, y, BULLET_CHAR))
+
+    def fire_enemy_bullet(self, x: int, y: int, owner):
+        """적/보스 총알 한 발 - 주인이 죽을 때 바로 찾을 수 있게 주인별로도 기록"""
+        bullet = self.bullet_pool.acquire(x, y, ENEMY_BULLET_CHAR, owner)
+        self.enemy_bullets.append(bullet)
+        owned = self.owner_bullets.get(owner)
+        if owned is None:
+            self.owner_bullets[owner] = [bullet]
+        else:
+            owned.append(bullet)
+
+    def retire_enemy_bullet(self, bullet: GameObject):
+        """사라진 적 총알을 주인 목록에서 빼기 (풀에서 다시 쓰이기 전에)"""
+        if bullet.owner is not None:
+            self.owner_bullets[bullet.owner].remove(bullet)
+            bullet.owner = None
+
+    def retire_owner(self, owner):
+        """사라진 적의 총알 목록 정리 (총알은 계속 날아감, 적이 풀에서 다시 쓰여도 헷갈리지 않게)"""
+        for bullet in self.owner_bullets.pop(owner, ()):
+            bullet.owner = None
+
+    def clear_owner_bullets(self, owner):
+        """죽은 적/보스가 쏜 총알 제거"""
+        for bullet in self.owner_bullets.pop(owner, ()):
+            bullet.active = False
+            bullet.owner = None
 
     def check_collisions(self):
         """충돌 감지"""
-        player_x = self.player.get_x()
+        self.check_bullet_hits()
+        self.check_player_hits()
+
+    def check_bullet_hits(self):
+        """플레이어 총알과 적/보스 충돌
+
+        적을 (레인, y) 칸에 나눠 두고, 총알마다 자기 레인의 위아래 세 칸만
+        확인한다 (총알 x에서 ±2, y에서 ±1 범위와 같음). 여러 적이 걸리면
+        예전처럼 목록에서 앞선 적이 맞는다.
+        """
+        cells = self.cell_heads
+        if self.bullets:
+            # 뒤에서부터 칸 앞에 끼워 넣어서 칸 안의 적이 목록 순서대로 이어지게
+            for order in range(len(self.enemies) - 1, -1, -1):
+                enemy = self.enemies[order]
+                if enemy.active:
+                    cell = enemy.lane * GAME_HEIGHT + enemy.y
+                    enemy.order = order
+                    enemy.cell_next = cells[cell]
+                    cells[cell] = enemy
 
         # 플레이어 총알과 적 충돌
         for bullet in self.bullets:
             if not bullet.active:
                 continue
 
-            for enemy in self.enemies:
-                # X 좌표 범위를 넓혀서 충돌 감지 (±2 픽셀)
-                if enemy.active and abs(enemy.get_x() - bullet.x) <= 2 and abs(enemy.y - bullet.y) < 2:
+            lane = LANE_AT_X[bullet.x] if 0 <= bullet.x < GAME_WIDTH else -1
+            if lane >= 0:
+                target = None
+                base = lane * GAME_HEIGHT
+                for y in (bullet.y - 1, bullet.y, bullet.y + 1):
+                    if 0 <= y < GAME_HEIGHT:
+                        enemy = cells[base + y]
+                        while enemy is not None and not enemy.active:
+                            enemy = enemy.cell_next
+                        if enemy is not None and (target is None or enemy.order < target.order):
+                            target = enemy
+                if target is not None:
+                    enemy = target
                     enemy.health -= 1
                     bullet.active = False
 
@@ -353,10 +486,7 @@ class Game:
                         self.player.score += 10
                         self.spawn_item(enemy.lane, enemy.y)
                         # 적이 죽으면 그 적이 발사한 총알도 제거
-                        for eb in self.enemy_bullets:
-                            if eb.owner == enemy:
-                                eb.active = False
-                    break
+                        self.clear_owner_bullets(enemy)
 
             # 보스와 충돌
             if self.boss and self.boss.active:
@@ -368,12 +498,20 @@ class Game:
                         self.boss.active = False
                         self.player.score += 100
                         # 보스가 죽으면 보스가 발사한 총알도 제거
-                        for eb in self.enemy_bullets:
-                            if eb.owner == self.boss:
-                                eb.active = False
+                        self.clear_owner_bullets(self.boss)
                         self.boss = None
                         self.stage += 1
 
+        # 다음 프레임을 위해 칸 비우기
+        for enemy in self.enemies:
+            if 0 <= enemy.y < GAME_HEIGHT:
+                cells[enemy.lane * GAME_HEIGHT + enemy.y] = None
+            enemy.cell_next = None
+
+    def check_player_hits(self):
+        """적 총알, 아이템, 적과 플레이어 충돌"""
+        player_x = self.player.get_x()
+
         # 적 총알과 플레이어 충돌
         for bullet in self.enemy_bullets:
             if bullet.active and bullet.x == player_x and abs(bullet.y - self.player.y) < 2:
@@ -400,91 +538,115 @@ class Game:
                 self.player.take_damage()
                 enemy.active = False
 
-    def safe_addstr(self, y, x, text):
-        """안전한 문자 출력 (터미널 범위 체크)"""
+    def safe_addstr(self, win, y, x, text):
+        """안전한 문자 출력 (창 범위를 벗어나면 무시)"""
         try:
-            if 0 <= y < self.max_y and 0 <= x < self.max_x:
-                self.stdscr.addstr(y, x, text)
-        except:
+            win.addstr(y, x, text)
+        except curses.error:
             pass
 
-    def render(self):
-        """화면 렌더링"""
-        self.stdscr.clear()
+    def draw_static(self):
+        """테두리, 레인 구분선, 아이템/조작 설명을 한 번만 그림"""
+        for y, row in enumerate(BACKGROUND):
+            self.safe_addstr(self.field, y, 0, row)
 
-        # 게임 테두리
-        for i in range(GAME_HEIGHT):
-            self.safe_addstr(i, 0, "|")
-            self.safe_addstr(i, GAME_WIDTH - 1, "|")
-        self.safe_addstr(0, 0, "+" + "-" * (GAME_WIDTH - 2) + "+")
-        self.safe_addstr(GAME_HEIGHT - 1, 0, "+" + "-" * (GAME_WIDTH - 2) + "+")
+        self.safe_addstr(self.legend, 0, 0, "Items:")
+        self.safe_addstr(self.legend, 1, 0, f"  {ITEM_POWER}: Power Up")
+        self.safe_addstr(self.legend, 2, 0, f"  {ITEM_RAPIDFIRE}: Rapid Fire")
+        self.safe_addstr(self.legend, 3, 0, f"  {ITEM_SHIELD}: Shield")
+        self.safe_addstr(self.legend, 4, 0, f"  {ITEM_SCORE}: +50 Score")
 
-        # 레인 구분선 (각 레인 사이)
-        for lane in range(1, LANES):
-            # 레인 간격: 9, 구분선은 각 레인 중간(약 4~5칸 뒤)
-            x = 5 + lane * 9 - 5
-            for y in range(1, GAME_HEIGHT - 1):
-                self.safe_addstr(y, x, ":")
+        self.safe_addstr(self.legend, 6, 0, "Controls:")
+        self.safe_addstr(self.legend, 7, 0, "A/D or ←/→: Move")
+        self.safe_addstr(self.legend, 8, 0, "SPACE: Shoot")
+        self.safe_addstr(self.legend, 9, 0, "Q: Quit")
+
+        # stdscr은 한 번 비워 두어서 getch()가 부르는 refresh가 아무것도 하지 않게
+        self.stdscr.refresh()
+        self.legend.noutrefresh()
+        self.render()
+
+    def hud_lines(self) -> List[str]:
+        """상태 정보 줄 (0번 줄은 보스가 있을 때만 체력바)"""
+        boss_line = ""
+        if self.boss and self.boss.active:
+            health_bar = "=" * (self.boss.health * 20 // self.boss.max_health)
+            boss_line = f"BOSS HP: [{health_bar:20}]"
+        return [
+            boss_line,
+            f"Stage: {self.stage}",
+            f"Score: {self.player.score}",
+            f"Health: {'♥' * self.player.health}",
+            f"Shield: {'◆' * self.player.shield}",
+            f"Power: {self.player.power}/5",
+            f"RapidFire: {self.player.rapidfire}/5",
+        ]
+
+    def draw_sprite(self, y, x, text):
+        """게임판 안쪽에 스프라이트 한 칸 - 다음 프레임에 배경으로 되돌릴 수 있게 기록"""
+        if 0 < y < GAME_HEIGHT - 1 and 0 <= x < GAME_WIDTH:
+            self.field.addstr(y, x, text)
+            self.sprite_cells.append(y * GAME_WIDTH + x)
+
+    def render(self):
+        """화면 렌더링 - 스프라이트와 바뀐 상태 정보만 다시 그림"""
+        # 지난 프레임의 스프라이트 자리를 배경으로 되돌리기
+        for cell in self.sprite_cells:
+            y, x = divmod(cell, GAME_WIDTH)
+            self.field.addstr(y, x, BACKGROUND[y][x])
+        self.sprite_cells.clear()
 
         # 플레이어
-        self.safe_addstr(self.player.y, self.player.get_x(), PLAYER_CHAR)
+        self.draw_sprite(self.player.y, self.player.get_x(), PLAYER_CHAR)
 
         # 플레이어 총알
         for bullet in self.bullets:
-            if bullet.active and 0 < bullet.y < GAME_HEIGHT - 1:
-                self.safe_addstr(bullet.y, bullet.x, bullet.char)
+            if bullet.active:
+                self.draw_sprite(bullet.y, bullet.x, bullet.char)
 
         # 적 총알
         for bullet in self.enemy_bullets:
-            if bullet.active and 0 < bullet.y < GAME_HEIGHT - 1:
-                self.safe_addstr(bullet.y, bullet.x, bullet.char)
+            if bullet.active:
+                self.draw_sprite(bullet.y, bullet.x, bullet.char)
 
         # 적 (체력에 따라 다른 표시)
         for enemy in self.enemies:
-            if enemy.active and 0 < enemy.y < GAME_HEIGHT - 1:
+            if enemy.active:
                 # 체력이 1이면 일반, 2 이상이면 강화된 적 표시
                 if enemy.health == 1:
-                    self.safe_addstr(enemy.y, enemy.get_x(), ENEMY_CHAR)
+                    self.draw_sprite(enemy.y, enemy.get_x(), ENEMY_CHAR)
                 elif enemy.health == 2:
-                    self.safe_addstr(enemy.y, enemy.get_x(), "▽")  # 체력 2
+                    self.draw_sprite(enemy.y, enemy.get_x(), "▽")  # 체력 2
                 else:
-                    self.safe_addstr(enemy.y, enemy.get_x(), "◈")  # 체력 3+
+                    self.draw_sprite(enemy.y, enemy.get_x(), "◈")  # 체력 3+
 
         # 보스
         if self.boss and self.boss.active:
             boss_x = self.boss.get_x()
-            self.safe_addstr(self.boss.y, boss_x - 1, "[")
-            self.safe_addstr(self.boss.y, boss_x, BOSS_CHAR)
-            self.safe_addstr(self.boss.y, boss_x + 1, "]")
-            # 보스 체력바
-            health_bar = "=" * (self.boss.health * 20 // self.boss.max_health)
-            self.safe_addstr(0, GAME_WIDTH + 2, f"BOSS HP: [{health_bar:20}]")
+            self.draw_sprite(self.boss.y, boss_x - 1, "[")
+            self.draw_sprite(self.boss.y, boss_x, BOSS_CHAR)
+            self.draw_sprite(self.boss.y, boss_x + 1, "]")
 
         # 아이템 (타입별로 다른 문자 표시)
         for item in self.items:
-            if item.active and 0 < item.y < GAME_HEIGHT - 1:
-                self.safe_addstr(item.y, item.get_x(), item.item_type)
-
-        # 게임 정보
-        self.safe_addstr(1, GAME_WIDTH + 2, f"Stage: {self.stage}")
-        self.safe_addstr(2, GAME_WIDTH + 2, f"Score: {self.player.score}")
-        self.safe_addstr(3, GAME_WIDTH + 2, f"Health: {'♥' * self.player.health}")
-        self.safe_addstr(4, GAME_WIDTH + 2, f"Shield: {'◆' * self.player.shield}")
-        self.safe_addstr(5, GAME_WIDTH + 2, f"Power: {self.player.power}/5")
-        self.safe_addstr(6, GAME_WIDTH + 2, f"RapidFire: {self.player.rapidfire}/5")
-
-        self.safe_addstr(8, GAME_WIDTH + 2, "Items:")
-        self.safe_addstr(9, GAME_WIDTH + 2, f"  {ITEM_POWER}: Power Up")
-        self.safe_addstr(10, GAME_WIDTH + 2, f"  {ITEM_RAPIDFIRE}: Rapid Fire")
-        self.safe_addstr(11, GAME_WIDTH + 2, f"  {ITEM_SHIELD}: Shield")
-        self.safe_addstr(12, GAME_WIDTH + 2, f"  {ITEM_SCORE}: +50 Score")
-
-        self.safe_addstr(14, GAME_WIDTH + 2, "Controls:")
-        self.safe_addstr(15, GAME_WIDTH + 2, "A/D or ←/→: Move")
-        self.safe_addstr(16, GAME_WIDTH + 2, "SPACE: Shoot")
-        self.safe_addstr(17, GAME_WIDTH + 2, "Q: Quit")
+            if item.active:
+                self.draw_sprite(item.y, item.get_x(), item.item_type)
 
-        self.stdscr.refresh()
+        self.field.noutrefresh()
+
+        # 게임 정보 (글자가 바뀐 줄만)
+        changed = False
+        for row, text in enumerate(self.hud_lines()):
+            if text != self.hud_text[row]:
+                self.hud.move(row, 0)
+                self.hud.clrtoeol()
+                self.safe_addstr(self.hud, row, 0, text)
+                self.hud_text[row] = text
+                changed = True
+        if changed:
+            self.hud.noutrefresh()
+
+        curses.doupdate()
 
     def handle_input(self):
         """키 입력 처리"""
@@ -500,8 +662,7 @@ class Game:
             elif key == ord(' '):
                 # 연사력 체크 후 발사
                 if self.player.can_shoot():
-                    bullets = self.player.shoot()
-                    self.bullets.extend(bullets)
+                    self.player.shoot(self.fire_bullet)
 
         except:
             pass
@@ -534,6 +695,126 @@ class Game:
             if key == ord('q') or key == ord('Q'):
                 break
 
+class _LegacyCollisionGame(Game):
+    """예전 충돌 판정 (모든 총알 x 모든 적, 적이 죽으면 적 총알 전체 검색) - 벤치마크 비교용"""
+    def check_bullet_hits(self):
+        for bullet in self.bullets:
+            if not bullet.active:
+                continue
+
+            for enemy in self.enemies:
+                if enemy.active and abs(enemy.get_x() - bullet.x) <= 2 and abs(enemy.y - bullet.y) < 2:
+                    enemy.health -= 1
+                    bullet.active = False
+                    if enemy.health <= 0:
+                        enemy.active = False
+                        self.player.score += 10
+                        self.spawn_item(enemy.lane, enemy.y)
+                        for eb in self.enemy_bullets:
+                            if eb.owner == enemy:
+                                eb.active = False
+                    break
+
+            if self.boss and self.boss.active:
+                if abs(self.boss.get_x() - bullet.x) <= 3 and abs(self.boss.y - bullet.y) < 2:
+                    self.boss.health -= 1
+                    bullet.active = False
+                    if self.boss.health <= 0:
+                        self.boss.active = False
+                        self.player.score += 100
+                        for eb in self.enemy_bullets:
+                            if eb.owner == self.boss:
+                                eb.active = False
+                        self.boss = None
+                        self.stage += 1
+
+
+def _stress_frame(game: Game, enemies: int):
+    """적을 enemies마리로 채우고, 최대 파워로 쏘면서 가끔 레인을 옮기는 한 프레임"""
+    while len(game.enemies) < enemies:
+        game.enemies.append(game.enemy_pool.acquire(random.randrange(LANES), random.randrange(GAME_HEIGHT - 6)))
+    if random.random() < 0.1:
+        random.choice((game.player.move_left, game.player.move_right))()
+    if game.player.can_shoot():
+        game.player.shoot(game.fire_bullet)
+    game.update()
+
+
+def _stress_game(cls, seed: int) -> Game:
+    random.seed(seed)
+    game = cls()
+    game.player.power = 5
+    game.player.rapidfire = 5
+    game.player.health = 10 ** 9
+    return game
+
+
+def benchmark(enemy_counts=(50, 200, 500), frames=500, seed=0):
+    """Stress collisions: hundreds of enemies against power-5 sprays, old vs lane grid"""
+    print(f"Collision benchmark: power 5, rapid fire 5, {frames} frames per run")
+    for enemies in enemy_counts:
+        times = {}
+        outcomes = {}
+        for name, cls in (('old', _LegacyCollisionGame), ('new', Game)):
+            game = _stress_game(cls, seed)
+            check = game.check_collisions
+            collide = 0.0
+
+            def timed_check():
+                nonlocal collide
+                start = time.perf_counter()
+                check()
+                collide += time.perf_counter() - start
+
+            game.check_collisions = timed_check
+            start = time.perf_counter()
+            for _ in range(frames):
+                _stress_frame(game, enemies)
+            times[name] = ((time.perf_counter() - start) / frames * 1000, collide / frames * 1000)
+            outcomes[name] = (game.player.score, game.stage, game.player.health, len(game.enemies),
+                              len(game.bullets), len(game.enemy_bullets), len(game.items))
+        bullets = outcomes['new'][4]
+        print(f"  {enemies:>4} enemies, ~{bullets:>3} bullets: "
+              f"old {times['old'][1]:7.3f} ms/frame collisions ({times['old'][0]:7.3f} total)   "
+              f"new {times['new'][1]:7.3f} ms/frame collisions ({times['new'][0]:7.3f} total)   "
+              f"{'same result' if outcomes['old'] == outcomes['new'] else 'MISMATCH'}")
+
+
+def benchmark_frames(enemy_counts=(50, 200), frames=1000, seed=0):
+    """Heavy firefight frame cost: frame time plus per-frame allocations (tracemalloc)"""
+    print(f"Frame benchmark: stage 8, power 5, rapid fire 5, {frames} frames per run")
+    for enemies in enemy_counts:
+        game = _stress_game(Game, seed)
+        game.stage = 8
+        for _ in range(100):    # 풀이 최대 크기까지 차도록 먼저 돌림
+            _stress_frame(game, enemies)
+
+        times = []
+        for _ in range(frames):
+            start = time.perf_counter()
+            _stress_frame(game, enemies)
+            times.append(time.perf_counter() - start)
+        times.sort()
+
+        tracemalloc.start()
+        peaks = []
+        base, _ = tracemalloc.get_traced_memory()
+        for _ in range(frames):
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            _stress_frame(game, enemies)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        retained = tracemalloc.get_traced_memory()[0] - base
+        tracemalloc.stop()
+
+        print(f"  {enemies:>4} enemies: frame mean {statistics.mean(times) * 1000:.3f} ms, "
+              f"p99 {times[int(len(times) * 0.99)] * 1000:.3f} ms, "
+              f"allocated {statistics.mean(peaks) / 1024:.1f} KB/frame peak, retained {retained} B; "
+              f"pooled bullets {game.bullet_pool.created}, enemies {game.enemy_pool.created}, "
+              f"items {game.item_pool.created}")
+
+
 def main(stdscr):
     """메인 함수"""
     try:
@@ -551,4 +832,16 @@ def main(stdscr):
         stdscr.getch()
 
 if __name__ == "__main__":
-    curses.wrapper(main)
+    parser = argparse.ArgumentParser(description="1945 terminal shooting game")
+    parser.add_argument('--bench', action='store_true',
+                        help="stress-test collision detection instead of playing")
+    parser.add_argument('--frame-bench', action='store_true',
+                        help="measure frame time and per-frame allocations in a heavy firefight")
+    parser.add_argument('--frames', type=int, default=500, help="frames per benchmark run (default: 500)")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark(frames=args.frames)
+    elif args.frame_bench:
+        benchmark_frames(frames=args.frames)
+    else:
+        curses.wrapper(main)
@@ -5,11 +5,131 @@
 Use arrow keys to move tiles and create 2048.
 """
 
+import argparse
+import bisect
+import codecs
+import mmap
+import multiprocessing
 import random
+import select
+import struct
 import sys
 import os
 import termios
+import time
 import tty
+from array import array
+from collections import Counter, OrderedDict, deque
+
+try:
+    import numpy as np
+except ImportError:  # only needed for the batch engine
+    np = None
+
+# Tile colors
+TILE_COLORS = {
+    0: '\033[90m',      # Gray
+    2: '\033[97m',      # Bright white
+    4: '\033[96m',      # Cyan
+    8: '\033[93m',      # Yellow
+    16: '\033[92m',     # Green
+    32: '\033[95m',     # Magenta
+    64: '\033[94m',     # Blue
+    128: '\033[91m',    # Red
+    256: '\033[93m',    # Yellow
+    512: '\033[92m',    # Green
+    1024: '\033[95m',   # Magenta
+    2048: '\033[91m'    # Red
+}
+DEFAULT_TILE_COLOR = '\033[97m'
+RESET = '\033[0m'
+
+CLEAR_SCREEN = '\033[2J'
+CURSOR_HOME = '\033[H'
+CLEAR_LINE_END = '\033[K'
+CLEAR_SCREEN_END = '\033[J'
+
+BOARD_TOP_LINE = 7  # terminal line of the first board border (1-based)
+
+CTRL_C = '\x03'  # raw mode delivers Ctrl+C as a plain byte
+
+
+class TerminalRenderer:
+    """Draw Game2048 frames with a single write per frame
+
+    The first frame clears the screen; later frames go to cursor-home and
+    overwrite in place. When only a few tiles changed, just those cells and
+    the score line are rewritten using cursor-position sequences. The footer
+    only lists the h key when hints are available (hint_key).
+    """
+
+    def __init__(self, out=None, max_diff_cells=8, hint_key=False):
+        self.out = out or sys.stdout
+        self.max_diff_cells = max_diff_cells
+        self.hint_key = hint_key
+        self.cells = None
+        self.state = None
+        self.frame_height = 0
+        self.first_frame = True
+
+    def invalidate(self):
+        """Force the next frame to be drawn in full"""
+        self.cells = None
+
+    @staticmethod
+    def _cell(value):
+        if value == 0:
+            return "      "
+        return f"{TILE_COLORS.get(value, DEFAULT_TILE_COLOR)}{value:^6}{RESET}"
+
+    def _full_frame(self, game, cells, message):
+        border = "+" + "------+" * game.size
+        lines = ["", "=" * 30, "       2048 GAME", "=" * 30, f"Score: {game.score}", ""]
+        for row in cells:
+            lines.append(border)
+            lines.append("|" + "|".join(self._cell(value) for value in row) + "|")
+        lines.append(border)
+        lines.append("")
+        hint = "h: hint | " if self.hint_key else ""
+        lines.append(f"Arrow keys to move | u/r: undo/redo | s: save | {hint}q: quit")
+        if message:
+            lines.extend(["", message])
+        if game.won:
+            lines.extend(["", "Congratulations! You reached 2048!"])
+        if game.game_over:
+            lines.extend(["", "Game Over! No more moves available."])
+        lines.append("")
+        prefix = CLEAR_SCREEN + CURSOR_HOME if self.first_frame else CURSOR_HOME
+        self.first_frame = False
+        # \r\n keeps lines aligned even when the terminal is in raw mode
+        return prefix + (CLEAR_LINE_END + "\r\n").join(lines) + CLEAR_SCREEN_END
+
+    def _diff_frame(self, game, cells, changed):
+        parts = [f"\033[5;1HScore: {game.score}{CLEAR_LINE_END}"]
+        for i, j in changed:
+            parts.append(f"\033[{BOARD_TOP_LINE + 2 * i + 1};{2 + 7 * j}H{self._cell(cells[i][j])}")
+        # Park the cursor below the frame, where a full frame would leave it
+        parts.append(f"\033[{self.frame_height + 1};1H")
+        return "".join(parts)
+
+    def render(self, game, message=""):
+        """Write one frame for the game, with an optional message line"""
+        cells = [list(row) for row in game.board]
+        state = (game.size, game.won, game.game_over, message)
+        changed = None
+        if self.cells is not None and state == self.state:
+            changed = [(i, j) for i in range(game.size) for j in range(game.size)
+                       if cells[i][j] != self.cells[i][j]]
+        if changed is not None and len(changed) <= self.max_diff_cells:
+            frame = self._diff_frame(game, cells, changed)
+        else:
+            frame = self._full_frame(game, cells, message)
+            self.frame_height = frame.count("\n")
+        self.cells = cells
+        self.state = state
+        self.out.write(frame)
+        self.out.flush()
+
 
 class Game2048:
     def __init__(self, size=4):
@@ -18,6 +138,7 @@ class Game2048:
         self.score = 0
         self.game_over = False
         self.won = False
+        self.renderer = None
         self.add_new_tile()
         self.add_new_tile()
 
@@ -98,105 +219,1842 @@ class Game2048:
 
         return False
 
-    def display(self):
+    def display(self, message=""):
         """Display the game board"""
-        os.system('clear' if os.name == 'posix' else 'cls')
-        print("\n" + "=" * 30)
-        print("       2048 GAME")
-        print("=" * 30)
-        print(f"Score: {self.score}\n")
-
-        # Tile colors
-        colors = {
-            0: '\033[90m',      # Gray
-            2: '\033[97m',      # Bright white
-            4: '\033[96m',      # Cyan
-            8: '\033[93m',      # Yellow
-            16: '\033[92m',     # Green
-            32: '\033[95m',     # Magenta
-            64: '\033[94m',     # Blue
-            128: '\033[91m',    # Red
-            256: '\033[93m',    # Yellow
-            512: '\033[92m',    # Green
-            1024: '\033[95m',   # Magenta
-            2048: '\033[91m'    # Red
+        if self.renderer is None:
+            self.renderer = TerminalRenderer()
+        self.renderer.render(self, message)
+
+
+# Bitboard engine (4x4 only)
+#
+# The board is packed into one 64-bit int: cell (i, j) lives in the nibble at
+# bit 4 * (4 * i + j) and stores the tile exponent (0 = empty, 1 = 2, 2 = 4 ...).
+# A row is therefore a 16-bit value with column 0 in the low nibble, and every
+# row move is a single lookup into tables precomputed for all 65536 rows.
+# Exponents saturate at 15 (32768); two 32768 tiles never merge.
+
+ROW_MASK = 0xFFFF
+COL_MASK = 0x000F000F000F000F
+WIN_EXPONENT = 11  # 2 ** 11 == 2048
+
+_ROW_LEFT = None
+_ROW_RIGHT = None
+_SCORE_LEFT = None
+_SCORE_RIGHT = None
+_WIN_LEFT = None
+_WIN_RIGHT = None
+_ROW_REVERSE = None
+
+
+def _reverse_row(row):
+    return ((row >> 12) | ((row >> 4) & 0x00F0) |
+            ((row << 4) & 0x0F00) | ((row << 12) & 0xF000))
+
+
+def _slide_row_left(row):
+    """Slide one packed row to the left; return (new_row, score, won)"""
+    cells = [(row >> (4 * j)) & 0xF for j in range(4)]
+    tiles = [c for c in cells if c]
+    merged = []
+    score = 0
+    won = False
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1] and tiles[i] < 15:
+            exponent = tiles[i] + 1
+            merged.append(exponent)
+            score += 1 << exponent
+            won = won or exponent == WIN_EXPONENT
+            i += 2
+        else:
+            merged.append(tiles[i])
+            i += 1
+    new_row = 0
+    for j, exponent in enumerate(merged):
+        new_row |= exponent << (4 * j)
+    return new_row, score, won
+
+
+def init_tables():
+    """Build the row-move tables once (about 0.2s)"""
+    global _ROW_LEFT, _ROW_RIGHT, _SCORE_LEFT, _SCORE_RIGHT, _WIN_LEFT, _WIN_RIGHT, _ROW_REVERSE
+    if _ROW_LEFT is not None:
+        return
+    row_left = [0] * 65536
+    score_left = [0] * 65536
+    win_left = [False] * 65536
+    for row in range(65536):
+        row_left[row], score_left[row], win_left[row] = _slide_row_left(row)
+
+    row_reverse = [_reverse_row(row) for row in range(65536)]
+    row_right = [0] * 65536
+    score_right = [0] * 65536
+    win_right = [False] * 65536
+    for row in range(65536):
+        rev = row_reverse[row]
+        row_right[row] = row_reverse[row_left[rev]]
+        score_right[row] = score_left[rev]
+        win_right[row] = win_left[rev]
+
+    _ROW_REVERSE = row_reverse
+    _ROW_LEFT, _ROW_RIGHT = row_left, row_right
+    _SCORE_LEFT, _SCORE_RIGHT = score_left, score_right
+    _WIN_LEFT, _WIN_RIGHT = win_left, win_right
+
+
+def transpose(bits):
+    """Transpose a packed 4x4 board (swap cell (i, j) with (j, i))"""
+    a1 = bits & 0xF0F00F0FF0F00F0F
+    a2 = bits & 0x0000F0F00000F0F0
+    a3 = bits & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def pack_board(board):
+    """Pack a 4x4 list board of tile values into a 64-bit int"""
+    bits = 0
+    for i in range(4):
+        for j in range(4):
+            value = board[i][j]
+            if value:
+                bits |= (value.bit_length() - 1) << (4 * (4 * i + j))
+    return bits
+
+
+def unpack_board(bits):
+    """Unpack a 64-bit board into a 4x4 list of tile values"""
+    board = []
+    for i in range(4):
+        row = []
+        for j in range(4):
+            exponent = (bits >> (4 * (4 * i + j))) & 0xF
+            row.append(1 << exponent if exponent else 0)
+        board.append(row)
+    return board
+
+
+def _apply_rows(bits, rows, scores, wins):
+    r0 = bits & ROW_MASK
+    r1 = (bits >> 16) & ROW_MASK
+    r2 = (bits >> 32) & ROW_MASK
+    r3 = bits >> 48
+    new = rows[r0] | (rows[r1] << 16) | (rows[r2] << 32) | (rows[r3] << 48)
+    score = scores[r0] + scores[r1] + scores[r2] + scores[r3]
+    won = wins[r0] or wins[r1] or wins[r2] or wins[r3]
+    return new, score, won
+
+
+def bitboard_left(bits):
+    """Return (new_bits, score_delta, won) for a left move"""
+    return _apply_rows(bits, _ROW_LEFT, _SCORE_LEFT, _WIN_LEFT)
+
+
+def bitboard_right(bits):
+    """Return (new_bits, score_delta, won) for a right move"""
+    return _apply_rows(bits, _ROW_RIGHT, _SCORE_RIGHT, _WIN_RIGHT)
+
+
+def bitboard_up(bits):
+    """Return (new_bits, score_delta, won) for an up move"""
+    new, score, won = _apply_rows(transpose(bits), _ROW_LEFT, _SCORE_LEFT, _WIN_LEFT)
+    return transpose(new), score, won
+
+
+def bitboard_down(bits):
+    """Return (new_bits, score_delta, won) for a down move"""
+    new, score, won = _apply_rows(transpose(bits), _ROW_RIGHT, _SCORE_RIGHT, _WIN_RIGHT)
+    return transpose(new), score, won
+
+
+class BitboardGame2048(Game2048):
+    """Game2048 on a packed 64-bit board with table-driven moves (4x4 only)"""
+
+    def __init__(self, size=4):
+        if size != 4:
+            raise ValueError("BitboardGame2048 only supports size=4")
+        init_tables()
+        self.bits = 0
+        super().__init__(size)
+
+    @property
+    def board(self):
+        return unpack_board(self.bits)
+
+    @board.setter
+    def board(self, value):
+        self.bits = pack_board(value)
+
+    def add_new_tile(self):
+        """Add a new tile (2 or 4) to an empty cell"""
+        # Same cell order and RNG calls as Game2048, so a seeded game matches
+        bits = self.bits
+        empty_shifts = [shift for shift in range(0, 64, 4) if not (bits >> shift) & 0xF]
+        if empty_shifts:
+            shift = random.choice(empty_shifts)
+            self.bits = bits | ((1 if random.random() < 0.9 else 2) << shift)
+
+    def _apply(self, move):
+        new, score, won = move(self.bits)
+        if new == self.bits:
+            return False
+        self.bits = new
+        self.score += score
+        if won:
+            self.won = True
+        return True
+
+    def move_left(self):
+        """Move tiles to the left"""
+        return self._apply(bitboard_left)
+
+    def move_right(self):
+        """Move tiles to the right"""
+        return self._apply(bitboard_right)
+
+    def move_up(self):
+        """Move tiles up"""
+        return self._apply(bitboard_up)
+
+    def move_down(self):
+        """Move tiles down"""
+        return self._apply(bitboard_down)
+
+    def can_move(self):
+        """Check if any move is possible"""
+        bits = self.bits
+        # A nibble is empty iff none of its 4 bits is set
+        occupied = bits | (bits >> 1)
+        occupied |= occupied >> 2
+        if occupied & 0x1111111111111111 != 0x1111111111111111:
+            return True
+        return (bitboard_left(bits)[0] != bits or bitboard_right(bits)[0] != bits or
+                bitboard_up(bits)[0] != bits or bitboard_down(bits)[0] != bits)
+
+
+# Incremental engine for large boards
+#
+# Keeps an indexable set of free cells (array plus position map, swap-remove)
+# and a running count of adjacent equal tile pairs. Moves only touch the cells
+# whose value actually changed, so add_new_tile and can_move are O(1).
+
+class LargeBoardGame2048(Game2048):
+    """Game2048 with incremental free-cell and mergeability tracking
+
+    Every row and column also keeps its tile count and its number of equal
+    neighbours, so a move skips lines that are empty or full without a merge
+    (a slide cannot change those) and only rebuilds the rest. A move is still
+    O(size) per line it touches; add_new_tile and can_move are O(1).
+    """
+
+    def __init__(self, size=4):
+        cells = size * size
+        self.free = list(range(cells))         # free cell ids (i * size + j)
+        self.free_index = list(range(cells))   # cell id -> position in free, -1 if taken
+        self.equal_pairs = 0                   # adjacent pairs of equal non-zero tiles
+        self.row_tiles = [0] * size
+        self.col_tiles = [0] * size
+        self.row_pairs = [0] * size            # equal neighbours within each row
+        self.col_pairs = [0] * size            # equal neighbours within each column
+        self.lines = {
+            'left': [[(i, j) for j in range(size)] for i in range(size)],
+            'right': [[(i, j) for j in reversed(range(size))] for i in range(size)],
+            'up': [[(i, j) for i in range(size)] for j in range(size)],
+            'down': [[(i, j) for i in reversed(range(size))] for j in range(size)],
         }
-        reset = '\033[0m'
+        self._board = [[0] * size for _ in range(size)]
+        super().__init__(size)
 
-        for row in self.board:
-            print("+" + "------+" * self.size)
-            print("|", end="")
-            for cell in row:
-                if cell == 0:
-                    print("      |", end="")
+    @property
+    def board(self):
+        return self._board
+
+    @board.setter
+    def board(self, value):
+        # Bulk assignment: rebuild the indexes from scratch
+        size = len(value)
+        self._board = [[0] * size for _ in range(size)]
+        self.free = list(range(size * size))
+        self.free_index = list(range(size * size))
+        self.equal_pairs = 0
+        self.row_tiles, self.col_tiles = [0] * size, [0] * size
+        self.row_pairs, self.col_pairs = [0] * size, [0] * size
+        for i in range(size):
+            for j in range(size):
+                if value[i][j]:
+                    self._set_cell(i, j, value[i][j])
+
+    def _pairs_at(self, i, j, value):
+        """(row, column) neighbours of (i, j) holding the same non-zero value"""
+        if value == 0:
+            return 0, 0
+        board = self._board
+        last = self.size - 1
+        across = down = 0
+        if i > 0 and board[i - 1][j] == value:
+            down += 1
+        if i < last and board[i + 1][j] == value:
+            down += 1
+        if j > 0 and board[i][j - 1] == value:
+            across += 1
+        if j < last and board[i][j + 1] == value:
+            across += 1
+        return across, down
+
+    def _set_cell(self, i, j, value):
+        """Write one cell and update the free set and the pair count"""
+        old = self._board[i][j]
+        if old == value:
+            return
+        old_across, old_down = self._pairs_at(i, j, old)
+        self._board[i][j] = value
+        across, down = self._pairs_at(i, j, value)
+        self.row_pairs[i] += across - old_across
+        self.col_pairs[j] += down - old_down
+        self.equal_pairs += across + down - old_across - old_down
+
+        cell = i * self.size + j
+        if old == 0:
+            self.row_tiles[i] += 1
+            self.col_tiles[j] += 1
+            # Swap-remove from the free array
+            pos = self.free_index[cell]
+            last = self.free.pop()
+            if last != cell:
+                self.free[pos] = last
+                self.free_index[last] = pos
+            self.free_index[cell] = -1
+        elif value == 0:
+            self.row_tiles[i] -= 1
+            self.col_tiles[j] -= 1
+            self.free_index[cell] = len(self.free)
+            self.free.append(cell)
+
+    def add_new_tile(self):
+        """Add a new tile (2 or 4) to an empty cell"""
+        if self.free:
+            cell = self.free[random.randrange(len(self.free))]
+            i, j = divmod(cell, self.size)
+            self._set_cell(i, j, 2 if random.random() < 0.9 else 4)
+
+    def _move(self, direction):
+        board = self._board
+        size = self.size
+        if direction in ('left', 'right'):
+            line_tiles, line_pairs = self.row_tiles, self.row_pairs
+        else:
+            line_tiles, line_pairs = self.col_tiles, self.col_pairs
+        moved = False
+        for k, line in enumerate(self.lines[direction]):
+            count = line_tiles[k]
+            if count == 0 or (count == size and line_pairs[k] == 0):
+                continue
+            values = [board[i][j] for i, j in line]
+            tiles = [v for v in values if v]
+            merged = []
+            k = 0
+            while k < len(tiles):
+                if k + 1 < len(tiles) and tiles[k] == tiles[k + 1]:
+                    value = tiles[k] * 2
+                    self.score += value
+                    if value == 2048:
+                        self.won = True
+                    merged.append(value)
+                    k += 2
+                else:
+                    merged.append(tiles[k])
+                    k += 1
+            merged += [0] * (self.size - len(merged))
+            if merged == values:
+                continue
+            for (i, j), old, new in zip(line, values, merged):
+                if old != new:
+                    self._set_cell(i, j, new)
+                    moved = True
+        return moved
+
+    def move_left(self):
+        """Move tiles to the left"""
+        return self._move('left')
+
+    def move_right(self):
+        """Move tiles to the right"""
+        return self._move('right')
+
+    def move_up(self):
+        """Move tiles up"""
+        return self._move('up')
+
+    def move_down(self):
+        """Move tiles down"""
+        return self._move('down')
+
+    def can_move(self):
+        """Check if any move is possible"""
+        return bool(self.free) or self.equal_pairs > 0
+
+
+# Expectimax autoplayer
+#
+# Heuristic weights follow the well-known row-table evaluator for 2048: reward
+# empty cells and mergeable neighbours, penalise non-monotonic rows and large
+# scattered tiles. Scores for all 65536 rows are precomputed like the move tables.
+
+HEUR_LOST_PENALTY = 200000.0
+HEUR_MONOTONICITY_POWER = 4.0
+HEUR_MONOTONICITY_WEIGHT = 47.0
+HEUR_SUM_POWER = 3.5
+HEUR_SUM_WEIGHT = 11.0
+HEUR_MERGES_WEIGHT = 700.0
+HEUR_EMPTY_WEIGHT = 270.0
+
+_ROW_HEURISTIC = None
+
+
+def init_heuristic_table():
+    """Build the per-row heuristic table used by ExpectimaxAI"""
+    global _ROW_HEURISTIC
+    if _ROW_HEURISTIC is not None:
+        return
+    table = [0.0] * 65536
+    for row in range(65536):
+        cells = [(row >> (4 * j)) & 0xF for j in range(4)]
+        total = 0.0
+        empty = 0
+        merges = 0
+        prev = 0
+        counter = 0
+        for rank in cells:
+            total += rank ** HEUR_SUM_POWER
+            if rank == 0:
+                empty += 1
+            else:
+                if prev == rank:
+                    counter += 1
+                elif counter > 0:
+                    merges += 1 + counter
+                    counter = 0
+                prev = rank
+        if counter > 0:
+            merges += 1 + counter
+
+        mono_left = 0.0
+        mono_right = 0.0
+        for j in range(1, 4):
+            if cells[j - 1] > cells[j]:
+                mono_left += (cells[j - 1] ** HEUR_MONOTONICITY_POWER -
+                              cells[j] ** HEUR_MONOTONICITY_POWER)
+            else:
+                mono_right += (cells[j] ** HEUR_MONOTONICITY_POWER -
+                               cells[j - 1] ** HEUR_MONOTONICITY_POWER)
+
+        table[row] = (HEUR_LOST_PENALTY +
+                      HEUR_EMPTY_WEIGHT * empty +
+                      HEUR_MERGES_WEIGHT * merges -
+                      HEUR_MONOTONICITY_WEIGHT * min(mono_left, mono_right) -
+                      HEUR_SUM_WEIGHT * total)
+    _ROW_HEURISTIC = table
+
+
+def evaluate_board(bits):
+    """Heuristic value of a packed board (rows plus columns)"""
+    h = _ROW_HEURISTIC
+    t = transpose(bits)
+    return (h[bits & ROW_MASK] + h[(bits >> 16) & ROW_MASK] +
+            h[(bits >> 32) & ROW_MASK] + h[bits >> 48] +
+            h[t & ROW_MASK] + h[(t >> 16) & ROW_MASK] +
+            h[(t >> 32) & ROW_MASK] + h[t >> 48])
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class ExpectimaxAI:
+    """Depth-limited expectimax player on the bitboard engine
+
+    Search depth is raised one ply at a time until the per-move time budget
+    runs out; the move from the deepest finished search is played. Chance node
+    values are kept in an LRU transposition cache shared across moves.
+    """
+
+    MOVES = (
+        ('up', bitboard_up),
+        ('down', bitboard_down),
+        ('left', bitboard_left),
+        ('right', bitboard_right),
+    )
+
+    def __init__(self, time_budget=0.1, max_depth=8, cache_size=200000, min_prob=0.0001):
+        init_tables()
+        init_heuristic_table()
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.cache_size = cache_size
+        self.min_prob = min_prob
+        self.cache = OrderedDict()
+        self.deadline = 0.0
+        self.nodes = 0
+        self.last_depth = 0
+        self.name = f"expectimax, {time_budget * 1000:.0f} ms/move"
+
+    def best_move(self, bits):
+        """Return the best direction ('up', 'down', ...) or None if stuck"""
+        self.deadline = time.perf_counter() + self.time_budget
+        best = None
+        for depth in range(1, self.max_depth + 1):
+            try:
+                move = self._search_root(bits, depth)
+            except _SearchTimeout:
+                break
+            if move is None:
+                return best
+            best = move
+            self.last_depth = depth
+            if time.perf_counter() >= self.deadline:
+                break
+        if best is None:
+            # Not even depth 1 finished in time: fall back to a greedy move
+            best = max(((evaluate_board(move(bits)[0]), name) for name, move in self.MOVES
+                        if move(bits)[0] != bits), default=(0, None))[1]
+        return best
+
+    def describe(self):
+        return f"depth {self.last_depth}  cache {len(self.cache)}"
+
+    def _search_root(self, bits, depth):
+        best_value = -1.0
+        best_move = None
+        for name, move in self.MOVES:
+            new = move(bits)[0]
+            if new == bits:
+                continue
+            value = self._chance(new, depth - 1, 1.0)
+            if value > best_value:
+                best_value = value
+                best_move = name
+        return best_move
+
+    def _chance(self, bits, depth, prob):
+        if depth == 0 or prob < self.min_prob:
+            return evaluate_board(bits)
+
+        key = (bits, depth)
+        cache = self.cache
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+            return value
+
+        self.nodes += 1
+        if not self.nodes & 0xF and time.perf_counter() > self.deadline:
+            raise _SearchTimeout()
+
+        empty_shifts = [shift for shift in range(0, 64, 4) if not (bits >> shift) & 0xF]
+        if not empty_shifts:
+            return evaluate_board(bits)
+        prob /= len(empty_shifts)
+        total = 0.0
+        for shift in empty_shifts:
+            total += 0.9 * self._max(bits | (1 << shift), depth, prob * 0.9)
+            total += 0.1 * self._max(bits | (2 << shift), depth, prob * 0.1)
+        value = total / len(empty_shifts)
+
+        cache[key] = value
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
+
+    def _max(self, bits, depth, prob):
+        best = 0.0
+        for _, move in self.MOVES:
+            new = move(bits)[0]
+            if new != bits:
+                value = self._chance(new, depth - 1, prob)
+                if value > best:
+                    best = value
+        return best
+
+
+def run_ai(games=1, time_budget=0.1, seed=None, show=None, ai=None):
+    """Let an AI (ExpectimaxAI by default) play a batch of games and report
+    speed and tiles reached"""
+    if seed is not None:
+        random.seed(seed)
+    if show is None:
+        show = games == 1
+    if ai is None:
+        ai = ExpectimaxAI(time_budget=time_budget)
+    max_tiles = Counter()
+    total_moves = 0
+    total_time = 0.0
+
+    for index in range(games):
+        game = BitboardGame2048()
+        moves = 0
+        start = time.perf_counter()
+        while True:
+            direction = ai.best_move(game.bits)
+            if direction is None or not getattr(game, f"move_{direction}")():
+                break
+            game.add_new_tile()
+            moves += 1
+            if show:
+                game.display(f"AI: {direction:<5}  {ai.describe()}")
+            if not game.can_move():
+                break
+        elapsed = time.perf_counter() - start
+        game.game_over = True
+        max_tile = max(max(row) for row in game.board)
+        max_tiles[max_tile] += 1
+        total_moves += moves
+        total_time += elapsed
+        print(f"Game {index + 1}/{games}: score {game.score}, max tile {max_tile}, "
+              f"{moves} moves, {moves / elapsed:.1f} moves/sec")
+
+    print(f"\nAI summary over {games} games")
+    print(f"  Moves/sec: {total_moves / total_time:.1f} ({ai.name})")
+    print("  Max tile reached:")
+    reached = 0
+    for tile in sorted(max_tiles, reverse=True):
+        reached += max_tiles[tile]
+        print(f"    {tile:>6}: {max_tiles[tile]:>4} games  (>= {tile}: {reached / games:6.1%})")
+
+
+# Vectorized batch engine (NumPy, optional)
+#
+# Holds N boards as an (N, 4, 4) array of tile exponents. A single matrix
+# product packs every row and column into 16-bit line indices, so the same row
+# tables as the bitboard engine step all boards at once, whatever move each one
+# picked. Empty cells are packed the same way and spawns use a select table.
+
+BATCH_UP, BATCH_DOWN, BATCH_LEFT, BATCH_RIGHT = range(4)
+BATCH_MOVE_NAMES = ('up', 'down', 'left', 'right')
+
+
+class BatchGame2048:
+    """N independent 4x4 games stepped in lockstep with NumPy
+
+    Move results match Game2048 exactly (checked by benchmark_batch); tiles
+    spawn with the same 90/10 distribution on a uniformly chosen empty cell.
+    """
+
+    def __init__(self, count, seed=None):
+        if np is None:
+            raise RuntimeError("BatchGame2048 needs NumPy (pip install numpy)")
+        init_tables()
+        self.count = count
+        self.rng = np.random.default_rng(seed)
+        self._build_tables()
+
+        self.boards = np.zeros((count, 4, 4), dtype=np.uint8)
+        self.score = np.zeros(count, dtype=np.int64)
+        self.moves = np.zeros(count, dtype=np.int64)
+        self.won = np.zeros(count, dtype=bool)
+        self.game_over = np.zeros(count, dtype=bool)
+        self.reset()
+
+    def _build_tables(self):
+        row_left = np.array(_ROW_LEFT, dtype=np.uint16)
+        row_right = np.array(_ROW_RIGHT, dtype=np.uint16)
+        lines = np.arange(65536, dtype=np.uint16)
+        # Indexed by (direction << 16) | line; up/down run on packed columns
+        self.move_table = np.concatenate([row_left, row_right, row_left, row_right])
+        score_left = np.array(_SCORE_LEFT, dtype=np.int64)
+        score_right = np.array(_SCORE_RIGHT, dtype=np.int64)
+        self.score_table = np.concatenate([score_left, score_right, score_left, score_right])
+        win_left = np.array(_WIN_LEFT, dtype=bool)
+        win_right = np.array(_WIN_RIGHT, dtype=bool)
+        self.win_table = np.concatenate([win_left, win_right, win_left, win_right])
+        self.line_can_move = (row_left != lines) | (row_right != lines)
+
+        # One little-endian uint32 per line whose bytes are the four exponents
+        nibbles = (np.arange(65536, dtype=np.uint32)[:, None] >> np.array([0, 4, 8, 12])) & 0xF
+        self.unpack = (nibbles << np.array([0, 8, 16, 24])).sum(axis=1).astype('<u4')
+
+        # Column 0..3 of pack_matrix gives row indices, 4..7 column indices
+        pack = np.zeros((16, 8), dtype=np.float32)
+        for i in range(4):
+            for j in range(4):
+                pack[4 * i + j, i] = 16 ** j
+                pack[4 * i + j, 4 + j] = 16 ** i
+        self.pack_matrix = pack
+        self.cell_bits = (2 ** np.arange(16)).astype(np.float32)
+
+        # select[mask, k] is the position of the k-th set bit of a 16-bit mask
+        bits = (np.arange(65536)[:, None] >> np.arange(16)) & 1
+        ranks = np.cumsum(bits, axis=1)
+        self.popcount = ranks[:, -1].astype(np.int64)
+        self.select = np.zeros((65536, 16), dtype=np.intp)
+        for k in range(16):
+            self.select[:, k] = (ranks > k).argmax(axis=1)
+
+    def _pack(self):
+        """(N, 8) int array: packed rows 0..3 then packed columns 0..3"""
+        flat = self.boards.reshape(self.count, 16)
+        return (flat.astype(np.float32) @ self.pack_matrix).astype(np.int64)
+
+    def reset(self, mask=None):
+        """Start fresh games on the boards selected by mask (default: all)"""
+        if mask is None:
+            mask = np.ones(self.count, dtype=bool)
+        else:
+            mask = np.array(mask, dtype=bool)  # may be self.game_over itself
+        self.boards[mask] = 0
+        self.score[mask] = 0
+        self.moves[mask] = 0
+        self.won[mask] = False
+        self.game_over[mask] = False
+        self.add_new_tiles(mask)
+        self.add_new_tiles(mask)
+
+    def add_new_tiles(self, mask):
+        """Add a 2 (90%) or 4 (10%) to a random empty cell of each masked board"""
+        index = np.nonzero(mask)[0]
+        if not len(index):
+            return
+        flat = self.boards.reshape(self.count, 16)
+        empty = (flat[index] == 0).astype(np.float32) @ self.cell_bits
+        empty = empty.astype(np.int64)
+        counts = self.popcount[empty]
+        picks = (self.rng.random(len(index)) * counts).astype(np.int64)
+        cells = self.select[empty, np.minimum(picks, 15)]
+        tiles = np.where(self.rng.random(len(index)) < 0.9, 1, 2)
+        room = counts > 0
+        flat[index[room], cells[room]] = tiles[room]
+
+    def apply_moves(self, directions):
+        """Move every board in its own direction (no spawn)
+
+        Returns (moved, score_delta) arrays. Boards already over are left as is.
+        """
+        packed = self._pack()
+        vertical = (directions <= BATCH_DOWN)[:, None]
+        lines = np.where(vertical, packed[:, 4:], packed[:, :4])
+        index = lines | (directions[:, None].astype(np.int64) << 16)
+        result = self.move_table[index]
+
+        moved = (result != lines).any(axis=1)
+        gains = self.score_table[index].sum(axis=1)
+        gains[~moved] = 0
+        self.won |= self.win_table[index].any(axis=1)
+
+        # Unchanged lines unpack to themselves, so every board can be rewritten
+        new_lines = self.unpack[result].view(np.uint8).reshape(self.count, 4, 4)
+        np.copyto(self.boards, np.where(vertical[:, :, None], new_lines.transpose(0, 2, 1), new_lines))
+        return moved, gains
+
+    def step(self, directions):
+        """Apply one move per board, spawn tiles and update game_over
+
+        directions is an int array of BATCH_UP/DOWN/LEFT/RIGHT of length count.
+        Returns (moved, score_delta) like apply_moves.
+        """
+        moved, gains = self.apply_moves(directions)
+        self.score += gains
+        self.moves += moved
+        self.add_new_tiles(moved)
+        self.game_over |= ~self.can_move()
+        return moved, gains
+
+    def can_move(self):
+        """Boolean array: True where the board still has a legal move"""
+        return self.line_can_move[self._pack()].any(axis=1)
+
+    def tile_boards(self):
+        """Boards as tile values (0, 2, 4, ...) instead of exponents"""
+        return np.where(self.boards > 0, np.left_shift(1, self.boards.astype(np.int64)), 0)
+
+
+def _check_batch_against_scalar(batch, directions, checks):
+    """Compare the first `checks` boards of one batch move with Game2048"""
+    before = batch.tile_boards()[:checks].tolist()
+    saved = batch.boards.copy()
+    moved, gains = batch.apply_moves(directions)
+    after = batch.tile_boards()[:checks].tolist()
+    batch.boards[:] = saved
+    for i in range(checks):
+        game = Game2048()
+        game.board = [row[:] for row in before[i]]
+        game.score = 0
+        scalar_moved = getattr(game, f"move_{BATCH_MOVE_NAMES[directions[i]]}")()
+        if (bool(moved[i]) != scalar_moved or game.board != after[i] or
+                int(gains[i]) != game.score or game.can_move() != bool(batch.can_move()[i])):
+            return False
+    return True
+
+
+def benchmark_batch(boards=10000, steps=500, seed=0):
+    """Step `boards` random-policy games in lockstep and report moves per second"""
+    if np is None:
+        print("NumPy is required for the batch benchmark (pip install numpy)")
+        return
+    batch = BatchGame2048(boards, seed=seed)
+    rng = np.random.default_rng(seed + 1)
+
+    agree = True
+    for _ in range(20):
+        directions = rng.integers(0, 4, boards)
+        agree = agree and _check_batch_against_scalar(batch, directions, min(boards, 200))
+        batch.step(directions)
+        batch.reset(batch.game_over)
+    print(f"Scalar rule check: {'OK' if agree else 'MISMATCH'}")
+
+    batch.reset()
+    finished = 0
+    start = time.perf_counter()
+    for _ in range(steps):
+        batch.step(rng.integers(0, 4, boards))
+        done = batch.game_over
+        if done.any():
+            finished += int(done.sum())
+            batch.reset(done)
+    elapsed = time.perf_counter() - start
+    print(f"Batch benchmark: {boards} boards x {steps} steps")
+    print(f"  {boards * steps / elapsed:,.0f} moves/sec ({finished} games finished)")
+
+
+# Self-play benchmark
+#
+# Policies take a game and return the direction to play, without changing the
+# game. They are looked up by name so worker processes can rebuild them.
+
+DIRECTIONS = ('up', 'down', 'left', 'right')
+
+
+def preview_move(game, direction):
+    """Try a move and undo it; return (moved, score_gain, board_after)"""
+    board, score, won = [row[:] for row in game.board], game.score, game.won
+    moved = getattr(game, f"move_{direction}")()
+    result = (moved, game.score - score, game.board)
+    game.board, game.score, game.won = board, score, won
+    return result
+
+
+def random_policy(game):
+    """Pick a random direction that changes the board"""
+    directions = [d for d in DIRECTIONS if preview_move(game, d)[0]]
+    return random.choice(directions) if directions else None
+
+
+def greedy_policy(game):
+    """Pick the move with the largest immediate score gain (ties: random)"""
+    best = []
+    best_gain = -1
+    for direction in DIRECTIONS:
+        moved, gain, _ = preview_move(game, direction)
+        if not moved:
+            continue
+        if gain > best_gain:
+            best, best_gain = [direction], gain
+        elif gain == best_gain:
+            best.append(direction)
+    return random.choice(best) if best else None
+
+
+def corner_policy(game):
+    """Keep big tiles in the bottom-left corner: down, left, right, then up"""
+    for direction in ('down', 'left', 'right', 'up'):
+        if preview_move(game, direction)[0]:
+            return direction
+    return None
+
+
+POLICIES = {
+    'random': random_policy,
+    'greedy': greedy_policy,
+    'corner': corner_policy,
+}
+
+
+def play_one_game(policy, engine=Game2048, size=4):
+    """Play a full game with a policy; return (score, max_tile, moves)"""
+    game = engine(size)
+    moves = 0
+    while True:
+        direction = policy(game)
+        if direction is None or not getattr(game, f"move_{direction}")():
+            break
+        game.add_new_tile()
+        moves += 1
+        if not game.can_move():
+            break
+    return game.score, max(max(row) for row in game.board), moves
+
+
+def _selfplay_worker(job):
+    """Process pool entry point: play a chunk of games with one seed"""
+    policy_name, engine_name, size, games, seed = job
+    random.seed(seed)
+    policy = POLICIES[policy_name]
+    engine = ENGINES[engine_name]
+    return [play_one_game(policy, engine, size) for _ in range(games)]
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_selfplay(games=1000, policy='corner', engine=None, workers=None, seed=0, size=4):
+    """Play many games across a process pool and print a statistics report"""
+    if games < 1:
+        print("Self-play needs at least one game")
+        return
+    engine = default_engine_name(engine, size)
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, min(100, games // (workers * 4)))
+    jobs = []
+    remaining = games
+    while remaining > 0:
+        count = min(chunk, remaining)
+        jobs.append((policy, engine, size, count, seed + len(jobs)))
+        remaining -= count
+
+    start = time.perf_counter()
+    if workers == 1:
+        chunks = [_selfplay_worker(job) for job in jobs]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            chunks = pool.map(_selfplay_worker, jobs)
+    elapsed = time.perf_counter() - start
+    results = [result for chunk_results in chunks for result in chunk_results]
+
+    scores = sorted(score for score, _, _ in results)
+    lengths = sorted(moves for _, _, moves in results)
+    max_tiles = Counter(tile for _, tile, _ in results)
+
+    print(f"Self-play report: policy={policy} engine={engine} size={size}x{size} "
+          f"games={games} workers={workers}")
+    print(f"  Games/sec: {games / elapsed:.1f}  ({sum(lengths) / elapsed:,.0f} moves/sec, {elapsed:.2f}s)")
+    print("  Score:  " + "  ".join(
+        f"p{int(q * 100)}={_percentile(scores, q)}" for q in (0.1, 0.25, 0.5, 0.75, 0.9, 0.99)) +
+        f"  max={scores[-1]}  mean={sum(scores) / games:.1f}")
+    print(f"  Length: min={lengths[0]}  p50={_percentile(lengths, 0.5)}  "
+          f"max={lengths[-1]}  mean={sum(lengths) / games:.1f}")
+    print("  Max tile histogram:")
+    reached = 0
+    for tile in sorted(max_tiles, reverse=True):
+        reached += max_tiles[tile]
+        bar = '#' * max(1, round(40 * max_tiles[tile] / games))
+        print(f"    {tile:>6}: {max_tiles[tile]:>6} ({reached / games:6.1%} reached) {bar}")
+
+
+class _CountingWriter:
+    """File wrapper that counts write calls and bytes"""
+
+    def __init__(self, out):
+        self.out = out
+        self.writes = 0
+        self.bytes = 0
+
+    def write(self, text):
+        self.writes += 1
+        self.bytes += len(text.encode())
+        return self.out.write(text)
+
+    def flush(self):
+        self.out.flush()
+
+
+def _legacy_display(game):
+    """The old display: clear via a shell, then many small prints"""
+    os.system('clear' if os.name == 'posix' else 'cls')
+    print("\n" + "=" * 30)
+    print("       2048 GAME")
+    print("=" * 30)
+    print(f"Score: {game.score}\n")
+    for row in game.board:
+        print("+" + "------+" * game.size)
+        print("|", end="")
+        for cell in row:
+            if cell == 0:
+                print("      |", end="")
+            else:
+                color = TILE_COLORS.get(cell, DEFAULT_TILE_COLOR)
+                print(f"{color}{cell:^6}{RESET}|", end="")
+        print()
+    print("+" + "------+" * game.size)
+    print("\nArrow keys to move | q: quit")
+    sys.stdout.flush()
+
+
+def benchmark_render(frames=300, seed=0):
+    """Time frames of the old and new display while playing random moves
+
+    Output goes to the null device (the shell's clear included) so only the
+    cost of producing and writing frames is measured.
+    """
+    directions = ['move_left', 'move_right', 'move_up', 'move_down']
+    results = []
+    real_stdout = sys.stdout
+    saved_fd = os.dup(1)
+    devnull = open(os.devnull, 'w')
+    os.dup2(devnull.fileno(), 1)
+    try:
+        for name in ('legacy', 'full', 'diff'):
+            random.seed(seed)
+            game = Game2048()
+            writer = _CountingWriter(devnull)
+            renderer = TerminalRenderer(writer, max_diff_cells=0 if name == 'full' else 8)
+            sys.stdout = writer
+            timings = []
+            for _ in range(frames):
+                if getattr(game, random.choice(directions))():
+                    game.add_new_tile()
+                elif not game.can_move():
+                    game = Game2048()
+                start = time.perf_counter()
+                if name == 'legacy':
+                    _legacy_display(game)
                 else:
-                    color = colors.get(cell, '\033[97m')
-                    print(f"{color}{cell:^6}{reset}|", end="")
-            print()
-        print("+" + "------+" * self.size)
+                    renderer.render(game)
+                timings.append(time.perf_counter() - start)
+            sys.stdout = real_stdout
+            timings.sort()
+            results.append((name, timings, writer))
+    finally:
+        sys.stdout = real_stdout
+        os.dup2(saved_fd, 1)
+        os.close(saved_fd)
+        devnull.close()
+
+    print(f"Render benchmark: {frames} frames")
+    for name, timings, writer in results:
+        mean = sum(timings) / len(timings) * 1000
+        p95 = timings[int(len(timings) * 0.95)] * 1000
+        print(f"  {name:<7} mean {mean:7.3f} ms  p95 {p95:7.3f} ms  "
+              f"{writer.writes / frames:6.1f} writes/frame  {writer.bytes / frames:7.1f} bytes/frame")
+
+
+# Undo/redo history and save files
+#
+# Every position is stored as a fixed-width little-endian integer of tile
+# exponents (4 bits per cell on 4x4, like the bitboard, 5 bits otherwise)
+# appended to one bytearray, plus the score gained by each move. A 4x4
+# session costs 12 bytes per move.
+
+SAVE_MAGIC = b'2048SAV'
+SAVE_VERSION = 1
+SAVE_HEADER = struct.Struct('<7sBBBBQII')  # magic, version, size, cell bits, won, score, count, pos
+
+
+class History:
+    """Compact undo/redo history of a game, saved as a small binary file"""
+
+    def __init__(self, size):
+        self.size = size
+        self.cell_bits = 4 if size == 4 else 5
+        self.width = (size * size * self.cell_bits + 7) // 8
+        self.boards = bytearray()
+        self.gains = array('I')
+        self.pos = -1
+
+    def __len__(self):
+        return len(self.gains)
+
+    def _pack(self, board):
+        bits = self.cell_bits
+        mask = (1 << bits) - 1
+        packed = 0
+        shift = 0
+        for row in board:
+            for value in row:
+                exponent = value.bit_length() - 1 if value else 0
+                if exponent > mask:
+                    raise ValueError(f"tile {value} does not fit the history format")
+                packed |= exponent << shift
+                shift += bits
+        return packed.to_bytes(self.width, 'little')
+
+    def _unpack(self, index):
+        data = self.boards[index * self.width:(index + 1) * self.width]
+        packed = int.from_bytes(data, 'little')
+        bits = self.cell_bits
+        mask = (1 << bits) - 1
+        board = []
+        for _ in range(self.size):
+            row = []
+            for _ in range(self.size):
+                exponent = packed & mask
+                row.append(1 << exponent if exponent else 0)
+                packed >>= bits
+            board.append(row)
+        return board
+
+    def record(self, game, gain=0):
+        """Append the current position; drops any positions that could be redone"""
+        del self.boards[(self.pos + 1) * self.width:]
+        del self.gains[self.pos + 1:]
+        self.boards += self._pack(game.board)
+        self.gains.append(gain)
+        self.pos += 1
+
+    def _restore(self, game, index, score):
+        game.board = self._unpack(index)
+        game.score = score
+        game.won = any(value >= 2048 for row in game.board for value in row)
+        game.game_over = False
+        self.pos = index
+
+    def undo(self, game):
+        """Step the game back one move; return False if there is nothing to undo"""
+        if self.pos <= 0:
+            return False
+        self._restore(game, self.pos - 1, game.score - self.gains[self.pos])
+        return True
+
+    def redo(self, game):
+        """Replay one undone move; return False if there is nothing to redo"""
+        if self.pos + 1 >= len(self.gains):
+            return False
+        self._restore(game, self.pos + 1, game.score + self.gains[self.pos + 1])
+        return True
+
+    def save(self, path, game):
+        """Write the whole history and the current position to a binary file"""
+        gains = array('I', self.gains)
+        if sys.byteorder != 'little':
+            gains.byteswap()
+        with open(path, 'wb') as f:
+            f.write(SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION, self.size, self.cell_bits,
+                                     int(game.won), game.score, len(self.gains), self.pos))
+            f.write(self.boards)
+            f.write(gains.tobytes())
+
+    @classmethod
+    def load(cls, path, engine=None):
+        """Read a save file; return (game, history) positioned where it was saved"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < SAVE_HEADER.size:
+            raise ValueError(f"{path} is not a 2048 save file")
+        magic, version, size, cell_bits, won, score, count, pos = SAVE_HEADER.unpack_from(data)
+        if magic != SAVE_MAGIC or version != SAVE_VERSION:
+            raise ValueError(f"{path} is not a 2048 save file")
+        history = cls(size)
+        if cell_bits != history.cell_bits:
+            raise ValueError(f"{path} has an unsupported cell format")
+        start = SAVE_HEADER.size
+        end = start + count * history.width
+        if len(data) < end + 4 * count or not 0 <= pos < count:
+            raise ValueError(f"{path} is corrupt")
+        history.boards = bytearray(data[start:end])
+        history.gains = array('I')
+        history.gains.frombytes(data[end:end + 4 * count])
+        if sys.byteorder != 'little':
+            history.gains.byteswap()
+
+        game = (engine or Game2048)(size)
+        history._restore(game, pos, score)
+        game.won = bool(won)
+        return game, history
+
+
+# N-tuple network agent trained by temporal-difference learning
+#
+# The value of an afterstate (the board right after a move, before the spawn)
+# is the sum of lookup-table weights over five 4-cell tuples -- the outer and
+# inner lines and three 2x2 squares -- taken on all eight symmetries of the
+# board. Each tuple reads four exponents, i.e. a 16-bit index straight out of
+# the bitboard, so the weights are one flat float32 table of 5 * 65536 entries.
+#
+# Weight files are a 64-byte header followed by the raw table. Training works
+# directly on a writable mmap (a checkpoint is a flush) and the player maps the
+# file read-only, so both start instantly whatever the table size.
+
+NTUPLE_MAGIC = b'2048NTW'
+NTUPLE_VERSION = 1
+NTUPLE_HEADER = struct.Struct('<7sBIQQ')  # magic, version, tuple count, episodes, moves
+NTUPLE_HEADER_SIZE = 64
+NTUPLE_COUNT = 5
+NTUPLE_FEATURES = 8 * NTUPLE_COUNT
+NTUPLE_TABLE_SIZE = 65536
+
+
+def board_symmetries(bits):
+    """The eight rotations/reflections of a packed board (needs init_tables())"""
+    rev = _ROW_REVERSE
+    result = []
+    for board in (bits, transpose(bits)):
+        mirrored = (rev[board & ROW_MASK] | (rev[(board >> 16) & ROW_MASK] << 16) |
+                    (rev[(board >> 32) & ROW_MASK] << 32) | (rev[board >> 48] << 48))
+        for b in (board, mirrored):
+            result.append(b)
+            result.append((b >> 48) | ((b >> 16) & 0xFFFF0000) |
+                          ((b << 16) & 0xFFFF00000000) | ((b << 48) & 0xFFFF000000000000))
+    return result
+
+
+def ntuple_features(bits):
+    """Flat weight indices of every tuple on every symmetry (40 entries)"""
+    features = []
+    for b in board_symmetries(bits):
+        features.append(b & 0xFFFF)                                                # outer line
+        features.append(0x10000 | ((b >> 16) & 0xFFFF))                            # inner line
+        features.append(0x20000 | (b & 0xFF) | ((b >> 8) & 0xFF00))                # corner square
+        features.append(0x30000 | ((b >> 4) & 0xFF) | ((b >> 12) & 0xFF00))        # edge square
+        features.append(0x40000 | ((b >> 20) & 0xFF) | ((b >> 28) & 0xFF00))       # center square
+    return features
+
+
+class NTupleNetwork:
+    """Flat float32 n-tuple weight table backed by a memory-mapped file"""
+
+    def __init__(self, path, writable=False):
+        init_tables()
+        size = NTUPLE_HEADER_SIZE + 4 * NTUPLE_COUNT * NTUPLE_TABLE_SIZE
+        if writable and not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(NTUPLE_HEADER.pack(NTUPLE_MAGIC, NTUPLE_VERSION, NTUPLE_COUNT, 0, 0))
+                f.truncate(size)
+        self.path = path
+        self.file = open(path, 'r+b' if writable else 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0,
+                             access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        magic, version, count, self.episodes, self.moves = NTUPLE_HEADER.unpack_from(self.map)
+        if magic != NTUPLE_MAGIC or version != NTUPLE_VERSION or count != NTUPLE_COUNT:
+            raise ValueError(f"{path} is not a 2048 n-tuple weight file")
+        if len(self.map) != size:
+            raise ValueError(f"{path} has the wrong size")
+        if sys.byteorder != 'little':
+            raise RuntimeError("n-tuple weight files are little-endian only")
+        self.weights = memoryview(self.map)[NTUPLE_HEADER_SIZE:].cast('f')
+
+    def value(self, bits):
+        """Estimated future score from an afterstate"""
+        w = self.weights
+        return sum(w[i] for i in ntuple_features(bits))
+
+    def update(self, bits, delta):
+        """Spread a TD error over the features of an afterstate"""
+        w = self.weights
+        for i in ntuple_features(bits):
+            w[i] += delta
 
-        print("\nArrow keys to move | q: quit")
+    def checkpoint(self):
+        """Write the header and flush the weights to disk"""
+        NTUPLE_HEADER.pack_into(self.map, 0, NTUPLE_MAGIC, NTUPLE_VERSION, NTUPLE_COUNT,
+                                self.episodes, self.moves)
+        self.map.flush()
 
-        if self.won:
-            print("\nCongratulations! You reached 2048!")
+    def close(self):
+        self.weights.release()
+        self.map.close()
+        self.file.close()
 
-        if self.game_over:
-            print("\nGame Over! No more moves available.")
 
-def get_key():
-    """Get keyboard input"""
-    fd = sys.stdin.fileno()
-    old_settings = termios.tcgetattr(fd)
+class NTupleAgent:
+    """Greedy player: maximise reward plus n-tuple value of the afterstate"""
+
+    MOVES = ExpectimaxAI.MOVES
+
+    def __init__(self, network):
+        init_tables()
+        self.network = network
+        self.name = f"n-tuple {os.path.basename(network.path)}, {network.episodes} episodes"
+
+    def choose(self, bits):
+        """Return (direction, afterstate, reward) or None when no move is legal"""
+        best = None
+        best_value = None
+        value = self.network.value
+        for name, move in self.MOVES:
+            after, reward, _ = move(bits)
+            if after == bits:
+                continue
+            total = reward + value(after)
+            if best is None or total > best_value:
+                best, best_value = (name, after, reward), total
+        return best
+
+    def best_move(self, bits):
+        """Return the best direction or None if stuck"""
+        choice = self.choose(bits)
+        return choice[0] if choice else None
+
+    def describe(self):
+        return "n-tuple"
+
+
+def _spawn_bits(bits):
+    """Add a random 2 (90%) or 4 (10%) to a packed board"""
+    empty_shifts = [shift for shift in range(0, 64, 4) if not (bits >> shift) & 0xF]
+    shift = random.choice(empty_shifts)
+    return bits | ((1 if random.random() < 0.9 else 2) << shift)
+
+
+def train_ntuple(path, episodes=1000, learning_rate=0.1, checkpoint_every=100, seed=None):
+    """TD(0) self-play training on afterstates; checkpoints to the weight file"""
+    if seed is not None:
+        random.seed(seed)
+    network = NTupleNetwork(path, writable=True)
+    agent = NTupleAgent(network)
+    alpha = learning_rate / NTUPLE_FEATURES
+    print(f"Training {path}: {episodes} episodes from episode {network.episodes}, "
+          f"learning rate {learning_rate}")
+
+    scores = []
+    max_tiles = Counter()
+    window_moves = 0
+    window_start = time.perf_counter()
     try:
-        tty.setraw(sys.stdin.fileno())
-        ch = sys.stdin.read(1)
-        # Detect ESC sequences
-        if ch == '\x1b':
-            ch = sys.stdin.read(2)
-            if ch == '[A':
-                return 'up'
-            elif ch == '[B':
-                return 'down'
-            elif ch == '[C':
-                return 'right'
-            elif ch == '[D':
-                return 'left'
-        return ch
+        for episode in range(1, episodes + 1):
+            bits = _spawn_bits(_spawn_bits(0))
+            score = 0
+            previous = None
+            while True:
+                choice = agent.choose(bits)
+                if choice is None:
+                    break
+                _, after, reward = choice
+                if previous is not None:
+                    network.update(previous, alpha * (reward + network.value(after) -
+                                                      network.value(previous)))
+                previous = after
+                score += reward
+                bits = _spawn_bits(after)
+                window_moves += 1
+            # Terminal afterstate: no future reward
+            if previous is not None:
+                network.update(previous, -alpha * network.value(previous))
+
+            network.episodes += 1
+            scores.append(score)
+            max_tiles[max((bits >> shift) & 0xF for shift in range(0, 64, 4))] += 1
+
+            if episode % checkpoint_every == 0 or episode == episodes:
+                network.moves += window_moves
+                network.checkpoint()
+                elapsed = time.perf_counter() - window_start
+                reached = sum(count for exponent, count in max_tiles.items() if exponent >= 11)
+                print(f"  episode {network.episodes}: mean score {sum(scores) / len(scores):.0f}, "
+                      f"2048 rate {reached / len(scores):.1%}, "
+                      f"{window_moves / elapsed:,.0f} moves/sec, {len(scores) / elapsed:.1f} episodes/sec")
+                scores.clear()
+                max_tiles.clear()
+                window_moves = 0
+                window_start = time.perf_counter()
+    except KeyboardInterrupt:
+        # count the moves of the unfinished window too
+        network.moves += window_moves
+        network.checkpoint()
+        print(f"\nInterrupted; checkpoint saved at episode {network.episodes}")
     finally:
-        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        network.close()
 
-def main():
-    game = Game2048()
-    game.display()
 
-    while not game.game_over:
-        key = get_key()
+# Exact endgame database for 3x3 boards
+#
+# Every reachable 3x3 position is enumerated level by level (the tile sum grows
+# by 2 or 4 per spawn, so levels form a DAG), then solved backwards: the value
+# of an afterstate is the exact probability of reaching the target tile under
+# optimal play. Boards are reduced to one canonical form per symmetry class.
+# Afterstate values go into a sorted file of (key, probability) arrays that the
+# hint mode memory-maps and binary-searches, so nothing is loaded up front.
+# The target is a power of two from 8 to 128 (64 by default): each doubling
+# costs about five times the time and memory, so 128 already takes minutes
+# and a few hundred MB, and 2048 itself cannot be reached on a 3x3 board.
 
-        if key == 'q':
-            print("\nExiting game.")
-            break
+ENDGAME_MAGIC = b'2048EGD'
+ENDGAME_TARGETS = (8, 16, 32, 64, 128)
+ENDGAME_VERSION = 1
+ENDGAME_HEADER = struct.Struct('<7sBBBQ')  # magic, version, size, target exponent, count
+ENDGAME_HEADER_SIZE = 64
+ROW3_MASK = 0xFFF
 
-        moved = False
-        if key == 'up':
-            moved = game.move_up()
-        elif key == 'down':
-            moved = game.move_down()
-        elif key == 'left':
-            moved = game.move_left()
-        elif key == 'right':
-            moved = game.move_right()
-
-        if moved:
-            game.add_new_tile()
-            game.display()
+_ROW3_LEFT = None
+_ROW3_RIGHT = None
+_ROW3_REVERSE = None
 
-            if not game.can_move():
-                game.game_over = True
+
+def _reverse_row3(row):
+    return ((row & 0xF) << 8) | (row & 0xF0) | (row >> 8)
+
+
+def init_tables3():
+    """Build the 4096-entry row tables for 3x3 boards"""
+    global _ROW3_LEFT, _ROW3_RIGHT, _ROW3_REVERSE
+    if _ROW3_LEFT is not None:
+        return
+    # A 3-cell row is the low 12 bits of a 4-cell row with an empty last cell
+    left = [_slide_row_left(row)[0] for row in range(4096)]
+    _ROW3_REVERSE = [_reverse_row3(row) for row in range(4096)]
+    _ROW3_RIGHT = [_reverse_row3(left[_reverse_row3(row)]) for row in range(4096)]
+    _ROW3_LEFT = left
+
+
+def pack_board3(board):
+    """Pack a 3x3 list board into a 36-bit int of 4-bit exponents"""
+    bits = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j]:
+                bits |= (board[i][j].bit_length() - 1) << (4 * (3 * i + j))
+    return bits
+
+
+def transpose3(bits):
+    """Transpose a packed 3x3 board (cell 3 * i + j <-> 3 * j + i)"""
+    return ((bits & 0xF000F000F) |
+            ((bits & 0x000F000F0) << 8) | ((bits & 0x0F000F000) >> 8) |
+            ((bits & 0x000000F00) << 16) | ((bits & 0x00F000000) >> 16))
+
+
+def _rows3(bits, table):
+    return table[bits & ROW3_MASK] | (table[(bits >> 12) & ROW3_MASK] << 12) | (table[bits >> 24] << 24)
+
+
+def moves3(bits):
+    """(direction, afterstate) for every move that changes a 3x3 board"""
+    t = transpose3(bits)
+    result = []
+    for name, after in (('up', transpose3(_rows3(t, _ROW3_LEFT))),
+                        ('down', transpose3(_rows3(t, _ROW3_RIGHT))),
+                        ('left', _rows3(bits, _ROW3_LEFT)),
+                        ('right', _rows3(bits, _ROW3_RIGHT))):
+        if after != bits:
+            result.append((name, after))
+    return result
+
+
+def canonical3(bits):
+    """Smallest packed board among the eight symmetries"""
+    best = bits
+    for board in (bits, transpose3(bits)):
+        for b in (board, _rows3(board, _ROW3_REVERSE)):
+            flipped = (b >> 24) | (b & 0xFFF000) | ((b & ROW3_MASK) << 24)
+            best = min(best, b, flipped)
+    return best
+
+
+def _tile_sum3(bits):
+    return sum(1 << e for e in ((bits >> shift) & 0xF for shift in range(0, 36, 4)) if e)
+
+
+def _max_exponent3(bits):
+    return max((bits >> shift) & 0xF for shift in range(0, 36, 4))
+
+
+def build_endgame_db(path, target=64):
+    """Solve 3x3 2048 exactly for a target tile and write the afterstate table"""
+    if target not in ENDGAME_TARGETS:
+        raise ValueError(f"endgame target must be one of {', '.join(map(str, ENDGAME_TARGETS))}")
+    init_tables3()
+    target_exp = target.bit_length() - 1
+    start = time.perf_counter()
+
+    # Forward pass: reachable positions (player to move) and afterstates per tile sum
+    states = {}
+    for a in range(9):
+        for b in range(a + 1, 9):
+            for tile_a in (1, 2):
+                for tile_b in (1, 2):
+                    bits = (tile_a << (4 * a)) | (tile_b << (4 * b))
+                    states.setdefault(_tile_sum3(bits), set()).add(canonical3(bits))
+    afters = {}
+    level = min(states)
+    top = level
+    while level <= top:
+        level_afters = set()
+        for bits in states.get(level, ()):
+            for _, after in moves3(bits):
+                level_afters.add(canonical3(after))
+        for after in level_afters:
+            if _max_exponent3(after) >= target_exp:
+                continue
+            for shift in range(0, 36, 4):
+                if not (after >> shift) & 0xF:
+                    states.setdefault(level + 2, set()).add(canonical3(after | (1 << shift)))
+                    states.setdefault(level + 4, set()).add(canonical3(after | (2 << shift)))
+                    top = max(top, level + 4)
+        if level in states:
+            states[level] = array('Q', sorted(states[level]))
+        afters[level] = array('Q', sorted(level_afters))
+        level += 2
+    total_states = sum(len(level_states) for level_states in states.values())
+    print(f"  {total_states:,} positions, {sum(map(len, afters.values())):,} afterstates "
+          f"({time.perf_counter() - start:.0f}s)")
+
+    # Backward pass, highest tile sum first: afterstate values, then position values
+    keys = array('Q')
+    probs = array('d')
+    values = {}
+    for level in sorted(afters, reverse=True):
+        next2 = values.get(level + 2, {})
+        next4 = values.get(level + 4, {})
+        after_values = {}
+        for after in afters[level]:
+            if _max_exponent3(after) >= target_exp:
+                value = 1.0
+            else:
+                total = 0.0
+                empty = 0
+                for shift in range(0, 36, 4):
+                    if not (after >> shift) & 0xF:
+                        empty += 1
+                        total += (0.9 * next2[canonical3(after | (1 << shift))] +
+                                  0.1 * next4[canonical3(after | (2 << shift))])
+                value = total / empty
+            after_values[after] = value
+            keys.append(after)
+            probs.append(value)
+        values[level] = {
+            bits: max((after_values[canonical3(after)] for _, after in moves3(bits)), default=0.0)
+            for bits in states.get(level, ())
+        }
+        if level + 4 > 8:  # keep the opening levels for the summary below
+            values.pop(level + 4, None)
+    print(f"  solved ({time.perf_counter() - start:.0f}s)")
+
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    sorted_keys = array('Q', (keys[i] for i in order))
+    sorted_probs = array('d', (probs[i] for i in order))
+    if sys.byteorder != 'little':
+        sorted_keys.byteswap()
+        sorted_probs.byteswap()
+    with open(path, 'wb') as f:
+        header = ENDGAME_HEADER.pack(ENDGAME_MAGIC, ENDGAME_VERSION, 3, target_exp, len(keys))
+        f.write(header.ljust(ENDGAME_HEADER_SIZE, b'\0'))
+        f.write(sorted_keys.tobytes())
+        f.write(sorted_probs.tobytes())
+
+    # Opening: two tiles on distinct random cells, each a 2 (90%) or a 4 (10%)
+    opening = 0.0
+    for a in range(9):
+        for b in range(9):
+            if a != b:
+                for tile_a, p_a in ((1, 0.9), (2, 0.1)):
+                    for tile_b, p_b in ((1, 0.9), (2, 0.1)):
+                        bits = (tile_a << (4 * a)) | (tile_b << (4 * b))
+                        opening += p_a * p_b * values[_tile_sum3(bits)][canonical3(bits)] / 72
+    print(f"Wrote {path}: {len(keys):,} afterstates, target {target}, "
+          f"{os.path.getsize(path) / 1e6:.1f} MB ({time.perf_counter() - start:.0f}s)")
+    print(f"Optimal play reaches {target} from a fresh game with probability {opening:.4f}")
+
+
+class EndgameDB:
+    """Read-only view of an endgame table: O(log n) lookups on a memory map"""
+
+    def __init__(self, path):
+        init_tables3()
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, target_exp, count = ENDGAME_HEADER.unpack_from(self.map)
+        if magic != ENDGAME_MAGIC or version != ENDGAME_VERSION or size != 3:
+            raise ValueError(f"{path} is not a 3x3 endgame table")
+        if sys.byteorder != 'little':
+            raise RuntimeError("endgame tables are little-endian only")
+        self.target = 1 << target_exp
+        self.count = count
+        view = memoryview(self.map)
+        keys_end = ENDGAME_HEADER_SIZE + 8 * count
+        self.keys = view[ENDGAME_HEADER_SIZE:keys_end].cast('Q')
+        self.probs = view[keys_end:keys_end + 8 * count].cast('d')
+
+    def lookup(self, after):
+        """Win probability of an afterstate, or None if it is not in the table"""
+        if _max_exponent3(after) >= self.target.bit_length() - 1:
+            return 1.0
+        key = canonical3(after)
+        index = bisect.bisect_left(self.keys, key)
+        if index < self.count and self.keys[index] == key:
+            return self.probs[index]
+        return None
+
+    def hint(self, board):
+        """Return (best direction, win probability) for a 3x3 list board, or None"""
+        best = None
+        for name, after in moves3(pack_board3(board)):
+            prob = self.lookup(after)
+            if prob is not None and (best is None or prob > best[1]):
+                best = (name, prob)
+        return best
+
+
+class KeyReader:
+    """Keyboard reader that keeps the terminal in raw mode for a whole session
+
+    Input is read in bulk and parsed by a small state machine, so keys typed
+    faster than the game handles them are queued rather than lost, and escape
+    sequences split across reads are still recognised. A lone ESC is reported
+    as 'esc' once no further byte arrives within escape_timeout seconds.
+    """
+
+    ARROWS = {'A': 'up', 'B': 'down', 'C': 'right', 'D': 'left'}
+
+    def __init__(self, fd=None, escape_timeout=0.05):
+        self.fd = sys.stdin.fileno() if fd is None else fd
+        self.escape_timeout = escape_timeout
+        self.keys = deque()
+        self.state = 'normal'  # 'normal', 'escape' (after ESC) or 'sequence' (after ESC [ or ESC O)
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        self.saved_settings = None
+
+    def __enter__(self):
+        self.saved_settings = termios.tcgetattr(self.fd)
+        tty.setraw(self.fd)
+        return self
+
+    def __exit__(self, *exc_info):
+        termios.tcsetattr(self.fd, termios.TCSADRAIN, self.saved_settings)
+
+    def feed(self, data):
+        """Parse raw input bytes into queued key names"""
+        for ch in self.decoder.decode(data):
+            if self.state == 'normal':
+                if ch == '\x1b':
+                    self.state = 'escape'
+                else:
+                    self.keys.append(ch)
+            elif self.state == 'escape':
+                if ch in '[O':
+                    self.state = 'sequence'
+                elif ch == '\x1b':
+                    self.keys.append('esc')
+                else:
+                    self.keys.append('esc')
+                    self.keys.append(ch)
+                    self.state = 'normal'
+            elif '\x40' <= ch <= '\x7e':
+                # Final byte of the sequence; parameters (e.g. modifiers) are ignored
+                if ch in self.ARROWS:
+                    self.keys.append(self.ARROWS[ch])
+                self.state = 'normal'
+
+    def _flush_pending(self):
+        """Input went quiet in the middle of a sequence"""
+        if self.state == 'escape':
+            self.keys.append('esc')
+        self.state = 'normal'
+
+    def get_key(self):
+        """Return the next key, blocking until one is available"""
+        while not self.keys:
+            timeout = None if self.state == 'normal' else self.escape_timeout
+            ready, _, _ = select.select([self.fd], [], [], timeout)
+            if not ready:
+                self._flush_pending()
+                continue
+            data = os.read(self.fd, 1024)
+            if not data:
+                return 'q'  # end of input
+            self.feed(data)
+        return self.keys.popleft()
+
+
+ENGINES = {
+    'list': Game2048,
+    'bitboard': BitboardGame2048,
+    'large': LargeBoardGame2048,
+}
+
+
+def default_engine_name(name, size):
+    """The named engine, or when none is named the large engine above 4x4 and list otherwise"""
+    if name is None:
+        name = 'large' if size > 4 else 'list'
+    return name
+
+
+def pick_engine(name, size):
+    """Engine class for a board: the named one, or the default for its size"""
+    return ENGINES[default_engine_name(name, size)]
+
+
+def benchmark(moves=200000, seed=0, size=4):
+    """Play random moves on every engine and report moves per second"""
+    init_tables()
+    directions = ['move_left', 'move_right', 'move_up', 'move_down']
+    print(f"Random-move benchmark: {moves} moves, {size}x{size}, seed {seed}")
+    for name, engine in ENGINES.items():
+        if engine is BitboardGame2048 and size != 4:
+            continue
+        random.seed(seed)
+        game = engine(size)
+        games = 1
+        total_score = 0
+        start = time.perf_counter()
+        for _ in range(moves):
+            # Same per-turn work as the game loop: move, spawn, check can_move
+            if getattr(game, random.choice(directions))():
+                game.add_new_tile()
+                if not game.can_move():
+                    total_score += game.score
+                    game = engine(size)
+                    games += 1
+        elapsed = time.perf_counter() - start
+        total_score += game.score
+        # list and bitboard spawn with the same RNG calls, so their totals match
+        print(f"  {name:<9} {moves / elapsed:>12,.0f} moves/sec  "
+              f"({games} games, total score {total_score})")
+
+
+def main(engine=None, size=4, save_file='2048.sav', resume=False, endgame=None):
+    if resume and os.path.exists(save_file):
+        def make_game(saved_size):
+            if engine == 'bitboard' and saved_size != 4:
+                raise ValueError(f"{save_file} holds a {saved_size}x{saved_size} game "
+                                 f"but --engine bitboard only supports 4x4")
+            return pick_engine(engine, saved_size)(saved_size)
+
+        try:
+            game, history = History.load(save_file, make_game)
+        except (OSError, ValueError) as e:
+            raise SystemExit(f"Cannot resume: {e}")
+        message = f"Resumed from {save_file}"
+    else:
+        game = pick_engine(engine, size)(size)
+        history = History(game.size)
+        history.record(game)
+        message = ""
+    hints = None
+    if endgame and game.size == 3:
+        hints = EndgameDB(endgame)
+    game.renderer = TerminalRenderer(hint_key=hints is not None)
+    game.display(message)
+
+    quit_game = False
+    with KeyReader() as keys:
+        while not game.game_over:
+            key = keys.get_key()
+
+            if key in ('q', CTRL_C):
+                quit_game = True
+                break
+
+            if key == 'u':
+                game.display("Undo" if history.undo(game) else "Nothing to undo")
+                continue
+            if key == 'r':
+                game.display("Redo" if history.redo(game) else "Nothing to redo")
+                continue
+            if key == 'h':
+                hint = hints.hint(game.board) if hints else None
+                if hints is None:
+                    game.display("Hints need a 3x3 game and an endgame table (--endgame)")
+                elif hint is None:
+                    game.display("No hint: position not in the endgame table")
+                else:
+                    game.display(f"Hint: {hint[0]} (reaches {hints.target} with p={hint[1]:.4f})")
+                continue
+            if key == 's':
+                history.save(save_file, game)
+                game.display(f"Saved to {save_file} ({len(history)} positions)")
+                continue
+
+            score = game.score
+            moved = False
+            if key == 'up':
+                moved = game.move_up()
+            elif key == 'down':
+                moved = game.move_down()
+            elif key == 'left':
+                moved = game.move_left()
+            elif key == 'right':
+                moved = game.move_right()
+
+            if moved:
+                game.add_new_tile()
+                history.record(game, game.score - score)
+                game.display()
+
+                if not game.can_move():
+                    game.game_over = True
+                    game.display()
+            elif key in ['up', 'down', 'left', 'right']:
+                # Refresh display even when no move was made
                 game.display()
-        elif key in ['up', 'down', 'left', 'right']:
-            # Refresh display even when no move was made
-            game.display()
+
+    if quit_game:
+        print("\nExiting game.")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="2048 terminal game")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default=None,
+                        help="board engine to play on (default: list, or large above 4x4)")
+    parser.add_argument('--size', type=int, default=4,
+                        help="board size (the bitboard engine is 4x4 only)")
+    parser.add_argument('--endgame', metavar='PATH', default=None,
+                        help="3x3 endgame table for the h (hint) key")
+    parser.add_argument('--build-endgame', metavar='PATH', default=None,
+                        help="solve 3x3 2048 exactly and write an endgame table")
+    parser.add_argument('--target', type=int, default=64,
+                        help="target tile for --build-endgame: a power of two from 8 to 128")
+    parser.add_argument('--save-file', default='2048.sav',
+                        help="file written by the s key and read by --resume")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue the game stored in --save-file")
+    parser.add_argument('--bench', action='store_true',
+                        help="compare engine speed instead of playing")
+    parser.add_argument('--moves', type=int, default=200000,
+                        help="number of moves for --bench")
+    parser.add_argument('--ai', action='store_true',
+                        help="let the expectimax AI play")
+    parser.add_argument('--games', type=int, default=None,
+                        help="number of games for --ai (default 1) or --selfplay (default 1000)")
+    parser.add_argument('--time-budget', type=float, default=0.1,
+                        help="AI thinking time per move in seconds")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="random seed")
+    parser.add_argument('--train', type=int, metavar='EPISODES', default=None,
+                        help="train the n-tuple network by TD self-play")
+    parser.add_argument('--ntuple', action='store_true',
+                        help="let the trained n-tuple agent play")
+    parser.add_argument('--weights', default='2048_ntuple.w',
+                        help="n-tuple weight file for --train and --ntuple")
+    parser.add_argument('--learning-rate', type=float, default=0.1,
+                        help="TD learning rate for --train")
+    parser.add_argument('--checkpoint-every', type=int, default=100,
+                        help="episodes between checkpoints for --train")
+    parser.add_argument('--selfplay', action='store_true',
+                        help="run the multi-core self-play benchmark")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='corner',
+                        help="policy for --selfplay")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for --selfplay (default: all cores)")
+    parser.add_argument('--render-bench', action='store_true',
+                        help="compare frame latency of the old and new display")
+    parser.add_argument('--frames', type=int, default=300,
+                        help="number of frames for --render-bench")
+    parser.add_argument('--batch-bench', action='store_true',
+                        help="benchmark the NumPy batch engine")
+    parser.add_argument('--boards', type=int, default=10000,
+                        help="number of boards for --batch-bench")
+    parser.add_argument('--steps', type=int, default=500,
+                        help="number of lockstep moves for --batch-bench")
+    args = parser.parse_args()
+    if args.games is not None and args.games < 1:
+        parser.error("--games must be at least 1")
+    if args.engine == 'bitboard' and args.size != 4:
+        parser.error("--engine bitboard only supports --size 4")
+    if args.build_endgame and args.target not in ENDGAME_TARGETS:
+        parser.error(f"--target must be a power of two from {ENDGAME_TARGETS[0]} to {ENDGAME_TARGETS[-1]}")
+    if args.bench:
+        benchmark(args.moves, size=args.size)
+    elif args.render_bench:
+        benchmark_render(args.frames, args.seed or 0)
+    elif args.batch_bench:
+        benchmark_batch(args.boards, args.steps, args.seed or 0)
+    elif args.ai:
+        run_ai(args.games or 1, args.time_budget, args.seed)
+    elif args.build_endgame:
+        build_endgame_db(args.build_endgame, args.target)
+    elif args.train:
+        train_ntuple(args.weights, args.train, args.learning_rate, args.checkpoint_every, args.seed)
+    elif args.ntuple:
+        try:
+            network = NTupleNetwork(args.weights)
+        except FileNotFoundError:
+            parser.error(f"no weight file {args.weights}; train first with --train N")
+        run_ai(args.games or 1, seed=args.seed, ai=NTupleAgent(network))
+    elif args.selfplay:
+        run_selfplay(args.games or 1000, args.policy, args.engine, args.workers, args.seed or 0, args.size)
+    else:
+        main(args.engine, args.size, args.save_file, args.resume, args.endgame)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+행맨 서버 부하 테스트 - 놀고 있는 게임 여러 개 유지
+
+접속마다 게임이 하나씩 만들어지므로, 접속한 뒤 한 글자만 추측하고
+정해진 시간 동안 가만히 있는다. 서버 로그에 게임 수와 메모리가 찍힌다.
+
+    python hangman_bot.py ws://localhost:8000 --games 10000 --seconds 30
+"""
+import argparse
+import asyncio
+import json
+import random
+import string
+import time
+
+import websockets
+
+
+async def idle_game(server: str, name: str, hold: asyncio.Event) -> float:
+    """게임 하나 - 접속, 한 글자 추측, 대기. 추측 응답 시간(초)을 반환"""
+    async with websockets.connect(f"{server}/hangman/{name}", open_timeout=60) as websocket:
+        await websocket.recv()
+        start = time.monotonic()
+        await websocket.send(json.dumps({"action": "guess", "letter": random.choice(string.ascii_lowercase)}))
+        await websocket.recv()
+        elapsed = time.monotonic() - start
+        await hold.wait()
+        await websocket.send(json.dumps({"action": "quit"}))
+        return elapsed
+
+
+async def main(server: str, games: int, seconds: float, batch: int):
+    hold = asyncio.Event()
+    tasks = []
+    start = time.monotonic()
+    for i in range(games):
+        tasks.append(asyncio.create_task(idle_game(server, f"bot{i:05d}", hold)))
+        if len(tasks) % batch == 0:
+            await asyncio.sleep(0.05)   # 접속을 조금씩 나눠서
+    print(f"게임 {games}개 접속 시작 ({time.monotonic() - start:.1f}초), {seconds:.0f}초 대기")
+    await asyncio.sleep(seconds)
+    hold.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    failed = [r for r in results if isinstance(r, BaseException)]
+    times = sorted(r for r in results if not isinstance(r, BaseException))
+
+    print(f"게임 {games}개 (실패 {len(failed)})")
+    if failed:
+        print(f"  첫 번째 에러: {failed[0]!r}")
+    if times:
+        print(f"  추측 응답 평균 {sum(times) / len(times) * 1000:.1f}ms, "
+              f"99% {times[int(len(times) * 0.99)] * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="행맨 서버 부하 테스트")
+    parser.add_argument('server', nargs='?', default="ws://localhost:8000", help="서버 주소")
+    parser.add_argument('--games', type=int, default=10000, help="동시에 유지할 게임 수 (기본: 10000)")
+    parser.add_argument('--seconds', type=float, default=30, help="대기 시간 (기본: 30초)")
+    parser.add_argument('--batch', type=int, default=200, help="한 번에 여는 접속 수 (기본: 200)")
+    args = parser.parse_args()
+    asyncio.run(main(args.server, args.games, args.seconds, args.batch))
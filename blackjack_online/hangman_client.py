@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+행맨 온라인 클라이언트
+
+게임 진행은 서버가 맡고, 클라이언트는 받은 상태를 터미널에 그리고
+입력한 글자를 보내기만 한다. 화면은 상위 폴더 hangman.py의 render()를 사용.
+
+    python hangman_client.py ws://localhost:8000 Player1
+"""
+import asyncio
+import json
+import os
+import sys
+
+import websockets
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from hangman import render  # noqa: E402
+
+
+async def ask(prompt: str) -> str:
+    """입력 대기 (이벤트 루프를 막지 않도록 스레드에서)"""
+    return (await asyncio.get_running_loop().run_in_executor(None, input, prompt)).strip()
+
+
+async def play(server: str, player_id: str):
+    async with websockets.connect(f"{server}/hangman/{player_id}") as websocket:
+        while True:
+            message = json.loads(await websocket.recv())
+            if message["type"] != "hangman_state":
+                continue
+            state = message["data"]
+            render(state, state["message"])
+
+            if state["game_over"]:
+                again = await ask("\n  Play again? (y/n): ")
+                action = {"action": "new"} if again.lower() == 'y' else {"action": "quit"}
+            else:
+                guess = await ask("\n  Enter a letter (or 'quit' to exit): ")
+                action = {"action": "quit"} if guess.lower() == 'quit' else {"action": "guess", "letter": guess}
+            await websocket.send(json.dumps(action))
+            if action["action"] == "quit":
+                print("\n  Thanks for playing! 👋\n")
+                return
+
+
+if __name__ == "__main__":
+    server = sys.argv[1] if len(sys.argv) > 1 else "ws://localhost:8000"
+    player_id = sys.argv[2] if len(sys.argv) > 2 else "player"
+    try:
+        asyncio.run(play(server, player_id))
+    except (EOFError, KeyboardInterrupt):
+        print("\n\n  Goodbye!")
+    except OSError:
+        print(f"\n[연결 실패] 서버에 연결할 수 없습니다: {server}")
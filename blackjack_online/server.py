@@ -1,9 +1,23 @@
 # -*- coding: utf-8 -*-
 import asyncio
 import json
+import os
+import sys
+import time
+import traceback
 from typing import Dict, Optional, Set
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from game_logic import BlackjackGame, GameState
+from snake_arena import SnakeArena, TICK_RATE
+
+# 행맨 규칙은 상위 폴더의 hangman.py(HangmanGame)를 그대로 사용
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from hangman import HangmanGame, pick_word  # noqa: E402
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
 
 app = FastAPI(title="Blackjack Online Server", version="1.0.0")
 
@@ -288,10 +302,214 @@ async def handle_client_messages(websocket: WebSocket, player_id: str, game_id:
         print(f"[서버] {player_id} 메시지 처리 에러: {e}")
 
 
+
+# 뱀 게임 아레나 관리
+class ArenaSession:
+    def __init__(self, arena_id: str, arena: SnakeArena):
+        self.arena_id = arena_id
+        self.arena = arena
+        self.sockets: Dict[int, WebSocket] = {}   # {뱀 id: WebSocket}
+        self.task: Optional[asyncio.Task] = None
+        # 부하 측정 (로그 출력 주기마다 초기화)
+        self.ticks = 0
+        self.busy = 0.0
+        self.bytes = 0
+
+
+# 진행 중인 아레나들 {arena_id: ArenaSession}
+arena_sessions: Dict[str, ArenaSession] = {}
+
+ARENA_LOG_SECONDS = 10
+ARENA_MAX_LAG_TICKS = 5   # 이보다 밀리면 따라잡지 않고 일정을 다시 잡음
+ARENA_RESTART_SECONDS = 1   # 틱 루프가 에러로 죽으면 이만큼 쉬고 다시 시작
+
+
+async def send_text(websocket: WebSocket, text: str):
+    """이미 직렬화된 메시지 전송 (브로드캐스트용)"""
+    try:
+        await websocket.send_text(text)
+    except Exception:
+        pass
+
+
+async def run_arena(session: ArenaSession):
+    """아레나 틱 루프 관리 - 에러로 멈추면 기록하고 플레이어가 남아 있는 동안 다시 시작"""
+    try:
+        while session.sockets:
+            try:
+                await arena_ticks(session)
+            except Exception:
+                print(f"[서버] 아레나 {session.arena_id} 틱 루프 에러 - "
+                      f"{ARENA_RESTART_SECONDS}초 후 다시 시작\n{traceback.format_exc()}", end="")
+                await asyncio.sleep(ARENA_RESTART_SECONDS)
+    finally:
+        # 다음 접속이 새 틱 루프를 시작할 수 있도록
+        session.task = None
+
+
+async def arena_ticks(session: ArenaSession):
+    """아레나 틱 루프 - 고정 주기로 진행하고 diff를 모두에게 브로드캐스트"""
+    interval = 1 / TICK_RATE
+    next_tick = time.monotonic() + interval
+    last_log = time.monotonic()
+    while session.sockets:
+        delay = next_tick - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        start = time.monotonic()
+        diff = session.arena.step()
+        # 틱마다 한 번만 직렬화해서 같은 문자열을 모두에게 보냄
+        text = json.dumps({"type": "tick", "data": diff}, separators=(",", ":"))
+        await asyncio.gather(*(send_text(ws, text) for ws in list(session.sockets.values())))
+        now = time.monotonic()
+        session.ticks += 1
+        session.busy += now - start
+        session.bytes += len(text)
+
+        next_tick += interval
+        if now - next_tick > ARENA_MAX_LAG_TICKS * interval:
+            next_tick = now + interval
+
+        if now - last_log >= ARENA_LOG_SECONDS:
+            elapsed = now - last_log
+            print(f"[서버] 아레나 {session.arena_id}: {len(session.sockets)}명, "
+                  f"{session.ticks / elapsed:.1f}틱/초, 틱 처리 {session.busy / session.ticks * 1000:.2f}ms, "
+                  f"diff 평균 {session.bytes / session.ticks:.0f}바이트")
+            session.ticks, session.busy, session.bytes = 0, 0.0, 0
+            last_log = now
+
+
+@app.websocket("/snake/{arena_id}/{player_id}")
+async def snake_endpoint(websocket: WebSocket, arena_id: str, player_id: str):
+    await websocket.accept()
+
+    session = arena_sessions.get(arena_id)
+    if session is None:
+        session = ArenaSession(arena_id, SnakeArena())
+        arena_sessions[arena_id] = session
+        print(f"[서버] 아레나 {arena_id} 생성")
+
+    snake = session.arena.add_player(player_id)
+    session.sockets[snake.snake_id] = websocket
+    print(f"[서버] {player_id} 아레나 {arena_id} 입장 ({len(session.sockets)}명)")
+    await send_message(websocket, "arena_state", session.arena.snapshot(snake.snake_id))
+    if session.task is None:
+        session.task = asyncio.create_task(run_arena(session))
+
+    try:
+        while True:
+            data = json.loads(await websocket.receive_text())
+            action = data.get("action")
+            if action == "turn":
+                session.arena.set_direction(snake.snake_id, data.get("direction"))
+            elif action == "quit":
+                break
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"[서버] {player_id} 메시지 처리 에러: {e}")
+
+    finally:
+        session.sockets.pop(snake.snake_id, None)
+        session.arena.remove_player(snake.snake_id)
+        print(f"[서버] {player_id} 아레나 {arena_id} 퇴장 ({len(session.sockets)}명)")
+        if not session.sockets and arena_sessions.get(arena_id) is session:
+            # 마지막 플레이어가 나가면 틱 루프가 스스로 끝나고 아레나도 정리
+            del arena_sessions[arena_id]
+            print(f"[서버] 아레나 {arena_id} 정리")
+
+
+# 행맨 게임 관리 (접속 하나당 게임 하나)
+# 서버가 게임마다 들고 있는 것은 HangmanGame 레코드뿐이고, 화면 그리기는 클라이언트 몫
+hangman_games: Dict[WebSocket, HangmanGame] = {}
+hangman_monitor: Optional[asyncio.Task] = None
+
+HANGMAN_LOG_SECONDS = 10
+
+
+def process_memory_mb() -> Optional[float]:
+    """현재 프로세스 메모리(RSS, MB) - 알 수 없으면 None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10   # 최대치
+    return None
+
+
+def hangman_record_bytes(game: HangmanGame) -> int:
+    """게임 레코드 하나의 크기 (객체 + 단어 문자열 + 글자 마스크)"""
+    return sys.getsizeof(game) + sys.getsizeof(game.word) + sys.getsizeof(game.guessed)
+
+
+async def run_hangman_monitor():
+    """행맨 게임 수와 메모리 사용량을 주기적으로 출력"""
+    global hangman_monitor
+    while hangman_games:
+        await asyncio.sleep(HANGMAN_LOG_SECONDS)
+        games = list(hangman_games.values())[:1000]
+        if not games:
+            break
+        memory = process_memory_mb()
+        record = sum(map(hangman_record_bytes, games)) // len(games)
+        print(f"[서버] 행맨 게임 {len(hangman_games)}개, 레코드 평균 {record}바이트"
+              + (f", 프로세스 메모리 {memory:.1f}MB" if memory is not None else ""))
+    hangman_monitor = None
+
+
+async def send_hangman_state(websocket: WebSocket, game: HangmanGame, message: str = ""):
+    await send_message(websocket, "hangman_state", {**game.state(), "message": message})
+
+
+@app.websocket("/hangman/{player_id}")
+async def hangman_endpoint(websocket: WebSocket, player_id: str):
+    global hangman_monitor
+    await websocket.accept()
+
+    game = hangman_games[websocket] = HangmanGame(pick_word())
+    if hangman_monitor is None:
+        hangman_monitor = asyncio.create_task(run_hangman_monitor())
+    await send_hangman_state(websocket, game)
+
+    try:
+        while True:
+            data = json.loads(await websocket.receive_text())
+            action = data.get("action")
+            if action == "guess" and not game.game_over:
+                await send_hangman_state(websocket, game, game.guess(str(data.get("letter", ""))))
+            elif action == "new":
+                game = hangman_games[websocket] = HangmanGame(pick_word())
+                await send_hangman_state(websocket, game)
+            elif action == "quit":
+                break
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"[서버] {player_id} 행맨 메시지 처리 에러: {e}")
+
+    finally:
+        hangman_games.pop(websocket, None)
+
+
 if __name__ == "__main__":
+    import argparse
     import uvicorn
+    parser = argparse.ArgumentParser(description="블랙잭 / 뱀 아레나 / 행맨 온라인 서버")
+    # 압축을 켜 두면 접속마다 zlib 버퍼를 들고 있어서 행맨 게임 1만 개 기준 메모리가
+    # 두 배 넘게 늘어남. uvicorn 설정이라 끄면 블랙잭/뱀 아레나 접속도 함께 압축 없이 동작
+    parser.add_argument('--no-ws-deflate', action='store_true',
+                        help="WebSocket permessage-deflate 압축 끄기 (모든 엔드포인트에 적용)")
+    args = parser.parse_args()
     print("="*50)
-    print("블랙잭 온라인 서버 시작")
+    print("블랙잭 / 뱀 아레나 / 행맨 온라인 서버 시작")
     print("포트: 8000")
+    if args.no_ws_deflate:
+        print("WebSocket 압축: 끔")
     print("="*50)
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, ws_per_message_deflate=not args.no_ws_deflate)
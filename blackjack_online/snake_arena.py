@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+import sys
+from collections import deque
+from typing import Dict, List, Optional
+
+# 방향/이동 규칙은 상위 폴더의 snake.py(SnakeGame)와 공유
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from snake import DELTAS, OPPOSITES, Direction  # noqa: E402
+
+TICK_RATE = 20                  # 아레나 틱/초
+TICK_MS = 1000 / TICK_RATE
+RESPAWN_TICKS = 2 * TICK_RATE   # 죽은 뒤 다시 나타나기까지
+
+
+class ArenaSnake:
+    """아레나 안의 뱀 한 마리
+
+    속도 규칙은 SnakeGame과 같다: 기본 120ms마다 한 칸, 세로 이동은 1.8배,
+    먹이를 먹을 때마다 3ms씩 빨라짐(40ms까지). 아레나 틱(50ms)마다 대기
+    시간을 쌓아 두었다가 자기 속도만큼 모이면 한 칸 움직인다.
+    """
+    def __init__(self, snake_id: int, player_id: str):
+        self.snake_id = snake_id
+        self.player_id = player_id
+        self.body: deque = deque()      # 셀 번호(y * width + x), 머리부터
+        self.direction = Direction.RIGHT
+        self.pending: Optional[Direction] = None
+        self.direction_changed = False  # 한 칸 이동마다 방향 전환 한 번
+        self.score = 0
+        self.base_speed = 120
+        self.wait_ms = 0.0
+        self.alive = False
+        self.respawn_tick = 0
+
+    def get_current_speed(self) -> float:
+        """방향에 따른 이동 간격(ms) - SnakeGame.get_current_speed와 동일"""
+        if self.direction in (Direction.UP, Direction.DOWN):
+            return self.base_speed * 1.8
+        return self.base_speed
+
+
+class SnakeArena:
+    """여러 플레이어가 함께하는 뱀 게임 아레나 (서버가 모든 판정을 담당)
+
+    step()은 한 틱을 진행하고 그 틱의 변화만 담은 작은 딕셔너리를 돌려준다.
+    클라이언트는 처음에 snapshot()을 받고, 이후에는 이 diff만 적용한다:
+      t: 틱 번호
+      m: [뱀 id, 새 머리 셀, ...] - 머리를 붙이고 g에 없으면 꼬리를 뗌
+      g: 이번 틱에 먹이를 먹고 자란 뱀 id
+      d: 죽거나 나간 뱀 id
+      s: [뱀 id, 머리 셀, 방향, ...] - 새로 나타난 뱀 (길이 1)
+      j: [뱀 id, 플레이어 이름, ...] - 새로 들어온 플레이어, l: 나간 뱀 id
+      f: 새 먹이 셀, e: 먹힌 먹이 셀
+    빈 항목은 보내지 않는다. 적용 순서는 s, m(g), d.
+    """
+    def __init__(self, height: int = 60, width: int = 120, food_per_player: float = 0.5,
+                 seed: Optional[int] = None):
+        self.height = height
+        self.width = width
+        self.food_per_player = food_per_player
+        self.rng = random.Random(seed)
+        self.tick_count = 0
+        self.snakes: Dict[int, ArenaSnake] = {}
+        self.food: set = set()
+        self.next_id = 1
+        self.offsets = [dy * width + dx for dy, dx in DELTAS]
+
+        # 뱀 몸통 점유 격자와 빈 칸 목록 (먹이 칸도 빈 칸 목록에서 뺌)
+        self.occupied = bytearray(height * width)
+        self.free_cells: List[int] = []
+        self.free_index = [-1] * (height * width)
+        for i in range(1, height - 1):
+            for j in range(1, width - 1):
+                cell = i * width + j
+                self.free_index[cell] = len(self.free_cells)
+                self.free_cells.append(cell)
+
+        self._reset_events()
+
+    def _reset_events(self):
+        self.moved: List[int] = []
+        self.grew: List[int] = []
+        self.died: List[int] = []
+        self.spawned: List[int] = []
+        self.joined: List = []
+        self.left: List[int] = []
+        self.food_added: List[int] = []
+        self.food_eaten: List[int] = []
+
+    def is_wall(self, cell: int) -> bool:
+        y, x = divmod(cell, self.width)
+        return y <= 0 or y >= self.height - 1 or x <= 0 or x >= self.width - 1
+
+    def occupy_cell(self, cell: int):
+        """빈 칸 목록에서 제거 (마지막 칸과 자리 바꾸기)"""
+        pos = self.free_index[cell]
+        last = self.free_cells.pop()
+        if last != cell:
+            self.free_cells[pos] = last
+            self.free_index[last] = pos
+        self.free_index[cell] = -1
+
+    def release_cell(self, cell: int):
+        """빈 칸 목록에 다시 추가"""
+        self.free_index[cell] = len(self.free_cells)
+        self.free_cells.append(cell)
+
+    # 플레이어 관리
+
+    def add_player(self, player_id: str) -> ArenaSnake:
+        """새 플레이어의 뱀을 만들고 바로 배치"""
+        snake = ArenaSnake(self.next_id, player_id)
+        self.next_id += 1
+        self.snakes[snake.snake_id] = snake
+        self.joined += [snake.snake_id, player_id]
+        self.spawn(snake)
+        return snake
+
+    def remove_player(self, snake_id: int):
+        """플레이어가 나가면 뱀을 치움"""
+        snake = self.snakes.pop(snake_id, None)
+        if snake is None:
+            return
+        if snake.alive:
+            self.clear_body(snake)
+            self.died.append(snake_id)
+        self.left.append(snake_id)
+
+    def set_direction(self, snake_id: int, direction) -> None:
+        """플레이어 입력 - 뱀이 다음에 움직일 때 적용"""
+        snake = self.snakes.get(snake_id)
+        if snake is not None and direction in OPPOSITES:
+            snake.pending = Direction(direction)
+
+    def spawn(self, snake: ArenaSnake) -> bool:
+        """빈 칸에 길이 1로 배치, 앞이 막히지 않은 방향을 고름"""
+        for _ in range(32):
+            if not self.free_cells:
+                break
+            cell = self.free_cells[self.rng.randrange(len(self.free_cells))]
+            directions = [d for d in Direction if self.free_index[cell + self.offsets[d]] >= 0]
+            if not directions:
+                continue
+            self.occupy_cell(cell)
+            self.occupied[cell] = 1
+            snake.body = deque([cell])
+            snake.direction = self.rng.choice(directions)
+            snake.pending = None
+            snake.direction_changed = False
+            snake.score = 0
+            snake.base_speed = 120
+            snake.wait_ms = 0.0
+            snake.alive = True
+            self.spawned += [snake.snake_id, cell, int(snake.direction)]
+            return True
+        snake.respawn_tick = self.tick_count + RESPAWN_TICKS
+        return False
+
+    def clear_body(self, snake: ArenaSnake):
+        for cell in snake.body:
+            self.occupied[cell] = 0
+            self.release_cell(cell)
+        snake.body.clear()
+        snake.alive = False
+
+    def place_food(self):
+        """플레이어 수에 맞춰 먹이를 빈 칸에 채움"""
+        target = max(1, int(len(self.snakes) * self.food_per_player))
+        while len(self.food) < target and self.free_cells:
+            cell = self.free_cells[self.rng.randrange(len(self.free_cells))]
+            self.occupy_cell(cell)
+            self.food.add(cell)
+            self.food_added.append(cell)
+
+    # 틱 진행
+
+    def step(self) -> dict:
+        """한 틱 진행 후 이번 틱의 변화(diff)를 반환"""
+        self.tick_count += 1
+
+        for snake in self.snakes.values():
+            if not snake.alive and snake.respawn_tick <= self.tick_count:
+                self.spawn(snake)
+
+        # 이번 틱에 움직일 뱀과 새 머리 위치
+        movers = []
+        for snake in self.snakes.values():
+            if not snake.alive:
+                continue
+            if snake.pending is not None and not snake.direction_changed:
+                if snake.pending != OPPOSITES[snake.direction]:
+                    snake.direction = snake.pending
+                    snake.direction_changed = True
+                snake.pending = None
+            snake.wait_ms += TICK_MS
+            speed = snake.get_current_speed()
+            if snake.wait_ms >= speed:
+                snake.wait_ms -= speed
+                snake.direction_changed = False
+                movers.append((snake, snake.body[0] + self.offsets[snake.direction]))
+
+        # 충돌 판정은 모두 이동 전 상태 기준 (SnakeGame처럼 꼬리 칸도 충돌)
+        head_count: Dict[int, int] = {}
+        for _, head in movers:
+            head_count[head] = head_count.get(head, 0) + 1
+        dead = []
+        survivors = []
+        for snake, head in movers:
+            if self.is_wall(head) or self.occupied[head] or head_count[head] > 1:
+                dead.append(snake)
+            else:
+                survivors.append((snake, head))
+
+        for snake in dead:
+            self.clear_body(snake)
+            snake.respawn_tick = self.tick_count + RESPAWN_TICKS
+            self.died.append(snake.snake_id)
+
+        for snake, head in survivors:
+            snake.body.appendleft(head)
+            self.occupied[head] = 1
+            self.moved += [snake.snake_id, head]
+            if head in self.food:
+                self.food.discard(head)
+                self.food_eaten.append(head)
+                self.grew.append(snake.snake_id)
+                snake.score += 10
+                if snake.base_speed > 40:
+                    snake.base_speed -= 3
+            else:
+                self.occupy_cell(head)
+                tail = snake.body.pop()
+                self.occupied[tail] = 0
+                self.release_cell(tail)
+
+        self.place_food()
+        return self.take_diff()
+
+    def take_diff(self) -> dict:
+        """쌓인 변화를 diff로 만들고 비움"""
+        diff = {"t": self.tick_count}
+        for key, values in (("m", self.moved), ("g", self.grew), ("d", self.died),
+                            ("s", self.spawned), ("j", self.joined), ("l", self.left),
+                            ("f", self.food_added), ("e", self.food_eaten)):
+            if values:
+                diff[key] = values
+        self._reset_events()
+        return diff
+
+    def snapshot(self, snake_id: Optional[int] = None) -> dict:
+        """새로 접속한 플레이어용 전체 상태"""
+        return {
+            "t": self.tick_count,
+            "height": self.height,
+            "width": self.width,
+            "tick_rate": TICK_RATE,
+            "you": snake_id,
+            "players": {str(s.snake_id): s.player_id for s in self.snakes.values()},
+            "snakes": [[s.snake_id, int(s.direction), s.score, list(s.body)]
+                       for s in self.snakes.values() if s.alive],
+            "food": list(self.food),
+        }
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+뱀 아레나 헤드리스 봇 클라이언트
+
+한 프로세스에서 봇 여러 개를 서버에 접속시켜 아레나 부하를 시험한다.
+각 봇은 처음 받은 전체 상태에 틱 diff만 적용해 아레나를 따라가고,
+가장 가까운 먹이 쪽으로 막히지 않은 방향을 골라 움직인다.
+
+    python snake_bot.py ws://localhost:8000 --bots 120 --seconds 30
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+import websockets
+
+DELTAS = ((-1, 0), (1, 0), (0, -1), (0, 1))   # UP, DOWN, LEFT, RIGHT (snake.Direction)
+OPPOSITE = (1, 0, 3, 2)
+
+
+class ArenaView:
+    """서버 diff로 따라가는 아레나 상태 (클라이언트 쪽 사본)"""
+    def __init__(self, snapshot: dict):
+        self.height = snapshot["height"]
+        self.width = snapshot["width"]
+        self.tick = snapshot["t"]
+        self.you = snapshot["you"]
+        self.offsets = [dy * self.width + dx for dy, dx in DELTAS]
+        self.bodies: Dict[int, deque] = {}
+        self.directions: Dict[int, int] = {}
+        self.occupied = bytearray(self.height * self.width)
+        for snake_id, direction, _score, cells in snapshot["snakes"]:
+            self.bodies[snake_id] = deque(cells)
+            self.directions[snake_id] = direction
+            for cell in cells:
+                self.occupied[cell] = 1
+        self.food = set(snapshot["food"])
+
+    def apply(self, diff: dict):
+        """틱 diff 적용 (순서: 새 뱀, 이동, 죽음)"""
+        self.tick = diff["t"]
+        spawned = diff.get("s", [])
+        for i in range(0, len(spawned), 3):
+            snake_id, cell, direction = spawned[i:i + 3]
+            self.remove(snake_id)
+            self.bodies[snake_id] = deque([cell])
+            self.directions[snake_id] = direction
+            self.occupied[cell] = 1
+
+        grew = set(diff.get("g", ()))
+        moved = diff.get("m", [])
+        for i in range(0, len(moved), 2):
+            snake_id, head = moved[i], moved[i + 1]
+            body = self.bodies[snake_id]
+            step = head - body[0]
+            self.directions[snake_id] = self.offsets.index(step)
+            body.appendleft(head)
+            self.occupied[head] = 1
+            if snake_id not in grew:
+                self.occupied[body.pop()] = 0
+
+        for snake_id in diff.get("d", ()):
+            self.remove(snake_id)
+        self.food.difference_update(diff.get("e", ()))
+        self.food.update(diff.get("f", ()))
+
+    def remove(self, snake_id: int):
+        body = self.bodies.pop(snake_id, None)
+        if body:
+            for cell in body:
+                self.occupied[cell] = 0
+        self.directions.pop(snake_id, None)
+
+    def is_blocked(self, cell: int) -> bool:
+        y, x = divmod(cell, self.width)
+        if y <= 0 or y >= self.height - 1 or x <= 0 or x >= self.width - 1:
+            return True
+        return bool(self.occupied[cell])
+
+    def choose_direction(self) -> Optional[int]:
+        """가장 가까운 먹이 쪽의 안전한 방향 (없으면 None)"""
+        body = self.bodies.get(self.you)
+        if not body:
+            return None
+        head = body[0]
+        head_y, head_x = divmod(head, self.width)
+        current = self.directions[self.you]
+        target = None
+        best = None
+        for cell in self.food:
+            y, x = divmod(cell, self.width)
+            distance = abs(y - head_y) + abs(x - head_x)
+            if best is None or distance < best:
+                best, target = distance, (y, x)
+
+        choice, choice_distance = None, None
+        for direction, (dy, dx) in enumerate(DELTAS):
+            if direction == OPPOSITE[current] or self.is_blocked(head + self.offsets[direction]):
+                continue
+            if target is None:
+                distance = 0
+            else:
+                distance = abs(target[0] - head_y - dy) + abs(target[1] - head_x - dx)
+            if choice is None or distance < choice_distance or (distance == choice_distance and direction == current):
+                choice, choice_distance = direction, distance
+        return choice
+
+
+class BotStats:
+    def __init__(self):
+        self.ticks = 0
+        self.bytes = 0
+        self.gaps: List[float] = []
+        self.deaths = 0
+        self.longest = 0
+
+
+async def run_bot(server: str, arena: str, name: str, seconds: float, stats: BotStats):
+    """봇 하나 - 접속해서 정해진 시간 동안 플레이"""
+    async with websockets.connect(f"{server}/snake/{arena}/{name}", max_queue=None) as websocket:
+        message = json.loads(await websocket.recv())
+        view = ArenaView(message["data"])
+        sent = None
+        last = None
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            try:
+                text = await asyncio.wait_for(websocket.recv(), timeout=max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                break
+            now = time.monotonic()
+            message = json.loads(text)
+            if message["type"] != "tick":
+                continue
+            diff = message["data"]
+            if view.you in diff.get("d", ()):
+                stats.deaths += 1
+            if view.you in diff.get("s", [])[::3]:
+                sent = None   # 다시 나타나면 서버 쪽 방향이 새로 정해짐
+            view.apply(diff)
+            stats.ticks += 1
+            stats.bytes += len(text)
+            if last is not None:
+                stats.gaps.append(now - last)
+            last = now
+            body = view.bodies.get(view.you)
+            if body:
+                stats.longest = max(stats.longest, len(body))
+
+            direction = view.choose_direction()
+            if direction is not None and direction != sent:
+                await websocket.send(json.dumps({"action": "turn", "direction": direction}))
+                sent = direction
+        await websocket.send(json.dumps({"action": "quit"}))
+
+
+async def main(server: str, arena: str, bots: int, seconds: float):
+    stats = [BotStats() for _ in range(bots)]
+    tasks = []
+    for i in range(bots):
+        tasks.append(asyncio.create_task(run_bot(server, arena, f"bot{i:03d}", seconds, stats[i])))
+        await asyncio.sleep(0.01)   # 접속을 조금씩 나눠서
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    failed = [r for r in results if isinstance(r, Exception)]
+
+    gaps = sorted(g for s in stats for g in s.gaps)
+    ticks = sum(s.ticks for s in stats)
+    print(f"봇 {bots}개, {seconds:.0f}초 (접속 실패 {len(failed)})")
+    if failed:
+        print(f"  첫 번째 에러: {failed[0]!r}")
+    if gaps:
+        average = sum(gaps) / len(gaps)
+        p99 = gaps[int(len(gaps) * 0.99)]
+        print(f"  봇당 수신 {ticks / bots / seconds:.1f}틱/초, 틱 간격 평균 {average * 1000:.1f}ms, "
+              f"99% {p99 * 1000:.1f}ms, 최대 {gaps[-1] * 1000:.1f}ms")
+        print(f"  diff 평균 {sum(s.bytes for s in stats) / max(1, ticks):.0f}바이트, "
+              f"죽음 {sum(s.deaths for s in stats)}회, 최장 길이 {max(s.longest for s in stats)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="뱀 아레나 헤드리스 봇 클라이언트")
+    parser.add_argument('server', nargs='?', default="ws://localhost:8000", help="서버 주소")
+    parser.add_argument('--arena', default="main", help="아레나 이름 (기본: main)")
+    parser.add_argument('--bots', type=int, default=100, help="봇 수 (기본: 100)")
+    parser.add_argument('--seconds', type=float, default=30, help="플레이 시간 (기본: 30초)")
+    args = parser.parse_args()
+    asyncio.run(main(args.server, args.arena, args.bots, args.seconds))
@@ -5,62 +5,76 @@ Hangman Terminal Game
 Guess the word letter by letter before the hangman is complete!
 """
 
-import random
+import argparse
+import bisect
+import functools
+import math
+import mmap
+import multiprocessing
 import os
+import random
+import re
+import struct
+import time
+from array import array
+from itertools import islice
 
 # Word list for the game (organized by category)
-WORDS = [
-    # Programming
-    "python", "javascript", "algorithm", "function", "variable",
-    "terminal", "developer", "software", "database", "framework",
-    "compiler", "debugging", "interface", "iterator", "recursion",
-    "inheritance", "polymorphism", "encapsulation", "abstraction", "constructor",
-    
-    # Animals
-    "elephant", "giraffe", "butterfly", "dolphin", "penguin",
-    "kangaroo", "crocodile", "cheetah", "flamingo", "octopus",
-    "gorilla", "squirrel", "hedgehog", "jellyfish", "leopard",
-    "peacock", "mongoose", "platypus", "chameleon", "armadillo",
-    
-    # Nature
-    "mountain", "ocean", "forest", "desert", "island",
-    "volcano", "waterfall", "glacier", "canyon", "meadow",
-    "savanna", "tundra", "prairie", "rainforest", "hurricane",
-    "earthquake", "avalanche", "lightning", "rainbow", "sunset",
-    
-    # Music
-    "guitar", "piano", "violin", "trumpet", "drums",
-    "saxophone", "harmonica", "accordion", "tambourine", "xylophone",
-    "orchestra", "symphony", "melody", "rhythm", "harmony",
-    
-    # Food
-    "pizza", "spaghetti", "hamburger", "chocolate", "strawberry",
-    "pineapple", "avocado", "broccoli", "mushroom", "cinnamon",
-    "croissant", "pancake", "sandwich", "sushi", "lasagna",
-    
-    # Sports
-    "basketball", "football", "baseball", "volleyball", "badminton",
-    "swimming", "gymnastics", "marathon", "archery", "skateboard",
-    "snowboard", "wrestling", "cricket", "hockey", "cycling",
-    
-    # Science
-    "chemistry", "physics", "biology", "astronomy", "molecule",
-    "electron", "gravity", "evolution", "photosynthesis", "chromosome",
-    "hypothesis", "experiment", "laboratory", "microscope", "telescope",
-    
-    # Places
-    "hospital", "library", "airport", "restaurant", "university",
-    "museum", "stadium", "theater", "cathedral", "lighthouse",
-    
-    # Objects
-    "keyboard", "notebook", "umbrella", "backpack", "headphones",
-    "telescope", "microscope", "chandelier", "bookshelf", "fireplace",
-    
-    # Miscellaneous
-    "adventure", "mystery", "challenge", "discovery", "imagination",
-    "celebration", "friendship", "knowledge", "happiness", "butterfly",
-    "magnificent", "extraordinary", "spectacular", "wonderful", "incredible"
-]
+WORD_CATEGORIES = {
+    "programming": [
+        "python", "javascript", "algorithm", "function", "variable",
+        "terminal", "developer", "software", "database", "framework",
+        "compiler", "debugging", "interface", "iterator", "recursion",
+        "inheritance", "polymorphism", "encapsulation", "abstraction", "constructor"
+    ],
+    "animals": [
+        "elephant", "giraffe", "butterfly", "dolphin", "penguin",
+        "kangaroo", "crocodile", "cheetah", "flamingo", "octopus",
+        "gorilla", "squirrel", "hedgehog", "jellyfish", "leopard",
+        "peacock", "mongoose", "platypus", "chameleon", "armadillo"
+    ],
+    "nature": [
+        "mountain", "ocean", "forest", "desert", "island",
+        "volcano", "waterfall", "glacier", "canyon", "meadow",
+        "savanna", "tundra", "prairie", "rainforest", "hurricane",
+        "earthquake", "avalanche", "lightning", "rainbow", "sunset"
+    ],
+    "music": [
+        "guitar", "piano", "violin", "trumpet", "drums",
+        "saxophone", "harmonica", "accordion", "tambourine", "xylophone",
+        "orchestra", "symphony", "melody", "rhythm", "harmony"
+    ],
+    "food": [
+        "pizza", "spaghetti", "hamburger", "chocolate", "strawberry",
+        "pineapple", "avocado", "broccoli", "mushroom", "cinnamon",
+        "croissant", "pancake", "sandwich", "sushi", "lasagna"
+    ],
+    "sports": [
+        "basketball", "football", "baseball", "volleyball", "badminton",
+        "swimming", "gymnastics", "marathon", "archery", "skateboard",
+        "snowboard", "wrestling", "cricket", "hockey", "cycling"
+    ],
+    "science": [
+        "chemistry", "physics", "biology", "astronomy", "molecule",
+        "electron", "gravity", "evolution", "photosynthesis", "chromosome",
+        "hypothesis", "experiment", "laboratory", "microscope", "telescope"
+    ],
+    "places": [
+        "hospital", "library", "airport", "restaurant", "university",
+        "museum", "stadium", "theater", "cathedral", "lighthouse"
+    ],
+    "objects": [
+        "keyboard", "notebook", "umbrella", "backpack", "headphones",
+        "telescope", "microscope", "chandelier", "bookshelf", "fireplace"
+    ],
+    "miscellaneous": [
+        "adventure", "mystery", "challenge", "discovery", "imagination",
+        "celebration", "friendship", "knowledge", "happiness", "butterfly",
+        "magnificent", "extraordinary", "spectacular", "wonderful", "incredible"
+    ],
+}
+
+WORDS = [word for words in WORD_CATEGORIES.values() for word in words]
 
 # Hangman stages (7 stages = 6 wrong guesses allowed)
 HANGMAN_STAGES = [
@@ -130,117 +144,858 @@ HANGMAN_STAGES = [
 ]
 
 
+# On-disk word index
+#
+# A dictionary file holds one word per line, optionally followed by
+# whitespace and a category (default: the file name without extension).
+# Its index is written next to it as <file>.idx and memory-mapped, so opening
+# it only reads the header and bucket table however large the dictionary is.
+#
+# Layout (little-endian):
+#   header   magic, version, word count, bucket count, category table size,
+#            source size and mtime (to spot a changed dictionary),
+#            masks offset, words offset
+#   categories  length-prefixed UTF-8 names
+#   buckets  (category id, length, first word, word count, words offset),
+#            one per category and word length, in word order
+#   masks    uint32 letter-set mask per word (bit 0 = 'a')
+#   words    each bucket's words as fixed-width ASCII records
+
+INDEX_MAGIC = b'HMIX'
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct('<4sIIIIQqQQ')
+INDEX_BUCKET = struct.Struct('<HHIIQ')
+
+
+def letter_mask(word):
+    """26-bit mask of the letters in a lowercase word"""
+    mask = 0
+    for letter in word:
+        mask |= 1 << (ord(letter) - 97)
+    return mask
+
+
+def read_dictionary(path):
+    """(word, category) pairs from a dictionary file, normalised and deduplicated"""
+    default = os.path.splitext(os.path.basename(path))[0]
+    seen = set()
+    entries = []
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            parts = line.split(None, 1)
+            if not parts:
+                continue
+            word = parts[0].lower()
+            if not (word.isascii() and word.isalpha()) or len(word) > 255:
+                continue
+            category = parts[1].strip().lower() if len(parts) > 1 else default
+            if (word, category) not in seen:
+                seen.add((word, category))
+                entries.append((word, category))
+    return entries
+
+
+def build_word_index(dictionary_path, index_path=None):
+    """Write the index for a dictionary file and return its path"""
+    index_path = index_path or dictionary_path + '.idx'
+    source = os.stat(dictionary_path)
+    entries = read_dictionary(dictionary_path)
+    categories = sorted({category for _, category in entries})
+    category_ids = {name: i for i, name in enumerate(categories)}
+    entries.sort(key=lambda e: (category_ids[e[1]], len(e[0]), e[0]))
+
+    names = b''.join(struct.pack('<H', len(n.encode())) + n.encode() for n in categories)
+    buckets = []
+    for i, (word, category) in enumerate(entries):
+        key = [category_ids[category], len(word)]
+        if buckets and buckets[-1][:2] == key:
+            buckets[-1][3] += 1
+        else:
+            buckets.append(key + [i, 1, 0])
+
+    masks_offset = INDEX_HEADER.size + len(names) + INDEX_BUCKET.size * len(buckets)
+    masks_offset += -masks_offset % 4
+    words_offset = masks_offset + 4 * len(entries)
+    offset = words_offset
+    for bucket in buckets:
+        bucket[4] = offset
+        offset += bucket[1] * bucket[3]
+
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(entries), len(buckets), len(names),
+                                  source.st_size, source.st_mtime_ns, masks_offset, words_offset))
+        f.write(names)
+        for bucket in buckets:
+            f.write(INDEX_BUCKET.pack(*bucket))
+        f.write(b'\0' * (masks_offset - f.tell()))
+        f.write(array('I', [letter_mask(word) for word, _ in entries]).tobytes())
+        f.write(''.join(word for word, _ in entries).encode('ascii'))
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+class WordIndex:
+    """Memory-mapped word index built by build_word_index
+
+    Words are numbered in index order (category, length, word). Picking a
+    random word walks the bucket table only, never the word list.
+    """
+
+    def __init__(self, index_path):
+        with open(index_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.count, bucket_count, names_size, self.source_size,
+         self.source_mtime_ns, masks_offset, self._words_offset) = INDEX_HEADER.unpack_from(self._map, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"{index_path} is not a hangman word index")
+
+        self.categories = []
+        pos = INDEX_HEADER.size
+        while pos < INDEX_HEADER.size + names_size:
+            (size,) = struct.unpack_from('<H', self._map, pos)
+            self.categories.append(self._map[pos + 2:pos + 2 + size].decode())
+            pos += 2 + size
+        self.buckets = [INDEX_BUCKET.unpack_from(self._map, pos + i * INDEX_BUCKET.size)
+                        for i in range(bucket_count)]
+        self._bucket_starts = [bucket[2] for bucket in self.buckets]
+        self.masks = memoryview(self._map)[masks_offset:masks_offset + 4 * self.count].cast('I')
+
+    @classmethod
+    def for_dictionary(cls, dictionary_path):
+        """Open the index next to a dictionary, (re)building it when missing or stale"""
+        index_path = dictionary_path + '.idx'
+        source = os.stat(dictionary_path)
+        try:
+            index = cls(index_path)
+            if (index.source_size, index.source_mtime_ns) == (source.st_size, source.st_mtime_ns):
+                return index
+            index.close()
+        except (OSError, ValueError, struct.error):
+            pass
+        return cls(build_word_index(dictionary_path, index_path))
+
+    def close(self):
+        self.masks.release()
+        self._map.close()
+
+    def __len__(self):
+        return self.count
+
+    def word(self, i):
+        """The i-th word in index order"""
+        bucket = self.buckets[bisect.bisect_right(self._bucket_starts, i) - 1]
+        length = bucket[1]
+        offset = bucket[4] + (i - bucket[2]) * length
+        return self._map[offset:offset + length].decode('ascii')
+
+    def category(self, i):
+        """Category name of the i-th word"""
+        return self.categories[self.buckets[bisect.bisect_right(self._bucket_starts, i) - 1][0]]
+
+    def length_blob(self, length, category=None):
+        """All words of one length (optionally one category) as fixed-width ASCII
+
+        Without a category the buckets of every category are merged, and a
+        word listed under several categories is kept only once.
+        """
+        parts = []
+        for start, count in self.select(category, length, length):
+            offset = self.buckets[bisect.bisect_right(self._bucket_starts, start) - 1][4]
+            parts.append(self._map[offset:offset + count * length])
+        blob = b''.join(parts)
+        if len(parts) > 1:
+            blob = b''.join(sorted({blob[i:i + length] for i in range(0, len(blob), length)}))
+        return blob
+
+    def select(self, category=None, min_length=None, max_length=None):
+        """Buckets matching the filters as (first word, word count) ranges"""
+        category_id = None
+        if category is not None:
+            if category.lower() not in self.categories:
+                return []
+            category_id = self.categories.index(category.lower())
+        return [(start, count) for cat, length, start, count, _ in self.buckets
+                if (category_id is None or cat == category_id)
+                and (min_length is None or length >= min_length)
+                and (max_length is None or length <= max_length)]
+
+    def random_word(self, category=None, min_length=None, max_length=None, rng=random):
+        """A uniformly random word matching the filters, or None"""
+        ranges = self.select(category, min_length, max_length)
+        total = sum(count for _, count in ranges)
+        if not total:
+            return None
+        pick = rng.randrange(total)
+        for start, count in ranges:
+            if pick < count:
+                return self.word(start + pick)
+            pick -= count
+
+
+def pick_word(index=None, category=None, min_length=None, max_length=None, ranking=None, band=None):
+    """Choose a word from the index, or from the built-in list when there is none
+
+    With a DifficultyIndex (ranking) the word comes from the given band.
+    Without an index the ranking is built from the already filtered word list.
+    """
+    if ranking is not None:
+        if index is None:
+            i = ranking.random_id(band)
+        else:
+            i = ranking.random_id_in(index.select(category, min_length, max_length), band)
+        return None if i is None else ranking.word(i)
+    if index is not None:
+        return index.random_word(category, min_length, max_length)
+    if category is None:
+        words = WORDS
+    else:
+        words = WORD_CATEGORIES.get(category.lower(), [])
+    words = [w for w in words
+             if (min_length is None or len(w) >= min_length)
+             and (max_length is None or len(w) <= max_length)]
+    return random.choice(words) if words else None
+
+
+# Solver and hints
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+LETTER_FREQUENCY = 'etaoinsrhldcumfpgwybvkxjqz'   # fallback when no word fits
+COMPACT_RATIO = 4   # rebuild a smaller table once candidates drop below 1/4
+HINT_CACHE_SIZE = 4096   # hints remembered per solver, by board state
+# bytes.translate tables turning a column of letters into a '0'/'1' string per letter
+COLUMN_TABLES = [bytes(ord('1') if i == 97 + c else ord('0') for i in range(256)) for c in range(26)]
+
+if hasattr(int, 'bit_count'):
+    popcount = int.bit_count
+else:
+    def popcount(bits):
+        return bin(bits).count('1')
+
+
+class CandidateTable:
+    """Bitsets over every dictionary word of one length
+
+    Bit i of each bitset stands for the i-th word. positions[c][p] marks the
+    words with letter c at position p and anywhere[c] the words containing c,
+    so filtering by a pattern is a few AND / AND-NOT operations on ints. A
+    letter's bitsets are built on first use through letter_bits(c).
+    """
+
+    def __init__(self, length, blob):
+        self.length = length
+        self.blob = blob
+        self.count = len(blob) // length
+        self.all_bits = (1 << self.count) - 1
+        self.opening = None   # best first guess, filled in by HangmanSolver
+        self.positions = [None] * 26
+        self.anywhere = [None] * 26
+        self._subset = None   # (bits, table) of the last compact()
+        self._columns = None
+
+    def letter_bits(self, c):
+        """(positions, anywhere) for letter number c, building them on first use"""
+        positions = self.positions[c]
+        if positions is None:
+            if self._columns is None:
+                self._columns = [self.blob[p::self.length] for p in range(self.length)]
+            letter, table = 97 + c, COLUMN_TABLES[c]
+            positions = [int(column.translate(table)[::-1], 2) if letter in column else 0
+                         for column in self._columns]
+            anywhere = 0
+            for bits in positions:
+                anywhere |= bits
+            self.positions[c], self.anywhere[c] = positions, anywhere
+        return positions, self.anywhere[c]
+
+    def word(self, i):
+        return self.blob[i * self.length:(i + 1) * self.length].decode('ascii')
+
+    def words(self, bits):
+        """Words whose bits are set (lowest first)"""
+        found = []
+        flags = bin(bits)[:1:-1]
+        i = flags.find('1')
+        while i >= 0:
+            found.append(self.word(i))
+            i = flags.find('1', i + 1)
+        return found
+
+    def narrow(self, bits, letter, cells):
+        """Candidates left after guessing letter, given the cells revealed so far"""
+        positions, anywhere = self.letter_bits(ord(letter) - 97)
+        if letter not in cells:
+            return bits ^ (bits & anywhere)
+        for p, cell in enumerate(cells):
+            if cell == letter:
+                bits &= positions[p]
+            elif cell == '_':
+                bits ^= bits & positions[p]
+        return bits
+
+    def partition(self, bits, letter, cells):
+        """Split candidates by where letter would be revealed
+
+        Returns (absent, groups): the bitset of words without the letter and
+        a list of [count, bitset] pairs, one per reveal pattern. Single-word
+        groups are not split further since they cannot change the counts.
+        """
+        positions, anywhere = self.letter_bits(ord(letter) - 97)
+        present = bits & anywhere
+        groups = [[popcount(present), present]] if present else []
+        for p, cell in enumerate(cells):
+            if cell != '_':
+                continue
+            column = positions[p]
+            for i in range(len(groups)):
+                count, group = groups[i]
+                if count > 1:
+                    hit = group & column
+                    if hit:
+                        hits = popcount(hit)
+                        if hits < count:
+                            groups[i] = [hits, hit]
+                            groups.append([count - hits, group ^ hit])
+        return bits ^ present, groups
+
+    def distinct(self):
+        """True when no word is listed twice, so a bitset's popcount counts distinct words"""
+        length = self.length
+        return len({self.blob[i:i + length] for i in range(0, len(self.blob), length)}) == self.count
+
+    def first(self, bits):
+        """The lowest-numbered word among the candidates"""
+        return self.word((bits & -bits).bit_length() - 1)
+
+    def subset(self, bits):
+        """A smaller table holding only the candidate words, so later bit work is cheaper"""
+        length, blob = self.length, self.blob
+        starts = [m.start() * length for m in re.finditer('1', bin(bits)[:1:-1])]
+        return CandidateTable(length, b''.join([blob[i:i + length] for i in starts]))
+
+    def compact(self, bits):
+        """(table, bits) over a subset table once few enough candidates are left"""
+        if popcount(bits) * COMPACT_RATIO >= self.count:
+            return self, bits
+        if self._subset is None or self._subset[0] != bits:
+            self._subset = (bits, self.subset(bits))
+        table = self._subset[1]
+        return table, table.all_bits
+
+
+class HangmanSolver:
+    """Narrows a game state to the dictionary words that fit and suggests letters
+
+    The suggested letter maximises the information gained from the answer
+    (the entropy of the reveal patterns over the remaining candidates);
+    ties go to the letter most likely to be in the word. Hints are cached by
+    board state, and the candidates of the last hint for each word length
+    are kept as a subset table that the next state of the game narrows from.
+    """
+
+    def __init__(self, words=None, index=None, category=None):
+        self.index = index
+        self.category = category
+        self.tables = {}
+        self.hints = {}
+        self._narrowed = {}   # length -> (cells, guessed, table) of the last hint
+        self._blobs = {}
+        if index is None:
+            for word in (words if words is not None else WORDS):
+                word = word.lower()
+                self._blobs.setdefault(len(word), []).append(word)
+
+    def table(self, length):
+        """CandidateTable for one word length, built on first use"""
+        table = self.tables.get(length)
+        if table is None:
+            if self.index is not None:
+                blob = self.index.length_blob(length, self.category)
+            else:
+                blob = ''.join(sorted(set(self._blobs.get(length, ())))).encode('ascii')
+            table = self.tables[length] = CandidateTable(length, blob)
+        return table
+
+    def _narrowed_table(self, cells, guessed):
+        """The last hint's subset table if this state follows from it, else the full table"""
+        last = self._narrowed.get(len(cells))
+        if last is not None:
+            last_cells, last_guessed, table = last
+            if last_guessed <= guessed and all(
+                    old == new if old != '_' else new not in last_guessed
+                    for old, new in zip(last_cells, cells)):
+                return table
+        return self.table(len(cells))
+
+    def candidates(self, pattern, guessed):
+        """(table, bits) for a pattern like get_display_word() and the guessed letters"""
+        cells = pattern.replace(' ', '').lower()
+        guessed = {letter.lower() for letter in guessed}
+        table = self._narrowed_table(cells, guessed)
+        bits = table.all_bits
+        for p, cell in enumerate(cells):
+            if cell != '_':
+                bits &= table.letter_bits(ord(cell) - 97)[0][p]
+        for letter in guessed:
+            positions, anywhere = table.letter_bits(ord(letter) - 97)
+            if letter not in cells:
+                bits ^= bits & anywhere
+            else:
+                for p, cell in enumerate(cells):
+                    if cell == '_':
+                        bits ^= bits & positions[p]
+        return table, bits
+
+    def best_letter(self, table, bits, cells, guessed):
+        """The most informative letter to guess next (lowercase)"""
+        total = popcount(bits)
+        if total == 1:
+            return next(letter for letter in table.words(bits)[0] if letter not in guessed)
+        opening = not guessed and bits == table.all_bits
+        if opening and table.opening:
+            return table.opening
+        # Letters that split the candidates most evenly go first; a letter
+        # missing from m words scores at best m log m, so once that is worse
+        # than the best so far it needs no partition. Ties go alphabetically.
+        order = []
+        for letter in LETTERS:
+            if letter not in guessed:
+                present = popcount(bits & table.letter_bits(ord(letter) - 97)[1])
+                order.append((abs(2 * present - total), letter, present))
+        order.sort()
+        table, bits = table.compact(bits)
+        best, best_score = None, None
+        for _, letter, present in order:
+            if not present:
+                continue
+            # entropy up to constants: lower sum(n log n) = more information
+            missing = total - present
+            floor = missing * math.log(missing) if missing else 0.0
+            if best_score is not None and -floor < best_score[0]:
+                continue
+            absent, groups = table.partition(bits, letter, cells)
+            spread = sum(count * math.log(count) for count, _ in groups) + floor
+            score = (-spread, -missing, -ord(letter))
+            if best_score is None or score > best_score:
+                best, best_score = letter, score
+        if best is None:
+            best = next(letter for letter in LETTER_FREQUENCY if letter not in guessed)
+        if opening:
+            table.opening = best
+        return best
+
+    def suggest(self, pattern, guessed):
+        """(letter, candidate count) for a game state; letters are uppercase"""
+        guessed = frozenset(letter.lower() for letter in guessed)
+        cells = pattern.replace(' ', '').lower()
+        key = (cells, guessed)
+        hint = self.hints.get(key)
+        if hint is None:
+            table, bits = self.candidates(cells, guessed)
+            letter = self.best_letter(table, bits, cells, guessed)
+            # best_letter compacted the same bits, so this reuses its subset
+            self._narrowed[len(cells)] = (cells, guessed, table.compact(bits)[0])
+            if len(self.hints) >= HINT_CACHE_SIZE:
+                self.hints.clear()
+            hint = self.hints[key] = (letter.upper(), popcount(bits))
+        return hint
+
+
+class SolverRun:
+    """Lets a solver play whole words, sharing decisions between them
+
+    Decisions are cached by game state, since every word that reaches the
+    same pattern with the same misses gets the same next guess.
+    """
+
+    def __init__(self, solver):
+        self.solver = solver
+        self.decisions = {}
+        self.decide_seconds = 0.0
+
+    def play(self, word):
+        """Guess until the word is revealed; returns the number of misses"""
+        table = self.solver.table(len(word))
+        bits = table.all_bits
+        cells = '_' * len(word)
+        guessed = set()
+        wrong = ''
+        while '_' in cells:
+            key = (cells, wrong)
+            letter = self.decisions.get(key)
+            if letter is None:
+                t = time.perf_counter()
+                letter = self.decisions[key] = self.solver.best_letter(table, bits, cells, guessed)
+                self.decide_seconds += time.perf_counter() - t
+            guessed.add(letter)
+            if letter in word:
+                cells = ''.join(w if w == letter else c for w, c in zip(word, cells))
+            else:
+                wrong += letter
+            bits = table.narrow(bits, letter, cells)
+        return len(wrong)
+
+
+def benchmark_solver(solver, words, limit=None, max_wrong=6):
+    """Let the solver play every word and report how it did"""
+    words = list(islice(words, limit))
+    run = SolverRun(solver)
+    start = time.perf_counter()
+    misses = [run.play(word) for word in words]
+    elapsed = time.perf_counter() - start
+    decisions = len(run.decisions)
+
+    print(f"Hangman solver: {len(words)} words")
+    print(f"  average wrong guesses: {sum(misses) / max(1, len(words)):.2f}")
+    print(f"  won within {max_wrong} misses: "
+          f"{100 * sum(m < max_wrong for m in misses) / max(1, len(words)):.1f}%")
+    print(f"  {len(words) / elapsed:.0f} words/s ({elapsed:.1f}s)")
+    print(f"  {decisions} distinct states, {1000 * run.decide_seconds / max(1, decisions):.2f} ms per decision")
+
+
+# Difficulty
+#
+# A word's difficulty score is the number of misses the solver needs for it,
+# plus the mean rarity of its letters (0..1) and a bonus for short words,
+# which give fewer letters away. Scores for a dictionary are computed once
+# across a process pool and kept next to it as <file>.scores: the scores in
+# ascending order followed by the matching word numbers, so a draw from a
+# score range or difficulty band is a bisect and a random pick.
+
+DIFFICULTY_BANDS = {'easy': (0.0, 1 / 3), 'medium': (1 / 3, 2 / 3), 'hard': (2 / 3, 1.0)}
+RARITY_WEIGHT = 1.0
+LENGTH_WEIGHT = 2.0
+SCORES_MAGIC = b'HMSC'
+SCORES_VERSION = 1
+SCORES_HEADER = struct.Struct('<4sIIQq')
+SCORE_CHUNK = 2000   # words per process pool job
+
+_score_runs = {}   # per worker process: index path -> SolverRun
+
+
+def letter_rarity(masks):
+    """Per-letter rarity: the fraction of words that do not contain the letter"""
+    masks = list(masks)
+    return [1 - sum(mask >> c & 1 for mask in masks) / max(1, len(masks)) for c in range(26)]
+
+
+def word_difficulty(word, misses, rarity):
+    letters = set(word)
+    return (misses + RARITY_WEIGHT * sum(rarity[ord(letter) - 97] for letter in letters) / len(letters)
+            + LENGTH_WEIGHT / len(word))
+
+
+def _score_worker(job):
+    """Process pool entry point: score a range of words of one length"""
+    index_path, start, stop, rarity = job
+    run = _score_runs.get(index_path)
+    if run is None:
+        run = _score_runs[index_path] = SolverRun(HangmanSolver(index=WordIndex(index_path)))
+    words = map(run.solver.index.word, range(start, stop))
+    return [word_difficulty(word, run.play(word), rarity) for word in words]
+
+
+class DifficultyIndex:
+    """Words sorted by difficulty score, for O(log n) draws from a band
+
+    scores is ascending and ids[k] is the word scores[k] belongs to, as a
+    WordIndex word number or a position in the built-in word list.
+    """
+
+    def __init__(self, scores, ids, word):
+        self.scores = scores
+        self.ids = ids
+        self.word = word
+        self._band_ids = {}   # band -> its word numbers in ascending order
+
+    @classmethod
+    def from_words(cls, words, solver=None):
+        """Score a small word list in this process"""
+        words = [word.lower() for word in words]
+        run = SolverRun(solver or HangmanSolver(words))
+        rarity = letter_rarity(map(letter_mask, words))
+        ranked = sorted((word_difficulty(word, run.play(word), rarity), i) for i, word in enumerate(words))
+        return cls(array('f', [score for score, _ in ranked]), array('I', [i for _, i in ranked]),
+                   words.__getitem__)
+
+    @classmethod
+    def for_dictionary(cls, index, dictionary_path, workers=None, rescore=False):
+        """Open the scores next to a dictionary, scoring it first when missing or stale"""
+        path = dictionary_path + '.scores'
+        if not rescore:
+            try:
+                with open(path, 'rb') as f:
+                    scores_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, version, count, size, mtime_ns = SCORES_HEADER.unpack_from(scores_map, 0)
+                if ((magic, version, count, size, mtime_ns)
+                        == (SCORES_MAGIC, SCORES_VERSION, len(index), index.source_size, index.source_mtime_ns)):
+                    view = memoryview(scores_map)[SCORES_HEADER.size:]
+                    return cls(view[:4 * count].cast('f'), view[4 * count:8 * count].cast('I'), index.word)
+                scores_map.close()
+            except (OSError, ValueError, struct.error):
+                pass
+        score_dictionary(index, dictionary_path, workers)
+        return cls.for_dictionary(index, dictionary_path)
+
+    def __len__(self):
+        return len(self.scores)
+
+    def band_range(self, band=None):
+        """[low, high) positions in scores covered by a band (everything for None)"""
+        if band is None:
+            return 0, len(self.scores)
+        start, stop = DIFFICULTY_BANDS[band]
+        return int(start * len(self.scores)), int(stop * len(self.scores))
+
+    def band_ids(self, band=None):
+        """Word numbers in a band in ascending order, sorted on first use"""
+        ids = self._band_ids.get(band)
+        if ids is None:
+            low, high = self.band_range(band)
+            ids = self._band_ids[band] = array('I', sorted(self.ids[low:high]))
+        return ids
+
+    def random_id_in(self, ranges, band=None, rng=random):
+        """A uniformly random word number from a band inside (first word, count) ranges, or None
+
+        Each range is a WordIndex bucket, so the matching words in it are
+        found with two bisects over the band's sorted word numbers.
+        """
+        ids = self.band_ids(band)
+        spans = []
+        total = 0
+        for start, count in ranges:
+            low = bisect.bisect_left(ids, start)
+            high = bisect.bisect_left(ids, start + count, low)
+            if high > low:
+                spans.append((low, high))
+                total += high - low
+        if not total:
+            return None
+        pick = rng.randrange(total)
+        for low, high in spans:
+            if pick < high - low:
+                return ids[low + pick]
+            pick -= high - low
+
+    def random_id(self, band=None, min_score=None, max_score=None, rng=random):
+        """A random word number from a band and/or score range, or None"""
+        low, high = self.band_range(band)
+        if min_score is not None:
+            low = max(low, bisect.bisect_left(self.scores, min_score))
+        if max_score is not None:
+            high = min(high, bisect.bisect_right(self.scores, max_score))
+        if low >= high:
+            return None
+        return self.ids[rng.randrange(low, high)]
+
+
+def score_dictionary(index, dictionary_path, workers=None):
+    """Score every word of an indexed dictionary across a process pool and write <file>.scores"""
+    workers = workers or os.cpu_count() or 1
+    index_path = dictionary_path + '.idx'
+    rarity = letter_rarity(index.masks)
+    # one job per chunk of a bucket, so each job only needs one solver table
+    jobs = [(index_path, chunk, min(chunk + SCORE_CHUNK, start + count), rarity)
+            for _, _, start, count, _ in index.buckets
+            for chunk in range(start, start + count, SCORE_CHUNK)]
+
+    print(f"Scoring {len(index)} words with {workers} worker(s)...")
+    begin = time.perf_counter()
+    if workers == 1:
+        chunks = [_score_worker(job) for job in jobs]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            chunks = pool.map(_score_worker, jobs)
+    scores = [score for chunk in chunks for score in chunk]
+    print(f"  done in {time.perf_counter() - begin:.1f}s")
+
+    ids = sorted(range(len(scores)), key=scores.__getitem__)
+    tmp_path = dictionary_path + '.scores.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(SCORES_HEADER.pack(SCORES_MAGIC, SCORES_VERSION, len(scores),
+                                   index.source_size, index.source_mtime_ns))
+        f.write(array('f', [scores[i] for i in ids]).tobytes())
+        f.write(array('I', ids).tobytes())
+    os.replace(tmp_path, dictionary_path + '.scores')
+
+
 class HangmanGame:
-    def __init__(self):
-        self.word = random.choice(WORDS).upper()
-        self.guessed_letters = set()
+    """State of one hangman game
+
+    Kept to three slots so a server can hold thousands of games: the guessed
+    letters are a 26-bit mask (bit 0 = 'A') instead of a set, and drawing
+    the game is left to render(), which only needs state().
+    """
+    __slots__ = ('word', 'guessed', 'wrong_guesses')
+    max_wrong = 6
+
+    def __init__(self, word=None):
+        self.word = (word or random.choice(WORDS)).upper()
+        self.guessed = 0
         self.wrong_guesses = 0
-        self.max_wrong = 6
-        self.game_over = False
-        self.won = False
+
+    @property
+    def guessed_letters(self):
+        """Guessed letters as a set"""
+        return {chr(65 + i) for i in range(26) if self.guessed >> i & 1}
+
+    @property
+    def won(self):
+        return letter_mask(self.word.lower()) & ~self.guessed == 0
+
+    @property
+    def game_over(self):
+        return self.wrong_guesses >= self.max_wrong or self.won
 
     def get_display_word(self):
         """Return the word with unguessed letters as underscores"""
         return ' '.join(
-            letter if letter in self.guessed_letters else '_'
+            letter if self.guessed >> (ord(letter) - 65) & 1 else '_'
             for letter in self.word
         )
 
     def get_wrong_letters(self):
         """Return list of wrong guessed letters"""
-        return sorted([
-            letter for letter in self.guessed_letters
-            if letter not in self.word
-        ])
+        wrong = self.guessed & ~letter_mask(self.word.lower())
+        return [chr(65 + i) for i in range(26) if wrong >> i & 1]
 
     def guess(self, letter):
         """Make a guess and return result message"""
         letter = letter.upper()
         
-        if not letter.isalpha() or len(letter) != 1:
+        if len(letter) != 1 or not 'A' <= letter <= 'Z':
             return "Please enter a single letter!"
         
-        if letter in self.guessed_letters:
+        bit = 1 << (ord(letter) - 65)
+        if self.guessed & bit:
             return f"You already guessed '{letter}'!"
         
-        self.guessed_letters.add(letter)
+        self.guessed |= bit
         
         if letter in self.word:
-            # Check if won
-            if all(l in self.guessed_letters for l in self.word):
-                self.won = True
-                self.game_over = True
             return f"Good! '{letter}' is in the word!"
         else:
             self.wrong_guesses += 1
-            if self.wrong_guesses >= self.max_wrong:
-                self.game_over = True
             return f"Sorry, '{letter}' is not in the word."
 
-    def display(self, message=""):
-        """Display the current game state"""
-        os.system('clear' if os.name == 'posix' else 'cls')
-        
-        # Colors
-        red = '\033[91m'
-        green = '\033[92m'
-        yellow = '\033[93m'
-        cyan = '\033[96m'
-        reset = '\033[0m'
-        bold = '\033[1m'
-        
-        print(f"\n{cyan}{bold}{'=' * 40}{reset}")
-        print(f"{cyan}{bold}          🎮 HANGMAN GAME 🎮{reset}")
-        print(f"{cyan}{bold}{'=' * 40}{reset}\n")
-        
-        # Hangman figure
-        print(HANGMAN_STAGES[self.wrong_guesses])
-        
-        # Word display
-        print(f"\n  {bold}Word:{reset} {yellow}{self.get_display_word()}{reset}")
-        print(f"  {bold}Length:{reset} {len(self.word)} letters\n")
-        
-        # Wrong letters
-        wrong = self.get_wrong_letters()
-        if wrong:
-            print(f"  {bold}Wrong guesses:{reset} {red}{', '.join(wrong)}{reset}")
-        
-        # Remaining attempts
-        remaining = self.max_wrong - self.wrong_guesses
-        if remaining <= 2:
-            print(f"  {bold}Remaining:{reset} {red}{remaining} attempts{reset}")
+    def state(self):
+        """Everything needed to draw the game (the word only once it is over)"""
+        game_over = self.game_over
+        return {
+            'pattern': self.get_display_word(),
+            'wrong': ''.join(self.get_wrong_letters()),
+            'wrong_guesses': self.wrong_guesses,
+            'max_wrong': self.max_wrong,
+            'game_over': game_over,
+            'won': game_over and self.won,
+            'word': self.word if game_over else None,
+        }
+
+
+class EvilHangmanGame(HangmanGame):
+    """Hangman that never commits to a word
+
+    It keeps every dictionary word that still fits the board and answers
+    each guess with whichever reveal pattern leaves the most of them (a miss
+    when that is the biggest family). self.word is just one member of the
+    current family, so the display and win checks work unchanged. The table
+    must list each word once, or duplicated words would weigh twice when
+    picking the largest family.
+    """
+    __slots__ = ('table', 'candidates')
+
+    def __init__(self, table):
+        if not table.distinct():
+            raise ValueError("evil hangman needs a word table without duplicates")
+        self.table = table
+        self.candidates = table.all_bits
+        super().__init__(table.first(self.candidates))
+
+    def guess(self, letter):
+        """Shrink the candidates to the largest family, then score the guess"""
+        letter = letter.upper()
+        if len(letter) == 1 and 'A' <= letter <= 'Z' and not self.guessed >> (ord(letter) - 65) & 1:
+            cells = self.get_display_word().replace(' ', '').lower()
+            absent, groups = self.table.partition(self.candidates, letter.lower(), cells)
+            count, family = max(groups, key=lambda group: group[0], default=(0, 0))
+            missing = popcount(absent)
+            if missing >= count:
+                family = absent
+            self.candidates = family
+            self.word = self.table.first(family).upper()
+        return super().guess(letter)
+
+
+def render(state, message=""):
+    """Draw a game from HangmanGame.state() in the terminal"""
+    os.system('clear' if os.name == 'posix' else 'cls')
+    
+    # Colors
+    red = '\033[91m'
+    green = '\033[92m'
+    yellow = '\033[93m'
+    cyan = '\033[96m'
+    reset = '\033[0m'
+    bold = '\033[1m'
+    
+    print(f"\n{cyan}{bold}{'=' * 40}{reset}")
+    print(f"{cyan}{bold}          🎮 HANGMAN GAME 🎮{reset}")
+    print(f"{cyan}{bold}{'=' * 40}{reset}\n")
+    
+    # Hangman figure
+    print(HANGMAN_STAGES[state['wrong_guesses']])
+    
+    # Word display
+    print(f"\n  {bold}Word:{reset} {yellow}{state['pattern']}{reset}")
+    print(f"  {bold}Length:{reset} {len(state['pattern'].split())} letters\n")
+    
+    # Wrong letters
+    wrong = state['wrong']
+    if wrong:
+        print(f"  {bold}Wrong guesses:{reset} {red}{', '.join(wrong)}{reset}")
+    
+    # Remaining attempts
+    remaining = state['max_wrong'] - state['wrong_guesses']
+    if remaining <= 2:
+        print(f"  {bold}Remaining:{reset} {red}{remaining} attempts{reset}")
+    else:
+        print(f"  {bold}Remaining:{reset} {green}{remaining} attempts{reset}")
+    
+    # Message
+    if message:
+        if "Good" in message:
+            print(f"\n  {green}{message}{reset}")
+        elif "Sorry" in message or "already" in message:
+            print(f"\n  {red}{message}{reset}")
         else:
-            print(f"  {bold}Remaining:{reset} {green}{remaining} attempts{reset}")
-        
-        # Message
-        if message:
-            if "Good" in message:
-                print(f"\n  {green}{message}{reset}")
-            elif "Sorry" in message or "already" in message:
-                print(f"\n  {red}{message}{reset}")
-            else:
-                print(f"\n  {yellow}{message}{reset}")
-        
-        # Game over messages
-        if self.game_over:
-            print()
-            if self.won:
-                print(f"  {green}{bold}🎉 CONGRATULATIONS! You won! 🎉{reset}")
-                print(f"  {green}The word was: {self.word}{reset}")
-            else:
-                print(f"  {red}{bold}💀 GAME OVER! 💀{reset}")
-                print(f"  {red}The word was: {yellow}{self.word}{reset}")
+            print(f"\n  {yellow}{message}{reset}")
+    
+    # Game over messages
+    if state['game_over']:
+        print()
+        if state['won']:
+            print(f"  {green}{bold}🎉 CONGRATULATIONS! You won! 🎉{reset}")
+            print(f"  {green}The word was: {state['word']}{reset}")
+        else:
+            print(f"  {red}{bold}💀 GAME OVER! 💀{reset}")
+            print(f"  {red}The word was: {yellow}{state['word']}{reset}")
 
 
-def main():
-    game = HangmanGame()
+def main(choose_word=pick_word, solver=None, evil=False):
+    word = choose_word()
+    if word is None:
+        print("\n  No words match those options.\n")
+        return
+    solver = solver or HangmanSolver()
+    game = EvilHangmanGame(solver.table(len(word))) if evil else HangmanGame(word)
     message = ""
     
     while not game.game_over:
-        game.display(message)
+        render(game.state(), message)
         
         try:
-            guess = input("\n  Enter a letter (or 'quit' to exit): ").strip()
+            guess = input("\n  Enter a letter ('?' for a hint, 'quit' to exit): ").strip()
         except (EOFError, KeyboardInterrupt):
             print("\n\n  Goodbye!")
             return
@@ -249,17 +1004,20 @@ def main():
             print("\n  Goodbye!")
             return
         
-        if guess:
+        if guess == '?':
+            letter, count = solver.suggest(game.get_display_word(), game.guessed_letters)
+            message = f"Hint: try '{letter}' ({count} possible words)"
+        elif guess:
             message = game.guess(guess)
     
     # Final display
-    game.display()
+    render(game.state())
     
     # Play again?
     try:
         again = input("\n  Play again? (y/n): ").strip().lower()
         if again == 'y':
-            main()
+            main(choose_word, solver, evil)
     except (EOFError, KeyboardInterrupt):
         pass
     
@@ -267,4 +1025,48 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Hangman")
+    parser.add_argument('--words', metavar='FILE',
+                        help="dictionary file, one word per line (optionally followed by a category)")
+    parser.add_argument('--category', help="only words from this category")
+    parser.add_argument('--length', type=int, help="only words of exactly this length")
+    parser.add_argument('--min-length', type=int, help="only words at least this long")
+    parser.add_argument('--max-length', type=int, help="only words at most this long")
+    parser.add_argument('--difficulty', choices=DIFFICULTY_BANDS,
+                        help="pick from the easiest, middle or hardest third of the words")
+    parser.add_argument('--rescore', action='store_true',
+                        help="recompute the difficulty scores of the --words dictionary")
+    parser.add_argument('--workers', type=int, help="processes used for scoring (default: all cores)")
+    parser.add_argument('--evil', action='store_true',
+                        help="evil mode: the game dodges your guesses instead of picking a word")
+    parser.add_argument('--solve-bench', action='store_true',
+                        help="let the hint solver play every word and report its results")
+    parser.add_argument('--limit', type=int, help="with --solve-bench, only play this many words")
+    args = parser.parse_args()
+
+    min_length = args.length or args.min_length
+    max_length = args.length or args.max_length
+    category = args.category.lower() if args.category else None
+    index = WordIndex.for_dictionary(args.words) if args.words else None
+    if index is None and category and category not in WORD_CATEGORIES:
+        parser.error(f"unknown category (choose from {', '.join(WORD_CATEGORIES)})")
+    solver = HangmanSolver(WORD_CATEGORIES.get(category, WORDS), index, category)
+    if args.solve_bench:
+        if index is None:
+            words = WORD_CATEGORIES.get(category, WORDS)
+        else:
+            words = (index.word(i) for start, count in index.select(category, min_length, max_length)
+                     for i in range(start, start + count))
+        benchmark_solver(solver, words, args.limit)
+    else:
+        ranking = None
+        if index is not None and (args.difficulty or args.rescore):
+            ranking = DifficultyIndex.for_dictionary(index, args.words, args.workers, args.rescore)
+        elif args.difficulty:
+            words = [w for w in WORD_CATEGORIES.get(category, WORDS)
+                     if (min_length is None or len(w) >= min_length)
+                     and (max_length is None or len(w) <= max_length)]
+            ranking = DifficultyIndex.from_words(words, solver)
+        choose_word = functools.partial(pick_word, index, category, min_length, max_length,
+                                        ranking, args.difficulty)
+        main(choose_word, solver, args.evil)
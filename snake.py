@@ -5,37 +5,101 @@ Snake Terminal Game
 Use arrow keys to control the snake and eat food.
 """
 
-import curses
+import argparse
 import random
 import time
+from array import array
+from collections import deque
+from enum import IntEnum
+from itertools import islice
+
+try:
+    import curses
+except ImportError:  # only needed to play in the terminal
+    curses = None
+
+try:
+    import numpy as np
+except ImportError:  # only needed for the batch engine
+    np = None
+
+
+class Direction(IntEnum):
+    UP = 0
+    DOWN = 1
+    LEFT = 2
+    RIGHT = 3
+
+
+# (dy, dx) per direction, indexed by Direction
+DELTAS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+OPPOSITES = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.LEFT: Direction.RIGHT,
+    Direction.RIGHT: Direction.LEFT,
+}
 
 
 class SnakeGame:
     def __init__(self, height=15, width=30):
         self.height = height
         self.width = width
-        self.snake = [(height // 2, width // 2)]
-        self.direction = curses.KEY_RIGHT
+        self.snake = deque([(height // 2, width // 2)])  # head first
+        self.direction = Direction.RIGHT
         self.food = None
         self.score = 0
         self.game_over = False
         self.base_speed = 120  # base milliseconds between moves
         self.direction_changed = False  # Prevent multiple direction changes per tick
+        self.rebuild_cell_index()
         self.place_food()
 
-    def place_food(self):
-        """Place food at a random empty cell"""
-        empty_cells = []
+    def rebuild_cell_index(self):
+        """Rebuild the occupancy grid and the free-cell index from self.snake
+
+        Cells are identified by id y * width + x. occupied is a bytearray grid
+        with 1 under the snake body. free_cells is an array of free interior
+        cell ids and free_index maps an id to its position there (-1 when
+        taken), so cells can be added, removed (swap with the last entry) and
+        sampled in O(1).
+        """
+        self.occupied = bytearray(self.height * self.width)
+        for y, x in self.snake:
+            self.occupied[y * self.width + x] = 1
+        self.free_cells = []
+        self.free_index = [-1] * (self.height * self.width)
         for i in range(1, self.height - 1):
             for j in range(1, self.width - 1):
-                if (i, j) not in self.snake:
-                    empty_cells.append((i, j))
-        if empty_cells:
-            self.food = random.choice(empty_cells)
+                cell = i * self.width + j
+                if not self.occupied[cell]:
+                    self.free_index[cell] = len(self.free_cells)
+                    self.free_cells.append(cell)
+
+    def occupy_cell(self, cell):
+        """Remove a cell id from the free-cell index (swap-remove)"""
+        pos = self.free_index[cell]
+        last = self.free_cells.pop()
+        if last != cell:
+            self.free_cells[pos] = last
+            self.free_index[last] = pos
+        self.free_index[cell] = -1
+
+    def release_cell(self, cell):
+        """Add a cell id back to the free-cell index"""
+        self.free_index[cell] = len(self.free_cells)
+        self.free_cells.append(cell)
+
+    def place_food(self):
+        """Place food at a random empty cell"""
+        if self.free_cells:
+            cell = self.free_cells[random.randrange(len(self.free_cells))]
+            self.food = divmod(cell, self.width)
 
     def get_current_speed(self):
         """Get speed adjusted for direction (vertical moves need more time due to taller characters)"""
-        if self.direction in [curses.KEY_UP, curses.KEY_DOWN]:
+        if self.direction in (Direction.UP, Direction.DOWN):
             return self.base_speed * 1.8  # Vertical is slower to match visual speed
         return self.base_speed
 
@@ -45,17 +109,8 @@ class SnakeGame:
         self.direction_changed = False
         
         head_y, head_x = self.snake[0]
-
-        if self.direction == curses.KEY_UP:
-            new_head = (head_y - 1, head_x)
-        elif self.direction == curses.KEY_DOWN:
-            new_head = (head_y + 1, head_x)
-        elif self.direction == curses.KEY_LEFT:
-            new_head = (head_y, head_x - 1)
-        elif self.direction == curses.KEY_RIGHT:
-            new_head = (head_y, head_x + 1)
-        else:
-            return
+        dy, dx = DELTAS[self.direction]
+        new_head = (head_y + dy, head_x + dx)
 
         # Check wall collision
         if (new_head[0] <= 0 or new_head[0] >= self.height - 1 or
@@ -64,11 +119,14 @@ class SnakeGame:
             return
 
         # Check self collision
-        if new_head in self.snake:
+        head_cell = new_head[0] * self.width + new_head[1]
+        if self.occupied[head_cell]:
             self.game_over = True
             return
 
-        self.snake.insert(0, new_head)
+        self.snake.appendleft(new_head)
+        self.occupied[head_cell] = 1
+        self.occupy_cell(head_cell)
 
         # Check if food is eaten
         if new_head == self.food:
@@ -78,30 +136,847 @@ class SnakeGame:
             if self.base_speed > 40:
                 self.base_speed -= 3
         else:
-            self.snake.pop()
+            tail_y, tail_x = self.snake.pop()
+            tail_cell = tail_y * self.width + tail_x
+            self.occupied[tail_cell] = 0
+            self.release_cell(tail_cell)
 
     def change_direction(self, new_direction):
         """Change direction if valid (can't reverse, only once per tick)"""
         # Only allow one direction change per movement tick
         if self.direction_changed:
             return
-        
-        opposites = {
-            curses.KEY_UP: curses.KEY_DOWN,
-            curses.KEY_DOWN: curses.KEY_UP,
-            curses.KEY_LEFT: curses.KEY_RIGHT,
-            curses.KEY_RIGHT: curses.KEY_LEFT
-        }
-        if new_direction in opposites and new_direction != opposites.get(self.direction):
-            self.direction = new_direction
+
+        if new_direction in OPPOSITES and new_direction != OPPOSITES[self.direction]:
+            self.direction = Direction(new_direction)
             self.direction_changed = True
 
 
-def main(stdscr):
+def _legacy_place_food(game):
+    """The old place_food: scan every cell against the snake list"""
+    empty_cells = []
+    for i in range(1, game.height - 1):
+        for j in range(1, game.width - 1):
+            if (i, j) not in game.snake:
+                empty_cells.append((i, j))
+    if empty_cells:
+        game.food = random.choice(empty_cells)
+
+
+def _serpentine_path(height, width):
+    """Every interior cell, row by row, alternating direction"""
+    cells = []
+    for i in range(1, height - 1):
+        row = range(1, width - 1) if i % 2 else range(width - 2, 0, -1)
+        cells.extend((i, j) for j in row)
+    return cells
+
+
+def _serpentine_snake(height, width, length):
+    """A snake of the given length laid out row by row over the interior"""
+    return _serpentine_path(height, width)[:length][::-1]
+
+
+def _legacy_tick(snake, new_head):
+    """The old body update: list scan for collisions, insert at the front"""
+    if new_head in snake:
+        return False
+    snake.insert(0, new_head)
+    snake.pop()
+    return True
+
+
+def benchmark(sizes=(20, 50, 100, 200, 500), fill=0.25, calls=1000):
+    """Time food placement and moves on boards up to 500x500 with a long snake"""
+    print(f"Food placement benchmark (snake covers {fill:.0%} of the board)")
+    for size in sizes:
+        game = SnakeGame(size, size)
+        game.snake = deque(_serpentine_snake(size, size, max(1, int((size - 2) ** 2 * fill))))
+        game.rebuild_cell_index()
+
+        start = time.perf_counter()
+        for _ in range(calls):
+            game.place_food()
+        new_us = (time.perf_counter() - start) / calls * 1e6
+
+        # The old scan costs about cells * len(snake) tuple compares
+        work = (size - 2) ** 2 * len(game.snake)
+        if work <= 2e8:
+            start = time.perf_counter()
+            _legacy_place_food(game)
+            old = f"{(time.perf_counter() - start) * 1e6:>14,.0f} us"
+        else:
+            old = "       skipped"
+        print(f"  {size:>3}x{size:<3} snake {len(game.snake):>6}: "
+              f"free-cell index {new_us:8.2f} us   old scan {old}")
+
+    print(f"\nMove benchmark (snake covers {fill:.0%} of the board, following a serpentine path)")
+    steps = {delta: Direction(i) for i, delta in enumerate(DELTAS)}
+    for size in sizes:
+        path = _serpentine_path(size, size)
+        length = max(1, int(len(path) * fill))
+        ticks = min(20000, len(path) - length)
+        game = SnakeGame(size, size)
+        game.snake = deque(path[:length][::-1])
+        game.rebuild_cell_index()
+        game.food = None
+        start = time.perf_counter()
+        for k in range(length, length + ticks):
+            head_y, head_x = game.snake[0]
+            game.direction = steps[(path[k][0] - head_y, path[k][1] - head_x)]
+            game.move()
+        new_rate = ticks / (time.perf_counter() - start)
+        assert not game.game_over
+
+        snake = path[:length][::-1]
+        legacy_ticks = max(1, min(ticks, int(2e7 // length)))
+        start = time.perf_counter()
+        for k in range(length, length + legacy_ticks):
+            _legacy_tick(snake, path[k])
+        old_rate = legacy_ticks / (time.perf_counter() - start)
+        print(f"  {size:>3}x{size:<3} snake {length:>6}: deque + grid {new_rate:>10,.0f} ticks/sec"
+              f"   old list {old_rate:>10,.0f} ticks/sec")
+
+
+def _hamiltonian_cycle(rows, cols):
+    """A Hamiltonian cycle over a rows x cols grid as (row, col) pairs
+
+    Needs an even number of rows (or columns, via transposition) and both
+    sides at least 2; returns None when no cycle exists.
+    """
+    if rows < 2 or cols < 2:
+        return None
+    if rows % 2:
+        if cols % 2:
+            return None
+        return [(r, c) for c, r in _hamiltonian_cycle(cols, rows)]
+    # Serpentine over columns 1.. row by row, then return up column 0
+    cycle = [(0, c) for c in range(cols)]
+    for r in range(1, rows):
+        row = range(cols - 1, 0, -1) if r % 2 else range(1, cols)
+        cycle.extend((r, c) for c in row)
+    cycle.extend((r, 0) for r in range(rows - 1, 0, -1))
+    return cycle
+
+
+class SnakeAutopilot:
+    """Chooses a direction for every tick of a SnakeGame
+
+    On small boards it takes the shortest path to the food (BFS) when the
+    tail is still reachable afterwards, and otherwise stalls on the safe move
+    that keeps the most room. On boards with more than cycle_cells interior
+    cells it follows a Hamiltonian cycle instead, taking shortcuts towards the
+    food that can never overtake the tail. Search mode hands over to the cycle
+    for good once the tail check fails or the snake fills cycle_fill of the
+    board: it walks the cycle whenever that is safe until the body lies along
+    it. Boards with odd interior sides have no cycle and always search. All
+    search buffers are allocated once and reused between ticks.
+    """
+
+    def __init__(self, game, cycle_cells=2000, cycle_fill=0.2):
+        self.game = game
+        width = game.width
+        n = game.height * width
+        self.moves = tuple((dy * width + dx, Direction(i)) for i, (dy, dx) in enumerate(DELTAS))
+        self.reverse = {direction: -offset for offset, direction in self.moves}
+        self.wall = bytearray(n)
+        for cell in range(n):
+            y, x = divmod(cell, width)
+            if y in (0, game.height - 1) or x in (0, width - 1):
+                self.wall[cell] = 1
+
+        # Search buffers; generation stamps stand in for clearing them
+        self.release = array('i', bytes(4 * n))   # step a body cell frees up
+        self.release_gen = array('I', bytes(4 * n))
+        self.seen = array('I', bytes(4 * n))
+        self.parent = array('i', bytes(4 * n))
+        self.dist = array('i', bytes(4 * n))
+        self.queue = array('i', bytes(4 * n))
+        self.body_generation = 0
+        self.search_generation = 0
+        self.visited = 0
+        self.length = 0
+        self.stalled = 0   # ticks since the snake last grew
+
+        self.cycle_index = None
+        self.cycle_mode = False
+        self.cycle_wanted = False
+        self.cycle_run = 0   # strict cycle steps taken in a row
+        interior = (game.height - 2) * (width - 2)
+        self.cycle_fill_length = max(2, int(interior * cycle_fill))
+        cycle = _hamiltonian_cycle(game.height - 2, width - 2)
+        if cycle is not None:
+            self.cycle_index = array('i', [-1]) * n
+            self.cycle_order = array('i', bytes(4 * len(cycle)))
+            for i, (r, c) in enumerate(cycle):
+                cell = (r + 1) * width + c + 1
+                self.cycle_index[cell] = i
+                self.cycle_order[i] = cell
+            self.cycle_length = len(cycle)
+            self.cycle_mode = interior > cycle_cells
+
+        self.decisions = 0
+        self.decision_time = 0.0
+
+    @property
+    def mode(self):
+        return "cycle" if self.cycle_mode else "search"
+
+    def average_ms(self):
+        """Average time spent per decision in milliseconds"""
+        return self.decision_time / self.decisions * 1000 if self.decisions else 0.0
+
+    def next_direction(self):
+        """Pick the direction for the next move"""
+        start = time.perf_counter()
+        if self.cycle_mode:
+            direction = self._cycle_move()
+        else:
+            direction = self._search_move()
+        self.decision_time += time.perf_counter() - start
+        self.decisions += 1
+        return direction
+
+    def _mark_body(self, body):
+        """Record when each body cell frees up; body is head first
+
+        Moving into the current tail is a collision, so the segment i cells
+        from the head can be entered at step len(body) - i + 1 at the earliest.
+        """
+        self.body_generation += 1
+        generation = self.body_generation
+        release, release_gen = self.release, self.release_gen
+        width = self.game.width
+        step = len(body) + 1
+        for y, x in body:
+            cell = y * width + x
+            release[cell] = step
+            release_gen[cell] = generation
+            step -= 1
+
+    def _bfs(self, start, target, skip=None):
+        """Breadth-first search over cells enterable when first reached
+
+        Returns the step count to target (-1 if unreachable, or if target is
+        None, after flooding everything reachable). self.visited holds the
+        number of cells reached.
+        """
+        self.search_generation += 1
+        generation = self.search_generation
+        seen, parent, dist, queue = self.seen, self.parent, self.dist, self.queue
+        wall, release, release_gen = self.wall, self.release, self.release_gen
+        body_generation = self.body_generation
+        offsets = [offset for offset, _ in self.moves if offset != skip]
+        seen[start] = generation
+        dist[start] = 0
+        queue[0] = start
+        head, tail = 0, 1
+        while head < tail:
+            cell = queue[head]
+            head += 1
+            step = dist[cell] + 1
+            for offset in offsets:
+                nxt = cell + offset
+                if seen[nxt] == generation or wall[nxt]:
+                    continue
+                if release_gen[nxt] == body_generation and release[nxt] > step:
+                    continue
+                seen[nxt] = generation
+                parent[nxt] = cell
+                dist[nxt] = step
+                if nxt == target:
+                    self.visited = tail
+                    return step
+                queue[tail] = nxt
+                tail += 1
+            if cell == start:
+                offsets = [offset for offset, _ in self.moves]
+        self.visited = tail
+        return -1
+
+    def _tail_distance(self, body):
+        """Steps from the head of a (virtual) body to its tail, -1 if cut off"""
+        if len(body) < 2:
+            return 0
+        width = self.game.width
+        self._mark_body(body)
+        head_y, head_x = body[0]
+        tail_y, tail_x = body[-1]
+        return self._bfs(head_y * width + head_x, tail_y * width + tail_x)
+
+    def _cycle_is_safe(self, head, food, length):
+        """Whether walking the cycle strictly from head stays clear of the body
+
+        Checks the cells the head passes until the current body has left the
+        board, with the marks from _mark_body; eating the food on the way
+        holds the tail back one step.
+        """
+        index, order, size = self.cycle_index, self.cycle_order, self.cycle_length
+        release, release_gen = self.release, self.release_gen
+        generation = self.body_generation
+        position = index[head]
+        delay = 0
+        for step in range(1, min(length + 2, size)):
+            cell = order[(position + step) % size]
+            if release_gen[cell] == generation and release[cell] + delay > step:
+                return False
+            if cell == food:
+                delay = 1
+        return True
+
+    def _direction_to(self, head, cell):
+        for offset, direction in self.moves:
+            if head + offset == cell:
+                return direction
+        return self.game.direction
+
+    def _search_move(self):
+        game = self.game
+        width = game.width
+        snake = game.snake
+        length = len(snake)
+        head = snake[0][0] * width + snake[0][1]
+        food = game.food[0] * width + game.food[1]
+        skip = self.reverse[game.direction] if length == 1 else None
+        if length != self.length:
+            self.length, self.stalled = length, 0
+        self.stalled += 1
+
+        self._mark_body(snake)
+        if self.cycle_index is not None and length >= self.cycle_fill_length:
+            self.cycle_wanted = True
+        if self.cycle_wanted and length > 1:
+            # Walk the cycle while that is safe; once the whole body has
+            # followed it, it lies along the cycle and cycle mode takes over
+            if self._cycle_is_safe(head, food, length):
+                self.cycle_run += 1
+                if self.cycle_run >= length:
+                    self.cycle_mode = True
+                position = (self.cycle_index[head] + 1) % self.cycle_length
+                return self._direction_to(head, self.cycle_order[position])
+            self.cycle_run = 0
+            # Otherwise step to a neighbour the cycle can be joined from,
+            # keeping the tail as far away as possible
+            best, best_steps = None, -1
+            for offset, direction in self.moves:
+                cell = head + offset
+                if self.wall[cell] or game.occupied[cell]:
+                    continue
+                if cell == food:
+                    body = [divmod(cell, width)] + list(snake)
+                else:
+                    body = [divmod(cell, width)] + list(islice(snake, 0, length - 1))
+                tail_steps = self._tail_distance(body)
+                if tail_steps > best_steps and self._cycle_is_safe(cell, food, len(body)):
+                    best, best_steps = direction, tail_steps
+            if best is not None:
+                return best
+            self._mark_body(snake)
+
+        if self._bfs(head, food, skip) > 0:
+            path = []
+            cell = food
+            while cell != head:
+                path.append(divmod(cell, width))
+                cell = self.parent[cell]
+            # After eating, the body is the path (head first) then the old body
+            body = path[:length + 1] + list(islice(snake, 0, max(0, length + 1 - len(path))))
+            # Chasing the tail can go round forever when every route to the
+            # food looks unsafe, so after a full lap of the board take it anyway
+            if self._tail_distance(body) >= 0 or self.stalled > len(self.queue):
+                return self._direction_to(head, path[-1][0] * width + path[-1][1])
+            self.cycle_wanted = self.cycle_index is not None
+
+        # No safe path to the food: chase the tail the long way round, or
+        # failing that take the move that keeps the most room
+        best, best_score = game.direction, None
+        for offset, direction in self.moves:
+            cell = head + offset
+            if offset == skip or self.wall[cell] or game.occupied[cell]:
+                continue
+            if cell == food:
+                body = [divmod(cell, width)] + list(snake)
+            else:
+                body = [divmod(cell, width)] + list(islice(snake, 0, length - 1))
+            tail_steps = self._tail_distance(body)
+            if tail_steps < 0:
+                self._bfs(cell, None)
+                score = (False, self.visited)
+            else:
+                score = (True, tail_steps)
+            if best_score is None or score > best_score:
+                best, best_score = direction, score
+        if best_score is not None and not best_score[0]:
+            self.cycle_wanted = self.cycle_index is not None
+        return best
+
+    def _cycle_move(self):
+        game = self.game
+        width = game.width
+        snake = game.snake
+        index, size = self.cycle_index, self.cycle_length
+        length = len(snake)
+        head = snake[0][0] * width + snake[0][1]
+        tail = snake[-1][0] * width + snake[-1][1]
+        food = game.food[0] * width + game.food[1]
+        head_index = index[head]
+        food_distance = (index[food] - head_index) % size
+        tail_distance = (index[tail] - head_index) % size or size
+
+        # Shortcuts may skip ahead along the cycle but must stay well behind
+        # the tail; they are disabled once the snake fills half the board
+        allowed = tail_distance - 3
+        empty = size - length - 1
+        if empty < size // 2:
+            allowed = 1
+        elif food_distance < tail_distance:
+            allowed -= 1
+            if (tail_distance - food_distance) * 4 > empty:
+                allowed -= 10
+        allowed = max(1, min(allowed, food_distance))
+
+        skip = self.reverse[game.direction] if length == 1 else None
+        best, best_distance = None, 0
+        for offset, direction in self.moves:
+            cell = head + offset
+            if offset == skip or self.wall[cell] or game.occupied[cell]:
+                continue
+            distance = (index[cell] - head_index) % size
+            if distance <= allowed and distance > best_distance:
+                best, best_distance = direction, distance
+        if best is None:
+            # Only at the start, when the cycle runs straight back
+            for offset, direction in self.moves:
+                cell = head + offset
+                if offset != skip and not self.wall[cell] and not game.occupied[cell]:
+                    return direction
+            return game.direction
+        return best
+
+
+def _check_invariants(game):
+    """Assert that the occupancy grid and free-cell index match the snake"""
+    width = game.width
+    body = {y * width + x for y, x in game.snake}
+    assert len(body) == len(game.snake), "snake overlaps itself"
+    assert sum(game.occupied) == len(body), "occupancy grid out of sync"
+    assert all(game.occupied[cell] for cell in body), "occupancy grid out of sync"
+    interior = (game.height - 2) * (width - 2)
+    assert len(game.free_cells) == interior - len(body), "free-cell count out of sync"
+    for pos, cell in enumerate(game.free_cells):
+        assert game.free_index[cell] == pos and cell not in body, "free-cell index out of sync"
+
+
+def soak(height=202, width=202, ticks=None, seed=None, check_every=10000):
+    """Let the autopilot play a headless game, checking the engine as it goes"""
+    if seed is not None:
+        random.seed(seed)
+    game = SnakeGame(height, width)
+    pilot = SnakeAutopilot(game)
+    interior = (height - 2) * (width - 2)
+    print(f"Autopilot soak on {height}x{width} ({pilot.mode} planner)")
+    start = time.perf_counter()
+    tick = 0
+    while not game.game_over and game.free_cells and (ticks is None or tick < ticks):
+        game.change_direction(pilot.next_direction())
+        game.move()
+        tick += 1
+        if tick % check_every == 0:
+            _check_invariants(game)
+            elapsed = time.perf_counter() - start
+            print(f"  tick {tick:>10,}: length {len(game.snake):>7,} "
+                  f"({len(game.snake) / interior:6.1%})  {tick / elapsed:>9,.0f} ticks/sec  "
+                  f"decision {pilot.average_ms() * 1000:6.1f} us")
+    _check_invariants(game)
+    elapsed = time.perf_counter() - start
+    result = "board cleared" if not game.free_cells else ("died" if game.game_over else "stopped")
+    print(f"{result} after {tick:,} ticks in {elapsed:.1f}s: score {game.score}, "
+          f"length {len(game.snake):,}, average decision {pilot.average_ms() * 1000:.1f} us")
+    return game
+
+
+class BatchSnakeGame:
+    """N independent SnakeGames stepped in lockstep with NumPy
+
+    Follows the SnakeGame rules exactly: reversing is ignored, walls and the
+    body (including the current tail) are collisions, and eating scores 10,
+    grows the snake and speeds it up by 3 ms down to 40. Food lands on a
+    uniformly chosen free cell. Each body is a ring buffer of cell ids
+    (y * width + x) with an occupancy grid alongside.
+    """
+
+    def __init__(self, count, height=15, width=30, seed=None):
+        if np is None:
+            raise RuntimeError("BatchSnakeGame needs NumPy (pip install numpy)")
+        self.count = count
+        self.height = height
+        self.width = width
+        self.cells = height * width
+        self.capacity = (height - 2) * (width - 2)  # longest possible snake
+        self.rng = np.random.default_rng(seed)
+
+        wall = np.zeros((height, width), dtype=bool)
+        wall[[0, -1], :] = True
+        wall[:, [0, -1]] = True
+        self.wall = wall.ravel()
+        self.interior = np.flatnonzero(~self.wall)
+        self.deltas = np.array([dy * width + dx for dy, dx in DELTAS], dtype=np.int64)
+        self.opposite = np.array([OPPOSITES[d] for d in Direction], dtype=np.int8)
+        self.rows = np.arange(count, dtype=np.int64)
+        self.start = (height // 2) * width + width // 2
+
+        self.occupied = np.zeros((count, self.cells), dtype=bool)
+        self.body = np.zeros((count, self.capacity), dtype=np.int64)
+        self.head_slot = np.zeros(count, dtype=np.int64)  # ring index of the head
+        self.head = np.zeros(count, dtype=np.int64)
+        self.length = np.zeros(count, dtype=np.int64)
+        self.direction = np.zeros(count, dtype=np.int8)
+        self.food = np.zeros(count, dtype=np.int64)
+        self.score = np.zeros(count, dtype=np.int64)
+        self.base_speed = np.zeros(count, dtype=np.int64)
+        self.ticks = np.zeros(count, dtype=np.int64)
+        self.game_over = np.zeros(count, dtype=bool)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Start fresh games in the slots selected by mask (default: all)"""
+        if mask is None:
+            index = self.rows
+        else:
+            index = np.flatnonzero(mask)  # mask may be self.game_over itself
+        if not len(index):
+            return
+        self.occupied[index] = False
+        self.occupied[index, self.start] = True
+        self.body[index, 0] = self.start
+        self.head_slot[index] = 0
+        self.head[index] = self.start
+        self.length[index] = 1
+        self.direction[index] = Direction.RIGHT
+        self.score[index] = 0
+        self.base_speed[index] = 120
+        self.ticks[index] = 0
+        self.game_over[index] = False
+        self.place_food(index)
+
+    def place_food(self, index, tries=8):
+        """Put food on a uniformly chosen free cell for each game in index
+
+        Rejection sampling is fast while the board is mostly empty; games
+        still unplaced after a few rounds scan their free cells. A full board
+        keeps its old food, as SnakeGame does.
+        """
+        pending = index
+        for _ in range(tries):
+            if not len(pending):
+                return
+            cells = self.interior[self.rng.integers(0, len(self.interior), len(pending))]
+            placed = ~self.occupied[pending, cells]
+            self.food[pending[placed]] = cells[placed]
+            pending = pending[~placed]
+        for game in pending:
+            free = self.interior[~self.occupied[game, self.interior]]
+            if len(free):
+                self.food[game] = free[self.rng.integers(len(free))]
+
+    def step(self, actions):
+        """Turn (unless reversing) and move every running game one tick
+
+        actions is an int array of Direction values of length count. Returns
+        (ate, crashed) boolean arrays; crashed games are also flagged in
+        game_over and stay frozen until reset.
+        """
+        running = ~self.game_over
+        turn = np.asarray(actions, dtype=np.int8)
+        turn = np.where(turn == self.opposite[self.direction], self.direction, turn)
+        self.direction = np.where(running, turn, self.direction)
+
+        new_head = self.head + self.deltas[self.direction]
+        occupied = self.occupied.reshape(-1)
+        crashed = running & (self.wall[new_head] | occupied[self.rows * self.cells + new_head])
+        moving = np.flatnonzero(running & ~crashed)
+        ate = np.zeros(self.count, dtype=bool)
+        self.game_over |= crashed
+        if not len(moving):
+            return ate, crashed
+
+        heads = new_head[moving]
+        slots = self.head_slot[moving] + 1
+        slots[slots == self.capacity] = 0
+        self.body[moving, slots] = heads
+        self.head_slot[moving] = slots
+        self.head[moving] = heads
+        occupied[moving * self.cells + heads] = True
+        self.ticks[moving] += 1
+
+        eating = heads == self.food[moving]
+        # Everyone else drops the tail, which sat `length` slots behind the new head
+        trailing = moving[~eating]
+        tail_slots = (self.head_slot[trailing] - self.length[trailing]) % self.capacity
+        occupied[trailing * self.cells + self.body[trailing, tail_slots]] = False
+
+        eaten = moving[eating]
+        if len(eaten):
+            ate[eaten] = True
+            self.length[eaten] += 1
+            self.score[eaten] += 10
+            speed = self.base_speed[eaten]
+            self.base_speed[eaten] = np.where(speed > 40, speed - 3, speed)
+            self.place_food(eaten)
+        return ate, crashed
+
+    def speeds(self):
+        """Milliseconds until each game's next tick, as get_current_speed()"""
+        vertical = self.direction <= Direction.DOWN
+        return np.where(vertical, self.base_speed * 1.8, self.base_speed)
+
+    def snake(self, game):
+        """Body of one game as (y, x) pairs, head first like SnakeGame.snake"""
+        slots = (self.head_slot[game] - np.arange(self.length[game])) % self.capacity
+        return [divmod(int(cell), self.width) for cell in self.body[game, slots]]
+
+
+def _check_batch_against_scalar(batch, actions, checks):
+    """Step the batch once and replay its first `checks` games on SnakeGame"""
+    before = []
+    for i in range(checks):
+        before.append((batch.snake(i), int(batch.direction[i]), divmod(int(batch.food[i]), batch.width),
+                       int(batch.score[i]), int(batch.base_speed[i]), bool(batch.game_over[i])))
+    ate, crashed = batch.step(actions)
+    for i, (snake, direction, food, score, base_speed, over) in enumerate(before):
+        if over:
+            continue
+        game = SnakeGame(batch.height, batch.width)
+        game.snake = deque(snake)
+        game.rebuild_cell_index()
+        game.direction, game.food = Direction(direction), food
+        game.score, game.base_speed = score, base_speed
+        game.change_direction(int(actions[i]))
+        game.move()
+        if ate[i]:
+            game.food = divmod(int(batch.food[i]), batch.width)  # random placement
+        if (game.game_over != bool(crashed[i]) or game.score != int(batch.score[i]) or
+                game.base_speed != int(batch.base_speed[i]) or game.direction != batch.direction[i]):
+            return False
+        if not game.game_over and (list(game.snake) != batch.snake(i) or
+                                   game.occupied != bytearray(batch.occupied[i].astype(np.uint8))):
+            return False
+    return True
+
+
+def benchmark_batch(envs=4096, steps=1000, height=15, width=30, seed=0):
+    """Step `envs` random-policy games in lockstep and report ticks per second"""
+    if np is None:
+        print("NumPy is required for the batch benchmark (pip install numpy)")
+        return
+    batch = BatchSnakeGame(envs, height, width, seed=seed)
+    rng = np.random.default_rng(seed + 1)
+
+    # A policy that keeps heading for the food half the time lives long
+    # enough for the rule check to see growth, speed-ups and tail moves
+    def policy():
+        head_y, head_x = np.divmod(batch.head, width)
+        food_y, food_x = np.divmod(batch.food, width)
+        greedy = np.where(food_y < head_y, Direction.UP,
+                          np.where(food_y > head_y, Direction.DOWN,
+                                   np.where(food_x < head_x, Direction.LEFT, Direction.RIGHT)))
+        return np.where(rng.random(envs) < 0.5, greedy, rng.integers(0, 4, envs))
+
+    agree = True
+    for _ in range(200):
+        agree = agree and _check_batch_against_scalar(batch, policy(), min(envs, 100))
+        batch.reset(batch.game_over)
+    print(f"Scalar rule check: {'OK' if agree else 'MISMATCH'}")
+
+    batch.reset()
+    finished = 0
+    start = time.perf_counter()
+    for _ in range(steps):
+        batch.step(rng.integers(0, 4, envs))
+        done = batch.game_over
+        if done.any():
+            finished += int(done.sum())
+            batch.reset(done)
+    elapsed = time.perf_counter() - start
+    print(f"Batch benchmark: {envs} games of {height}x{width} x {steps} steps")
+    print(f"  {envs * steps / elapsed:,.0f} ticks/sec ({finished} games finished)")
+
+
+HEAD_GLYPHS = {Direction.UP: "^", Direction.DOWN: "v",
+               Direction.LEFT: "<", Direction.RIGHT: ">"}
+
+
+class SnakeRenderer:
+    """Incremental curses renderer for a SnakeGame
+
+    The title, border and instructions never change, so they are drawn once
+    into their own windows. After that each tick only redraws the handful
+    of board cells that can change (old and new tail, previous and new head,
+    old and new food) into the board window, and update() flushes them along
+    with the score line when its text changes.
+    """
+
+    def __init__(self, stdscr, game, offset_y, offset_x):
+        self.stdscr = stdscr
+        self.game = game
+        self.offset_y = offset_y
+        self.offset_x = offset_x
+        # One spare column so the bottom-right border cell never scrolls
+        self.header = curses.newwin(offset_y, game.width + 1, 0, offset_x)
+        self.board = curses.newwin(game.height, game.width + 1, offset_y, offset_x)
+        self.footer = curses.newwin(1, game.width + 1, offset_y + game.height + 1, offset_x)
+        # The score line is drawn over the last row of the title rule
+        self.status = curses.newwin(1, game.width + 1, offset_y - 1, offset_x)
+        self.stats = None
+        self.head = None
+        self.tail = None
+        self.food = None
+        self.direction = None
+        self.score_text = None
+        self.dirty = False
+
+    def enable_stats(self):
+        """Reserve the line under the instructions for the timing overlay"""
+        game = self.game
+        self.stats = curses.newwin(1, game.width + 1, self.offset_y + game.height + 2, self.offset_x)
+
+    def draw_stats(self, text):
+        """Show the timing overlay; it is flushed by the next update()"""
+        if self.stats is None:
+            return
+        self.stats.erase()
+        try:
+            self.stats.addstr(0, 0, text[:self.game.width], curses.color_pair(4))
+        except curses.error:
+            pass
+        self.stats.noutrefresh()
+
+    def draw_static(self):
+        """Draw the title, border and instructions once"""
+        game = self.game
+        title = "[ SNAKE GAME ]"
+        attr = curses.color_pair(4) | curses.A_BOLD
+        self.header.addstr(0, 0, "=" * game.width, attr)
+        self.header.addstr(1, (game.width - len(title)) // 2, title, attr)
+        self.header.addstr(2, 0, "=" * game.width, attr)
+
+        attr = curses.color_pair(3)
+        for i in range(game.height):
+            if i == 0 or i == game.height - 1:
+                for j in range(game.width):
+                    self.board.addch(i, j, curses.ACS_HLINE, attr)
+            else:
+                self.board.addch(i, 0, curses.ACS_VLINE, attr)
+                self.board.addch(i, game.width - 1, curses.ACS_VLINE, attr)
+
+        try:
+            self.footer.addstr(0, 0, "Arrow keys: move | q: quit"[:game.width])
+        except curses.error:
+            pass
+
+        # Clear stdscr once so its later implicit refresh in getch() is a no-op
+        self.stdscr.refresh()
+        self.header.noutrefresh()
+        self.footer.noutrefresh()
+        for y, x in self.game.snake:
+            self.draw_cell((y, x))
+        self.update()
+
+    def draw_cell(self, cell):
+        """Redraw one interior cell from the current game state"""
+        game = self.game
+        y, x = cell
+        if not (0 < y < game.height - 1 and 0 < x < game.width - 1):
+            return
+        if cell == game.snake[0]:
+            glyph = HEAD_GLYPHS.get(game.direction, ">")
+            attr = curses.color_pair(5) | curses.A_BOLD
+        elif game.occupied[y * game.width + x]:
+            if cell == game.snake[-1]:
+                glyph, attr = ".", curses.color_pair(1)
+            else:
+                glyph, attr = "#", curses.color_pair(1) | curses.A_BOLD
+        elif cell == game.food:
+            glyph, attr = "O", curses.color_pair(2) | curses.A_BOLD
+        else:
+            glyph, attr = " ", curses.A_NORMAL
+        self.board.addstr(y, x, glyph, attr)
+
+    def record(self):
+        """Draw the cells the last tick changed into the board window
+
+        Call after every game.move(); nothing reaches the terminal until the
+        next update(), so several ticks can run between two updates.
+        """
+        game = self.game
+        head, tail = game.snake[0], game.snake[-1]
+        if (head, tail, game.food, game.direction) != (self.head, self.tail, self.food, self.direction):
+            for cell in {self.tail, tail, self.head, head, self.food, game.food}:
+                if cell is not None:
+                    self.draw_cell(cell)
+            self.head, self.tail = head, tail
+            self.food, self.direction = game.food, game.direction
+            self.dirty = True
+
+    def update(self):
+        """Flush what changed since the last update to the terminal"""
+        game = self.game
+        self.record()
+        if self.dirty:
+            self.board.noutrefresh()
+            self.dirty = False
+
+        score_text = f"Score: {game.score}  |  Length: {len(game.snake)}"
+        if score_text != self.score_text:
+            # Restore the title rule behind a shorter score line
+            rule = "=" * game.width
+            self.status.addstr(0, 0, rule, curses.color_pair(4) | curses.A_BOLD)
+            self.status.addstr(0, 0, score_text[:game.width], curses.color_pair(3))
+            self.score_text = score_text
+            self.status.noutrefresh()
+
+        curses.doupdate()
+
+
+MAX_CATCH_UP_TICKS = 5  # ticks simulated back to back before the schedule is reset
+
+
+class FrameStats:
+    """Rolling timing figures for the --stats overlay"""
+
+    def __init__(self, smoothing=0.1):
+        self.smoothing = smoothing
+        self.tick_times = deque(maxlen=32)
+        self.render_ms = 0.0
+        self.latency_ms = 0.0
+
+    def _smooth(self, average, sample):
+        return average + (sample - average) * self.smoothing if average else sample
+
+    def tick(self, due):
+        self.tick_times.append(due)
+
+    def rendered(self, seconds):
+        self.render_ms = self._smooth(self.render_ms, seconds * 1000)
+
+    def input_latency(self, seconds):
+        self.latency_ms = self._smooth(self.latency_ms, seconds * 1000)
+
+    def tick_rate(self):
+        if len(self.tick_times) < 2:
+            return 0.0
+        return (len(self.tick_times) - 1) / (self.tick_times[-1] - self.tick_times[0])
+
+    def summary(self, plan_ms=None):
+        # The autopilot has no input to time, so show its decision time instead
+        last = f"input {self.latency_ms:6.1f} ms" if plan_ms is None else f"plan {plan_ms:6.2f} ms"
+        return f"{self.tick_rate():5.1f} ticks/s | render {self.render_ms:5.2f} ms | {last}"
+
+
+def main(stdscr, show_stats=False, autopilot=False):
     # Setup curses
     curses.curs_set(0)  # Hide cursor
     stdscr.nodelay(1)   # Non-blocking input
-    stdscr.timeout(50)  # Refresh rate
     
     # Initialize colors
     curses.start_color()
@@ -122,100 +997,69 @@ def main(stdscr):
     offset_y = 3
     offset_x = 2
 
-    last_move_time = time.time()
+    renderer = SnakeRenderer(stdscr, game, offset_y, offset_x)
+    if show_stats:
+        renderer.enable_stats()
+    renderer.draw_static()
+    stats = FrameStats()
+    pilot = SnakeAutopilot(game) if autopilot else None
+    key_directions = {curses.KEY_UP: Direction.UP, curses.KEY_DOWN: Direction.DOWN,
+                      curses.KEY_LEFT: Direction.LEFT, curses.KEY_RIGHT: Direction.RIGHT}
 
-    while not game.game_over:
-        stdscr.erase()
-        
-        # Title
-        title = "[ SNAKE GAME ]"
-        stdscr.attron(curses.color_pair(4) | curses.A_BOLD)
-        stdscr.addstr(0, offset_x, "=" * game.width)
-        stdscr.addstr(1, offset_x + (game.width - len(title)) // 2, title)
-        stdscr.addstr(2, offset_x, "=" * game.width)
-        stdscr.attroff(curses.color_pair(4) | curses.A_BOLD)
-        
-        # Score
-        score_text = f"Score: {game.score}  |  Length: {len(game.snake)}"
-        stdscr.attron(curses.color_pair(3))
-        stdscr.addstr(offset_y - 1, offset_x, score_text)
-        stdscr.attroff(curses.color_pair(3))
+    # Ticks are scheduled on the monotonic clock: each one is due a full
+    # interval after the previous one was due, not after it actually ran,
+    # so redraw cost and late wake-ups never stretch the game speed.
+    next_tick = time.monotonic() + game.get_current_speed() / 1000
+    key_time = None
 
-        # Draw border
-        stdscr.attron(curses.color_pair(3))
-        for i in range(game.height):
-            for j in range(game.width):
-                if i == 0 or i == game.height - 1:
-                    try:
-                        stdscr.addch(offset_y + i, offset_x + j, curses.ACS_HLINE)
-                    except:
-                        pass
-                elif j == 0 or j == game.width - 1:
-                    try:
-                        stdscr.addch(offset_y + i, offset_x + j, curses.ACS_VLINE)
-                    except:
-                        pass
-        stdscr.attroff(curses.color_pair(3))
-
-        # Draw food
-        if game.food:
-            stdscr.attron(curses.color_pair(2) | curses.A_BOLD)
-            try:
-                stdscr.addstr(offset_y + game.food[0], offset_x + game.food[1], "O")
-            except:
-                pass
-            stdscr.attroff(curses.color_pair(2) | curses.A_BOLD)
-
-        # Draw snake
-        snake_len = len(game.snake)
-        for idx, (y, x) in enumerate(game.snake):
-            try:
-                if idx == 0:
-                    # Head - bright with direction
-                    stdscr.attron(curses.color_pair(5) | curses.A_BOLD)
-                    if game.direction == curses.KEY_UP:
-                        stdscr.addstr(offset_y + y, offset_x + x, "^")
-                    elif game.direction == curses.KEY_DOWN:
-                        stdscr.addstr(offset_y + y, offset_x + x, "v")
-                    elif game.direction == curses.KEY_LEFT:
-                        stdscr.addstr(offset_y + y, offset_x + x, "<")
-                    else:
-                        stdscr.addstr(offset_y + y, offset_x + x, ">")
-                    stdscr.attroff(curses.color_pair(5) | curses.A_BOLD)
-                elif idx == snake_len - 1 and snake_len > 1:
-                    # Tail
-                    stdscr.attron(curses.color_pair(1))
-                    stdscr.addstr(offset_y + y, offset_x + x, ".")
-                    stdscr.attroff(curses.color_pair(1))
-                else:
-                    # Body
-                    stdscr.attron(curses.color_pair(1) | curses.A_BOLD)
-                    stdscr.addstr(offset_y + y, offset_x + x, "#")
-                    stdscr.attroff(curses.color_pair(1) | curses.A_BOLD)
-            except:
-                pass
-
-        # Instructions
-        try:
-            stdscr.addstr(offset_y + game.height + 1, offset_x, "Arrow keys: move | q: quit")
-        except:
-            pass
-
-        stdscr.refresh()
-
-        # Handle input
+    while not game.game_over:
+        # Input: sleep in getch() until a key arrives or the next tick is due
+        wait = next_tick - time.monotonic()
+        stdscr.timeout(max(0, int(wait * 1000)))
         key = stdscr.getch()
-        
-        if key == ord('q'):
+        stdscr.timeout(0)
+        quit_game = False
+        while key != -1:
+            if key == ord('q'):
+                quit_game = True
+                break
+            elif pilot is None and key in key_directions:
+                turned = game.direction_changed
+                game.change_direction(key_directions[key])
+                if game.direction_changed and not turned:
+                    key_time = time.monotonic()
+            key = stdscr.getch()
+        if quit_game:
             break
-        elif key in [curses.KEY_UP, curses.KEY_DOWN, curses.KEY_LEFT, curses.KEY_RIGHT]:
-            game.change_direction(key)
 
-        # Move snake at regular intervals (adjusted for direction)
-        current_time = time.time()
-        if (current_time - last_move_time) * 1000 >= game.get_current_speed():
+        # Simulation: run every tick that is due, catching up a bounded number
+        # of ticks and dropping the rest of the backlog if still behind
+        now = time.monotonic()
+        ticks = 0
+        while now >= next_tick and not game.game_over and game.free_cells:
+            if ticks == MAX_CATCH_UP_TICKS:
+                next_tick = now + game.get_current_speed() / 1000
+                break
+            if pilot is not None:
+                game.change_direction(pilot.next_direction())
             game.move()
-            last_move_time = current_time
+            renderer.record()
+            ticks += 1
+            stats.tick(next_tick)
+            next_tick += game.get_current_speed() / 1000
+
+        # Rendering: once per pass, after the simulation has settled
+        render_start = time.monotonic()
+        if show_stats:
+            renderer.draw_stats(stats.summary(pilot.average_ms() if pilot else None))
+        renderer.update()
+        render_end = time.monotonic()
+        stats.rendered(render_end - render_start)
+        if ticks and key_time is not None:
+            stats.input_latency(render_end - key_time)
+            key_time = None
+        if not game.free_cells:
+            break  # the snake fills the board
 
     # Game over screen
     stdscr.erase()
@@ -230,6 +1074,9 @@ def main(stdscr):
     try:
         stdscr.addstr(max_y // 2, max_x // 2 - 8, f"Final Score: {game.score}")
         stdscr.addstr(max_y // 2 + 1, max_x // 2 - 8, f"Snake Length: {len(game.snake)}")
+        if pilot is not None:
+            stdscr.addstr(max_y // 2 + 2, max_x // 2 - 8,
+                          f"Autopilot: {pilot.average_ms():.2f} ms per move ({pilot.mode})")
     except:
         pass
     stdscr.attroff(curses.color_pair(3))
@@ -243,4 +1090,34 @@ def main(stdscr):
 
 
 if __name__ == "__main__":
-    curses.wrapper(main)
+    parser = argparse.ArgumentParser(description="Snake terminal game")
+    parser.add_argument('--bench', action='store_true',
+                        help="benchmark food placement and moves instead of playing")
+    parser.add_argument('--stats', action='store_true',
+                        help="show tick rate, render time and input latency while playing")
+    parser.add_argument('--auto', action='store_true',
+                        help="let the autopilot play")
+    parser.add_argument('--headless', action='store_true',
+                        help="with --auto, play without curses as fast as possible (soak test)")
+    parser.add_argument('--size', type=int, default=202,
+                        help="board height and width for --headless, walls included (default: 202)")
+    parser.add_argument('--ticks', type=int, default=None,
+                        help="stop --headless after this many ticks (default: until the game ends)")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for --headless")
+    parser.add_argument('--batch-bench', action='store_true',
+                        help="benchmark the NumPy batch engine (needs numpy)")
+    parser.add_argument('--envs', type=int, default=4096,
+                        help="games stepped together for --batch-bench (default: 4096)")
+    parser.add_argument('--steps', type=int, default=1000,
+                        help="steps for --batch-bench (default: 1000)")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark()
+    elif args.batch_bench:
+        benchmark_batch(args.envs, args.steps, seed=args.seed or 0)
+    elif args.auto and args.headless:
+        soak(args.size, args.size, args.ticks, args.seed)
+    elif curses is None:
+        parser.error("curses is not available; only --bench, --batch-bench and --auto --headless work")
+    else:
+        curses.wrapper(main, args.stats, args.auto)